@@ -62,7 +62,9 @@ if ES_TSKS is not None:
         ES_TSKS,
         SPC_DCT, GLOB_DCT, THY_DCT,
         INP_KEY_DCT['run_prefix'], INP_KEY_DCT['save_prefix'],
-        print_debug=INP_KEY_DCT['print_debug']
+        print_debug=INP_KEY_DCT['print_debug'],
+        ncores=INP_KEY_DCT['es_ncores'],
+        mem=INP_KEY_DCT['es_mem']
     )
     ioprinter.program_exit('es')
 
@@ -13,6 +13,8 @@
 """
 
 from mechroutines.es import run_tsk
+from mechroutines.es.runner import job_resources
+from mechroutines.es.runner import run_in_budget
 from mechlib.amech_io import parser
 from mechlib.amech_io import printer as ioprinter
 
@@ -21,9 +23,16 @@ def run(pes_rlst, spc_rlst,
         es_tsk_lst,
         spc_dct, glob_dct, thy_dct,
         run_prefix, save_prefix,
-        print_debug=False):
+        print_debug=False, ncores=None, mem=None):
     """ Executes all electronic structure tasks.
 
+        If a budget of processors is given, the species and transition
+        states in the queue of each task are run concurrently with as many
+        jobs at once as the nprocs/mem of the task's runlvl allow, with
+        each species of a task with njobs charged for njobs jobs. Tasks
+        are still run one after another in the order they are listed, so
+        every species has finished a task before any starts the next one.
+
         :param pes_rlst: species from PESs to run
             [(PES formula, PES idx, SUP-PES idx)
             (CHANNEL idx, (REACS, PRODS))
@@ -46,6 +55,10 @@ def run(pes_rlst, spc_rlst,
         :type run_prefix: str
         :param save_prefix: root-path to the save-filesystem
         :type save_prefix: str
+        :param ncores: processors available to run tasks concurrently
+        :type ncores: int
+        :param mem: memory (GB) available to run tasks concurrently
+        :type mem: float
     """
 
     # -------------------------------- #
@@ -93,8 +106,37 @@ def run(pes_rlst, spc_rlst,
                 obj_queue = ()
 
             # Run the electronic structure task for all spc in queue
-            for spc_name in obj_queue:
-                run_tsk(tsk, spc_dct, spc_name,
-                        thy_dct, es_keyword_dct,
-                        run_prefix, save_prefix,
-                        print_debug=print_debug)
+            if ncores is None or len(obj_queue) < 2:
+                for spc_name in obj_queue:
+                    run_tsk(tsk, spc_dct, spc_name,
+                            thy_dct, es_keyword_dct,
+                            run_prefix, save_prefix,
+                            print_debug=print_debug)
+            else:
+                # Concurrent jobs on the same conformers are avoided
+                # through the RUNNING status of the run filesystem
+                # Tasks with njobs run up to njobs jobs for each species
+                method_dct = thy_dct.get(es_keyword_dct.get('runlvl'), {})
+                nprocs, job_mem = job_resources(method_dct)
+                njobs = es_keyword_dct.get('njobs', 1)
+                cost = (nprocs * njobs, job_mem * njobs)
+                mem_str = 'no memory limit' if mem is None else f'{mem} GB'
+                ioprinter.info_message(
+                    f'Running {tsk} for {len(obj_queue)} species '
+                    f'concurrently with {cost[0]} procs and {cost[1]} GB '
+                    f'per species within {ncores} procs and {mem_str}')
+                args_lst = tuple(
+                    (tsk, spc_dct, spc_name,
+                     thy_dct, es_keyword_dct,
+                     run_prefix, save_prefix,
+                     print_debug)
+                    for spc_name in obj_queue)
+                exit_codes = run_in_budget(
+                    run_tsk, args_lst, (cost,)*len(args_lst),
+                    ncores, mem=mem, stop_on_fail=True)
+                failed = tuple(
+                    spc_name for spc_name, code in zip(obj_queue, exit_codes)
+                    if code not in (0, None))
+                if failed:
+                    raise RuntimeError(
+                        f'Task {tsk} failed for {", ".join(failed)}')
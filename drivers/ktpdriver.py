@@ -11,8 +11,10 @@
         (6) Write functional forms to mechanism file
 """
 
+import os
 from mechroutines.ktp import tsk as ktp_tasks
 from mechroutines.ktp import label as ktp_label
+from mechroutines.es.runner import run_in_budget
 from mechlib.amech_io import parser
 from mechlib.amech_io import rate_paths
 from mechlib.amech_io import printer as ioprinter
@@ -57,6 +59,14 @@ def run(pes_rlst, pes_grp_dct,
     # Group the PESs into lists
     pes_grps_rlst = parser.rlst.pes_groups(pes_rlst, pes_grp_dct)
 
+    # With njobs > 1, the MESS inputs for all PES groups are written first
+    # and the MESS jobs are then run together, up to njobs at once
+    njobs, nprocs = 1, 1
+    if run_rate_tsk is not None:
+        njobs = run_rate_tsk[-1]['njobs']
+        nprocs = run_rate_tsk[-1]['nprocs']
+    mess_jobs, grp_fit_args = [], []
+
     # --------------------------------------- #
     # LOOP OVER ALL OF THE SUBPES in PES_RLST #
     # --------------------------------------- #
@@ -101,9 +111,13 @@ def run(pes_rlst, pes_grp_dct,
             # Run mess to produce rates (currently nothing from tsk lst used)
             if run_rate_tsk is not None:
                 tsk_key_dct = run_rate_tsk[-1]
-                ktp_tasks.run_messrate_task(
+                mess_args = (
                     pes_inf, all_rxn_lst[pesgrp_num],
                     tsk_key_dct, spc_dct, rate_paths_dct)
+                if njobs > 1:
+                    mess_jobs.append(mess_args)
+                else:
+                    ktp_tasks.run_messrate_task(*mess_args)
 
         # ---------------------------------------- #
         # FIT THE COMBINES RATES FOR ENTIRE GROUP  #
@@ -112,15 +126,64 @@ def run(pes_rlst, pes_grp_dct,
         # Fit rates to functional forms; write parameters to ChemKin file
         if run_fit_tsk is not None:
             tsk_key_dct = run_fit_tsk[-1]
-            ktp_tasks.run_fits_task(
+            fit_args = (
                 pes_grp_rlst, pes_param_dct, rate_paths_dct, mdriver_path,
                 pes_mod_dct, spc_mod_dct, thy_dct,
                 tsk_key_dct, spc_dct)
+            if njobs > 1:
+                grp_fit_args.append(fit_args)
+            else:
+                ktp_tasks.run_fits_task(*fit_args)
+        else:
+            grp_fit_args.append(None)
+
+    # Run the MESS jobs of all groups, then fit the rates of each group
+    if njobs > 1:
+        _run_mess_jobs(mess_jobs, njobs, nprocs)
+        for fit_args in grp_fit_args:
+            if fit_args is not None:
+                ktp_tasks.run_fits_task(*fit_args)
 
 
 # ------- #
 # UTILITY #
 # ------- #
+def _run_mess_jobs(mess_jobs, njobs, nprocs):
+    """ Run the MESS rate jobs for all of the PES groups, with up to njobs
+        running at once. Each job runs MESS with nprocs processors, so
+        fewer jobs are run at once if the processors available to this
+        process cannot hold njobs of them.
+
+        :param mess_jobs: run_messrate_task args of each job
+        :type mess_jobs: tuple(tuple(obj))
+        :param njobs: number of MESS jobs to run at once
+        :type njobs: int
+        :param nprocs: number of processors used by each MESS job
+        :type nprocs: int
+    """
+
+    if hasattr(os, 'sched_getaffinity'):
+        ncores = len(os.sched_getaffinity(0))
+    else:
+        ncores = os.cpu_count() or 1
+    ncores = min(njobs * nprocs, ncores)
+
+    if mess_jobs:
+        ioprinter.info_message(
+            f'Running {len(mess_jobs)} MESS rate inputs with up to '
+            f'{njobs} at once, each using {nprocs} of {ncores} '
+            'processors...', newline=1)
+        exit_codes = run_in_budget(
+            ktp_tasks.run_messrate_task, tuple(mess_jobs),
+            ((nprocs, 0.0),)*len(mess_jobs), ncores, stop_on_fail=True)
+        failed = tuple(
+            str(mess_args[0]) for mess_args, code in zip(mess_jobs, exit_codes)
+            if code not in (0, None))
+        if failed:
+            raise RuntimeError(
+                f'MESS rate jobs failed for PES groups {", ".join(failed)}')
+
+
 def _process(tsk, ktp_tsk_lst, pes_grp_rlst,
              spc_mod_dct, spc_dct, glob_dct,
              run_prefix, save_prefix):
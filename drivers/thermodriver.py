@@ -73,21 +73,24 @@ def run(pes_rlst, spc_rlst,
 
     # Build a list of the species to calculate thermochem for loops below
     # and build the paths [(messpf, nasa)], models and levels for each spc
+    nprocs = 1
     if write_messpf_tsk is not None:
         cnf_range = write_messpf_tsk[-1]['cnf_range']
         sort_str = write_messpf_tsk[-1]['sort']
+        nprocs = write_messpf_tsk[-1]['nprocs']
     elif run_fit_tsk is not None:
         cnf_range = run_fit_tsk[-1]['cnf_range']
         sort_str = run_fit_tsk[-1]['sort']
     else:
         cnf_range = run_messpf_tsk[-1]['cnf_range']
         sort_str = run_messpf_tsk[-1]['sort']
+        nprocs = run_messpf_tsk[-1]['njobs']
     spc_grp_dct, spc_locs_dct, thm_paths_dct, sort_info_lst = _set_spc_queue(
         spc_mod_dct, pes_rlst, spc_rlst,
         run_fit_tsk,
         spc_dct, thy_dct,
         save_prefix, run_prefix,
-        cnf_range, sort_str)
+        cnf_range, sort_str, nprocs=nprocs)
 
     # ----------------------------------- #
     # RUN THE REQUESTED THERMDRIVER TASKS #
@@ -104,7 +107,7 @@ def run(pes_rlst, spc_rlst,
     if run_messpf_tsk is not None:
         thermo_tasks.run_messpf_task(
             run_messpf_tsk, spc_locs_dct, spc_dct,
-            thm_paths_dct)
+            thm_paths_dct, run_prefix=run_prefix)
 
     # Use MESS partition functions to compute thermo quantities
     if run_fit_tsk is not None:
@@ -152,7 +155,7 @@ def _set_spc_queue(
         run_fit_tsk,
         spc_dct, thy_dct,
         save_prefix, run_prefix,
-        cnf_range='min', sort_str=None, spc_grp_dct=None):
+        cnf_range='min', sort_str=None, spc_grp_dct=None, nprocs=1):
     """ Determine the list of species to do thermo on
     """
     # Build various species lists
@@ -177,7 +180,7 @@ def _set_spc_queue(
     # Set locs and paths to species we will be doing calcs for
     spc_locs_dct = _set_spc_locs_dct(
         spc_queue, spc_dct, spc_mod_dct_i, run_prefix, save_prefix,
-        cnf_range, sort_info_lst)
+        cnf_range, sort_info_lst, nprocs=nprocs)
     thm_paths = thermo_paths(
         spc_dct, spc_locs_dct, spc_mods, run_prefix,
         spc_grp_dct)
@@ -187,7 +190,7 @@ def _set_spc_queue(
 
 def _set_spc_locs_dct(
         spc_queue, spc_dct, spc_mod_dct_i, run_prefix, save_prefix,
-        cnf_range='min', sort_info_lst=None, saddle=False):
+        cnf_range='min', sort_info_lst=None, saddle=False, nprocs=1):
     """ get a dictionary of locs
     """
     spc_locs_dct = {}
@@ -195,6 +198,7 @@ def _set_spc_locs_dct(
         spc_locs_lst = filesys.models.get_spc_locs_lst(
             spc_dct[spc_name], spc_mod_dct_i,
             run_prefix, save_prefix, saddle=saddle,
-            cnf_range=cnf_range, sort_info_lst=sort_info_lst)
+            cnf_range=cnf_range, sort_info_lst=sort_info_lst,
+            nprocs=nprocs)
         spc_locs_dct[spc_name] = spc_locs_lst
     return spc_locs_dct
@@ -0,0 +1,122 @@
+""" Content-addressed store, in the run filesystem, for the results of
+    external programs (ProjRot, MESSPF) that MechDriver runs.
+
+    Results are stored under a hash of everything that determines them
+    (the program scripts and the full input), so identical input is only
+    ever run once for a run prefix, independent of the job path it was
+    run in or which driver asked for it.
+"""
+
+import os
+import pickle
+import hashlib
+import numpy
+
+
+CACHE_DIR = 'CACHE'
+
+# Size of the blocks in which files are read to be hashed
+HASH_BLOCK = 1 << 20
+
+
+def input_hash(*objs):
+    """ Hash the scripts, strings, geometries, Hessians and numbers that
+        make up the input to a program, including the full data of arrays
+
+        :rtype: str
+    """
+
+    hsh = hashlib.sha256()
+
+    def _update(obj):
+        if isinstance(obj, (tuple, list)):
+            hsh.update(b'(')
+            for sub_obj in obj:
+                _update(sub_obj)
+            hsh.update(b')')
+        elif isinstance(obj, dict):
+            _update(sorted(obj.items(), key=repr))
+        elif isinstance(obj, numpy.ndarray):
+            hsh.update(f'{obj.dtype}{obj.shape}'.encode())
+            hsh.update(numpy.ascontiguousarray(obj).tobytes())
+        elif isinstance(obj, bytes):
+            hsh.update(obj)
+        else:
+            hsh.update(f'{obj!r},'.encode())
+
+    _update(objs)
+
+    return hsh.hexdigest()
+
+
+def file_hash(path):
+    """ Hash the contents of a file, read in blocks so that large data
+        files are never held in memory
+
+        :param path: path to the file
+        :type path: str
+        :rtype: str
+    """
+
+    hsh = hashlib.sha256()
+    with open(path, mode='rb') as hsh_file:
+        for block in iter(lambda: hsh_file.read(HASH_BLOCK), b''):
+            hsh.update(block)
+
+    return hsh.hexdigest()
+
+
+def read_result(prefix, prog, key):
+    """ Read the result stored for a program and input hash
+
+        :param prefix: root of the run filesystem
+        :type prefix: str
+        :param prog: name of the program
+        :type prog: str
+        :param key: hash of the input
+        :type key: str
+        :rtype: (bool, obj)
+    """
+
+    found, result = False, None
+    path = _result_path(prefix, prog, key)
+    if os.path.exists(path):
+        try:
+            with open(path, 'rb') as res_file:
+                result = pickle.load(res_file)
+            found = True
+        except (OSError, EOFError, pickle.UnpicklingError):
+            found, result = False, None
+
+    return found, result
+
+
+def write_result(prefix, prog, key, result):
+    """ Store the result for a program and input hash. Failures to write
+        are not fatal since the program can always be run again.
+
+        :param prefix: root of the run filesystem
+        :type prefix: str
+        :param prog: name of the program
+        :type prog: str
+        :param key: hash of the input
+        :type key: str
+        :param result: parsed output of the program
+        :type result: obj
+    """
+
+    path = _result_path(prefix, prog, key)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'wb') as res_file:
+            pickle.dump(result, res_file)
+        os.replace(tmp_path, path)
+    except (OSError, pickle.PicklingError):
+        print(f'Unable to store {prog} result at {path}')
+
+
+def _result_path(prefix, prog, key):
+    """ Path to the file storing the result for a program and input hash
+    """
+    return os.path.join(prefix, CACHE_DIR, prog, key[:2], f'{key}.pkl')
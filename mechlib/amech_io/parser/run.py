@@ -42,6 +42,8 @@ RUN_INP_VAL_DCT = {
     'out_spc': ((str,), ('csv',), 'csv'),
     'print_mech': ((bool,), (True, False), False),
     'print_debug': ((bool,), (True, False), False),
+    'es_ncores': ((int,), (), None),
+    'es_mem': ((float, int), (), None),
     'run_prefix': ((str,), (), None),
     'save_prefix': ((str,), (), None)
 }
@@ -63,9 +65,11 @@ SUPP_OBJS = ('spc', 'ts')
 TSK_KEY_DCT = {
     # Electronic Structure Driver Tasks
     'init_geom': (('spc',), BASE),
-    'find_ts': (('spc', 'ts'), BASE + MREF + ('nobarrier', 'varecof_nprocs')),
+    'find_ts': (('spc', 'ts'), BASE + MREF + ('nobarrier', 'varecof_nprocs',
+                                              'stop_margin')),
     'conf_pucker': (('spc', 'ts'), BASE + ('cnf_range', 'sort',)),
-    'conf_samp': (('spc', 'ts'), BASE + ('cnf_range', 'sort', 'resave',)),
+    'conf_samp': (('spc', 'ts'), BASE + ('cnf_range', 'sort', 'resave',
+                                          'njobs')),
     'conf_energy': (('spc', 'ts'), BASE + ('cnf_range', 'sort',)),
     'conf_grad': (('spc', 'ts'), BASE + ('cnf_range', 'sort',)),
     'conf_hess': (('spc', 'ts'), BASE + ('cnf_range', 'sort',)),
@@ -73,7 +77,8 @@ TSK_KEY_DCT = {
     'conf_prop': (('spc', 'ts'), BASE + ('cnf_range', 'sort',)),
     'conf_opt': (('spc', 'ts'), BASE + ('cnf_range', 'sort',)),
     'hr_scan': (('spc', 'ts'), BASE + ('tors_model', 'resamp_min',
-                                       'cnf_range', 'sort',)),
+                                       'cnf_range', 'sort', 'njobs',
+                                       'adapt_grid')),
     'hr_grad': (('spc', 'ts'), BASE + ('tors_model', 'cnf_range', 'sort',)),
     'hr_hess': (('spc', 'ts'), BASE + ('tors_model', 'cnf_range', 'sort',)),
     'hr_energy': (('spc', 'ts'), BASE + ('tors_model', 'cnf_range', 'sort',)),
@@ -106,8 +111,8 @@ TSK_KEY_DCT = {
     'write_mess': ((), ('kin_model', 'spc_model', 'overwrite',
                         'well_extension', 'mess_version',
                         'float_precision',
-                        'cnf_range', 'sort')),
-    'run_mess': ((), ('kin_model', 'spc_model', 'nprocs',
+                        'cnf_range', 'sort', 'nprocs', 'preload')),
+    'run_mess': ((), ('kin_model', 'spc_model', 'nprocs', 'njobs',
                       'well_extension', 'mess_version',
                       'cnf_range', 'sort')),
     'run_fits': ((), ('kin_model',
@@ -135,12 +140,14 @@ TSK_VAL_DCT = {
     'tors_model': ((str,),
                    ('1dhr', '1dhrf', '1dhrfa', 'mdhr', 'mdhrv'), '1dhr'),
     'resamp_min': ((bool,), (True, False), False),
+    'adapt_grid': ((bool,), (True, False), False),
     'hrthresh': ((float,), (), -0.2),
     'potthresh': ((float,), (), 0.3),
     'rxncoord': ((str,), ('irc', 'auto'), 'auto'),
     'nobarrier': ((str,), ('pst', 'rpvtst', 'vrctst'), None),
     're_id': ((bool,), (True, False), False),
     'varecof_nprocs': ((int,), (), 10),
+    'stop_margin': ((float,), (), None),
     # Trans
     'njobs': ((int,), (), 1),
     'nsamp': ((int,), (), 1),
@@ -160,6 +167,12 @@ TSK_VAL_DCT = {
     'combine': ((str,), ('stereo',), None),
     'linked_pes': ((tuple,), (), None),
     'float_precision': ((str,), ('double', 'quadruple'), 'double'),
+    'preload': ((bool,), (True, False), False),
+}
+# Defaults of keywords that differ for some tasks from those above,
+# e.g., write_mess only uses several processes if requested
+TSK_DEF_DCT = {
+    'write_mess': {'nprocs': 1},
 }
 # Have nconfs and econfs keywords and combine them to figure out which to use?
 
@@ -363,6 +376,7 @@ def _tsk_defaults(tsk_lst):
             tsk = _tsk_lst[:-1][-1]
             default_dct = defaults_from_key_val_dcts(
                 tsk, TSK_KEY_DCT, TSK_VAL_DCT)
+            default_dct.update(TSK_DEF_DCT.get(tsk, {}))
             new_key_dct = automol.util.dict_.right_update(
                 default_dct, keyword_dct)
 
@@ -3,10 +3,36 @@
 """
 
 import os
+import autorun
 import mess_io
 from mechlib.amech_io import printer as ioprinter
 
 
+def write_input(run_path, inp_str, aux_dct=None, input_name='mess.inp'):
+    """ Write a MESS input file and its auxiliary data files into a run
+        directory. Data files given as a function of the path to write to,
+        rather than as a string, are streamed into the directory by it.
+
+        :param run_path: path to the run directory
+        :type run_path: str
+        :param inp_str: MESS input string
+        :type inp_str: str
+        :param aux_dct: data strings or writers for each data file name
+        :type aux_dct: dict[str: str or function]
+        :param input_name: name of the input file
+        :type input_name: str
+    """
+
+    aux_dct = aux_dct or {}
+    str_dct = {name: dat for name, dat in aux_dct.items()
+               if isinstance(dat, str)}
+    autorun.write_input(
+        run_path, inp_str, aux_dct=str_dct, input_name=input_name)
+    for name, dat in aux_dct.items():
+        if name not in str_dct:
+            dat(os.path.join(run_path, name))
+
+
 def output(formulastr, final_pf, mess_path, filename='pf.dat'):
     """ Write a mess output file for a pf file
     """
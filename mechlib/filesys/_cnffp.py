@@ -0,0 +1,117 @@
+""" Cheap invariants used to prune the saved conformers that a new
+    conformer must be compared against with the (expensive) automol
+    geometry comparisons when assessing its uniqueness
+
+    Only conformers that could pass a comparison are kept as candidates,
+    so a check run on the candidates gives the same result as one run on
+    all of the saved conformers:
+    - conformers are only compared for symmetry if their energies lie
+      within a threshold of one another;
+    - two geometries can only have distance matrices within a threshold
+      of one another if their sorted interatomic distances also are.
+
+    The 'dist' comparison of automol.geom.is_unique checks the elements
+    of the two distance matrices with numpy.allclose, so that it holds if
+    |d1 - d2| <= atol + thresh*|d2| for every pair of atoms, with atol the
+    numpy default. Whichever geometry gives d2, every term of this bound
+    is at most atol + thresh*max(1, max(d1), max(d2)), which also covers
+    a check of |d1 - d2| <= thresh. Sorting the
+    distances of both geometries does not increase the largest difference
+    between them, so a geometry can only pass the comparison if its
+    sorted distances lie within that bound of those of the other.
+"""
+
+import numpy
+import automol.geom
+
+
+# Absolute tolerance of the numpy.allclose check in the automol comparison
+DIST_ATOL = 1.0e-8
+# Largest number of fingerprints kept by the process
+FP_CACHE_SIZE = 100000
+
+# Fingerprints already computed by this process, keyed on the geometry
+_FP_DCT = {}
+
+
+def fingerprint(geo):
+    """ Sorted interatomic distances of a geometry, which do not depend on
+        the order, position or orientation of the atoms
+
+        :param geo: molecular geometry
+        :type geo: automol.geom object
+        :rtype: numpy.ndarray
+    """
+
+    try:
+        fp_ = _FP_DCT.get(geo)
+    except TypeError:
+        geo = automol.geom.from_data(*zip(*geo))
+        fp_ = _FP_DCT.get(geo)
+    if fp_ is None:
+        dist_mat = numpy.asarray(automol.geom.distance_matrix(geo))
+        fp_ = numpy.sort(dist_mat[numpy.triu_indices(len(dist_mat), k=1)])
+        if len(_FP_DCT) >= FP_CACHE_SIZE:
+            _FP_DCT.clear()
+        _FP_DCT[geo] = fp_
+
+    return fp_
+
+
+def energy_candidates(ene, enes, ethresh):
+    """ Indices of the energies within a threshold of an energy
+
+        :param ene: energy to compare
+        :type ene: float
+        :param enes: energies to compare against
+        :type enes: tuple(float)
+        :param ethresh: threshold on the energy difference
+        :type ethresh: float
+        :rtype: tuple(int)
+    """
+
+    if not len(enes):
+        return ()
+    diffs = numpy.abs(numpy.asarray(enes, dtype=float) - ene)
+    return tuple(int(idx) for idx in numpy.flatnonzero(diffs < ethresh))
+
+
+def dist_bound(fp1, fp2, thresh):
+    """ Largest difference between the sorted distances of two geometries
+        that pass the automol 'dist' comparison against each other
+
+        :param fp1: sorted interatomic distances of one geometry
+        :type fp1: numpy.ndarray
+        :param fp2: sorted interatomic distances of the other geometry
+        :type fp2: numpy.ndarray
+        :param thresh: threshold of the comparison
+        :type thresh: float
+        :rtype: float
+    """
+    max_dist = max(numpy.max(fp1, initial=0.0), numpy.max(fp2, initial=0.0))
+    return DIST_ATOL + thresh * max(1.0, max_dist)
+
+
+def distance_candidates(geo, geos, thresh):
+    """ Indices of the geometries whose distance matrix could be within a
+        threshold of the distance matrix of a geometry
+
+        :param geo: molecular geometry to compare
+        :type geo: automol.geom object
+        :param geos: geometries to compare against
+        :type geos: tuple(automol.geom object)
+        :param thresh: threshold on the differences of the distances
+        :type thresh: float
+        :rtype: tuple(int)
+    """
+
+    fp_ = fingerprint(geo)
+    idxs = ()
+    for idx, sgeo in enumerate(geos):
+        sfp = fingerprint(sgeo)
+        if sfp.shape == fp_.shape:
+            if numpy.max(numpy.abs(sfp - fp_), initial=0.0) <= (
+                    dist_bound(fp_, sfp, thresh)):
+                idxs += (idx,)
+
+    return idxs
@@ -0,0 +1,177 @@
+""" Persistent index of conformer metadata stored alongside the
+    CONFS layer of the save filesystem
+
+    Each entry of the index holds the values read for one conformer
+    (energies, frequencies, geometry, hydrogen-bond flags) along with
+    a stamp (mtime, size) of every file the value was read from. A value
+    is only served from the index if none of those files have changed,
+    otherwise the caller re-reads the filesystem and updates the entry.
+"""
+
+import os
+import json
+
+
+INDEX_NAME = 'cnf_index.json'
+INDEX_VERSION = 1
+
+# Indices already loaded by this process, keyed on the CONFS path
+_IDX_DCT = {}
+
+
+def read(cnf_save_fs):
+    """ Obtain the index for a conformer save filesystem, reading the
+        sidecar file only the first time the index is requested
+
+        :param cnf_save_fs: CONF object with save filesys prefix
+        :type cnf_save_fs: autofile.fs.conformer obj
+        :rtype: dict[str: obj]
+    """
+
+    idx_path = _index_path(cnf_save_fs)
+    cnf_idx = _IDX_DCT.get(idx_path)
+    if cnf_idx is None:
+        cnf_idx = _read_file(idx_path)
+        _IDX_DCT[idx_path] = cnf_idx
+
+    return cnf_idx
+
+
+def write(cnf_save_fs, cnf_idx):
+    """ Write the index to the sidecar file if any entry was updated
+        since it was last written. Failures to write are not fatal
+        since the index only ever caches data in the filesystem.
+
+        :param cnf_save_fs: CONF object with save filesys prefix
+        :type cnf_save_fs: autofile.fs.conformer obj
+        :param cnf_idx: conformer index
+        :type cnf_idx: dict[str: obj]
+    """
+
+    if cnf_idx.pop('modified', False):
+        idx_path = _index_path(cnf_save_fs)
+        if os.path.isdir(os.path.dirname(idx_path)):
+            tmp_path = f'{idx_path}.{os.getpid()}.tmp'
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as idx_file:
+                    json.dump(cnf_idx, idx_file, default=float)
+                os.replace(tmp_path, idx_path)
+            except OSError:
+                print(f'Unable to write conformer index at {idx_path}')
+
+
+def lookup(cnf_idx, locs, key, paths):
+    """ Obtain a value stored in the index for a conformer if the files
+        the value was read from have not changed since it was stored
+
+        :param cnf_idx: conformer index
+        :type cnf_idx: dict[str: obj]
+        :param locs: (ring-id, tors-id) CONF filesys locators
+        :type locs: tuple(str, str)
+        :param key: name of the value in the entry
+        :type key: str
+        :param paths: paths of files the value is derived from
+        :type paths: tuple(str)
+        :rtype: (bool, obj)
+    """
+
+    found, val = False, None
+    rec = cnf_idx['entries'].get(_locs_key(locs), {}).get(key)
+    if rec is not None:
+        stamp, _val = rec
+        if stamp == file_stamps(paths):
+            found, val = True, _val
+
+    return found, val
+
+
+def store(cnf_idx, locs, key, paths, val):
+    """ Store a value for a conformer in the index along with the stamps
+        of the files it was read from
+
+        :param cnf_idx: conformer index
+        :type cnf_idx: dict[str: obj]
+        :param locs: (ring-id, tors-id) CONF filesys locators
+        :type locs: tuple(str, str)
+        :param key: name of the value in the entry
+        :type key: str
+        :param paths: paths of files the value is derived from
+        :type paths: tuple(str)
+        :param val: JSON-serializable value to store
+        :type val: obj
+    """
+
+    entry = cnf_idx['entries'].setdefault(_locs_key(locs), {})
+    entry[key] = [file_stamps(paths), val]
+    cnf_idx['modified'] = True
+
+
+def prune(cnf_idx, locs_lst):
+    """ Remove the entries of conformers no longer in the filesystem
+
+        :param cnf_idx: conformer index
+        :type cnf_idx: dict[str: obj]
+        :param locs_lst: locators of conformers in the filesystem
+        :type locs_lst: tuple(tuple(str, str))
+    """
+
+    keep_keys = set(_locs_key(locs) for locs in locs_lst)
+    for key in tuple(cnf_idx['entries']):
+        if key not in keep_keys:
+            cnf_idx['entries'].pop(key)
+            cnf_idx['modified'] = True
+
+
+def file_stamps(paths):
+    """ Build the stamps used to assess if the files have changed
+
+        :param paths: paths of files
+        :type paths: tuple(str)
+        :rtype: list(list(int)/None)
+    """
+
+    stamps = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            stamps.append([stat.st_mtime_ns, stat.st_size])
+        except OSError:
+            stamps.append(None)
+
+    return stamps
+
+
+def thy_key(thy_info):
+    """ Set the string used to key values that depend on theory level
+    """
+    return '_'.join(str(val) for val in thy_info)
+
+
+def _locs_key(locs):
+    """ Set the string used to key the entry of a conformer
+    """
+    return '/'.join(locs)
+
+
+def _index_path(cnf_save_fs):
+    """ Path to the sidecar file in the CONFS layer
+    """
+    return os.path.join(cnf_save_fs[0].path(), INDEX_NAME)
+
+
+def _read_file(idx_path):
+    """ Read the sidecar file, returning a new empty index if the file
+        is missing, unreadable or was written by another version
+    """
+
+    cnf_idx = None
+    if os.path.exists(idx_path):
+        try:
+            with open(idx_path, 'r', encoding='utf-8') as idx_file:
+                cnf_idx = json.load(idx_file)
+        except (OSError, ValueError):
+            cnf_idx = None
+    if cnf_idx is None or cnf_idx.get('version') != INDEX_VERSION:
+        cnf_idx = {'version': INDEX_VERSION, 'entries': {}}
+
+    return cnf_idx
@@ -0,0 +1,214 @@
+""" Registry of the input Z-Matrices of the conformers in a CONFS layer,
+    used to find conformers started from (nearly) the same Z-Matrix
+
+    The registry is a file of JSON records in the CONFS layer that is only
+    ever appended to, under a lock, so that the many processes sharing a
+    run prefix can all record the samples they launch. Each record holds
+    the locs of a conformer along with the string and coordinate values of
+    its input Z-Matrix (and the program, when known); later records for
+    the same locs update earlier ones. Each process reads the records
+    appended since its last read, so finding the conformers with a
+    Z-Matrix close to another one is a vectorized comparison of the
+    coordinate values, rather than a walk over the layer that parses the
+    input file of every conformer.
+
+    Conformers of the layer that are not yet in the registry (e.g., run
+    before it existed) are parsed once by the caller and then recorded.
+"""
+
+import os
+import json
+import fcntl
+import numpy
+import automol.zmat
+
+
+REG_NAME = 'cnf_registry.jsonl'
+
+# Registries already loaded by this process, keyed on the CONFS path
+_REG_DCT = {}
+
+
+def records(cnf_fs):
+    """ Obtain the records of all conformers in the registry of a CONFS
+        layer, keyed on their locs
+
+        :param cnf_fs: CONF object with run or save filesys prefix
+        :type cnf_fs: autofile.fs.conformer obj
+        :rtype: dict[tuple(str): dict[str: obj]]
+    """
+    return _refresh(cnf_fs)['recs']
+
+
+def record(cnf_fs, locs, zma, prog=None):
+    """ Add the input Z-Matrix of a conformer to the registry. Failures
+        to write are not fatal since conformers missing from the registry
+        are found by the caller reading the filesystem.
+
+        :param cnf_fs: CONF object with run or save filesys prefix
+        :type cnf_fs: autofile.fs.conformer obj
+        :param locs: (ring-id, tors-id) CONF filesys locators
+        :type locs: tuple(str, str)
+        :param zma: input Z-Matrix, or None if it could not be read
+        :type zma: automol.zmat object
+        :param prog: electronic structure program of the job
+        :type prog: str
+    """
+
+    rec = {'locs': list(locs), 'prog': prog, 'zma': None}
+    if zma is not None:
+        rec['zma'] = automol.zmat.string(zma)
+    reg_path = _registry_path(cnf_fs)
+    try:
+        with open(reg_path, 'a', encoding='utf-8') as reg_file:
+            fcntl.flock(reg_file, fcntl.LOCK_EX)
+            reg_file.write(json.dumps(rec) + '\n')
+            reg_file.flush()
+            fcntl.flock(reg_file, fcntl.LOCK_UN)
+    except OSError:
+        print(f'Unable to record conformer in registry at {reg_path}')
+
+    _add(_refresh(cnf_fs), rec)
+
+
+def similar_locs(cnf_fs, zma, dist_rtol=0.018, ang_atol=0.2):
+    """ Find the conformers of the registry whose input Z-Matrix is
+        almost equal to a Z-Matrix, as assessed by automol.zmat.almost_equal
+
+        The coordinate values of all conformers are first compared at once
+        with tolerances slightly looser than those of almost_equal, which
+        is then only called for the few conformers that pass.
+
+        :param cnf_fs: CONF object with run or save filesys prefix
+        :type cnf_fs: autofile.fs.conformer obj
+        :param zma: Z-Matrix to compare
+        :type zma: automol.zmat object
+        :param dist_rtol: relative tolerance on the distances
+        :type dist_rtol: float
+        :param ang_atol: absolute tolerance on the angles
+        :type ang_atol: float
+        :rtype: tuple(tuple(str))
+    """
+
+    reg = _refresh(cnf_fs)
+    sig = _signature(zma)
+    grp = reg['grps'].get(sig)
+    if grp is None:
+        return ()
+
+    # Stack the coordinates of the group, only when it gained conformers
+    if grp['arr'] is None or len(grp['arr']) != len(grp['locs']):
+        grp['arr'] = numpy.array(grp['vals'], dtype=float)
+    dist_msk, ang_msk = _coordinate_masks(zma)
+    vals = numpy.array(_values(zma), dtype=float)
+
+    diffs = numpy.abs(grp['arr'] - vals)
+    dist_ok = numpy.all(
+        diffs[:, dist_msk] <= 1.5 * dist_rtol * numpy.abs(vals[dist_msk])
+        + 1.0e-6, axis=1)
+    ang_diffs = numpy.mod(diffs[:, ang_msk], 2.0 * numpy.pi)
+    ang_diffs = numpy.minimum(ang_diffs, 2.0 * numpy.pi - ang_diffs)
+    ang_ok = numpy.all(ang_diffs <= 1.5 * ang_atol + 1.0e-6, axis=1)
+
+    sim_locs = ()
+    for idx in numpy.flatnonzero(dist_ok & ang_ok):
+        locs = grp['locs'][idx]
+        rec_zma = automol.zmat.from_string(reg['recs'][locs]['zma'])
+        if automol.zmat.almost_equal(rec_zma, zma,
+                                     dist_rtol=dist_rtol, ang_atol=ang_atol):
+            sim_locs += (locs,)
+
+    return sim_locs
+
+
+def _refresh(cnf_fs):
+    """ Obtain the registry kept by this process, updated with the
+        records appended to the file since it was last read
+    """
+
+    reg_path = _registry_path(cnf_fs)
+    reg = _REG_DCT.get(reg_path)
+    if reg is None:
+        reg = {'offset': 0, 'recs': {}, 'grps': {}}
+        _REG_DCT[reg_path] = reg
+
+    if os.path.exists(reg_path):
+        try:
+            with open(reg_path, 'rb') as reg_file:
+                reg_file.seek(reg['offset'])
+                new_bytes = reg_file.read()
+        except OSError:
+            new_bytes = b''
+
+        # Only take complete lines, a record may be being appended
+        end = new_bytes.rfind(b'\n') + 1
+        for line in new_bytes[:end].splitlines():
+            try:
+                _add(reg, json.loads(line))
+            except ValueError:
+                continue
+        reg['offset'] += end
+
+    return reg
+
+
+def _add(reg, rec):
+    """ Add a record to the registry kept by this process, replacing any
+        earlier record for the same locs
+    """
+
+    locs = tuple(rec['locs'])
+    old_rec = reg['recs'].get(locs)
+    if old_rec is not None and old_rec.get('zma') is not None:
+        grp = reg['grps'][old_rec['sig']]
+        idx = grp['locs'].index(locs)
+        grp['locs'].pop(idx)
+        grp['vals'].pop(idx)
+        grp['arr'] = None
+
+    rec = dict(rec)
+    if rec.get('zma') is not None:
+        zma = automol.zmat.from_string(rec['zma'])
+        rec['sig'] = _signature(zma)
+        grp = reg['grps'].setdefault(
+            rec['sig'], {'locs': [], 'vals': [], 'arr': None})
+        grp['locs'].append(locs)
+        grp['vals'].append(_values(zma))
+    reg['recs'][locs] = rec
+
+
+def _signature(zma):
+    """ Symbols and connectivity of a Z-Matrix, which need to match for
+        the coordinate values of two Z-Matrices to be compared
+    """
+    return json.dumps([automol.zmat.symbols(zma),
+                       automol.zmat.key_matrix(zma)])
+
+
+def _values(zma):
+    """ Coordinate values of a Z-Matrix, in Z-Matrix order
+    """
+
+    val_mat = automol.zmat.value_matrix(zma)
+    return ([row[0] for row in val_mat[1:]] +
+            [row[1] for row in val_mat[2:]] +
+            [row[2] for row in val_mat[3:]])
+
+
+def _coordinate_masks(zma):
+    """ Masks of the distances and the angles in the coordinate values
+    """
+
+    natms = automol.zmat.count(zma)
+    ndist = max(natms - 1, 0)
+    nvals = ndist + max(natms - 2, 0) + max(natms - 3, 0)
+    dist_msk = numpy.zeros(nvals, dtype=bool)
+    dist_msk[:ndist] = True
+
+    return dist_msk, ~dist_msk
+
+
+def _registry_path(cnf_fs):
+    """ Path to the registry file in the CONFS layer
+    """
+    return os.path.join(cnf_fs[0].path(), REG_NAME)
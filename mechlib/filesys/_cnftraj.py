@@ -0,0 +1,378 @@
+""" Energy-sorted list of the saved conformers, maintained incrementally
+    while conformers are being sampled and saved
+
+    The list holds the (energy, locs, geometry) of every conformer in a
+    CONFS save layer with an energy at some level of theory, along with a
+    stamp (mtime, size) of the energy and geometry files they were read
+    from. It is kept in memory for the process and persisted to a sidecar
+    file in the CONFS layer, so that saving a new conformer only needs the
+    data of conformers saved, re-saved or removed since the list was last
+    synced with the filesystem, rather than a read of every saved
+    conformer. The stamps of all conformers are checked when the sidecar
+    is loaded, and afterwards only those of the conformers being saved;
+    the directories of the layer are only listed again once their mtime
+    shows that another process has added or removed conformers. The .xyz
+    trajectory files of the layer are rewritten from the list, at most
+    once per interval while sampling, and once more when the sampling is
+    done (or, for conformers saved outside of a sampler, when the process
+    exits).
+"""
+
+import os
+import json
+import time
+import atexit
+import bisect
+import autofile
+from mechlib.filesys._cnfidx import thy_key
+from mechlib.filesys._cnfidx import file_stamps
+
+
+TRAJ_NAME = 'cnf_traj.json'
+TRAJ_VERSION = 2
+# Shortest time (in seconds) between rewrites of the trajectory files
+TRAJ_INTERVAL = 60.0
+
+# Lists already loaded by this process, keyed on the CONFS path and theory
+_TRAJ_DCT = {}
+
+
+def sync(cnf_save_fs, mod_thy_info, locs_lst=()):
+    """ Obtain the sorted list of conformers for a save filesystem and
+        level of theory, updated with the conformers saved or removed
+        since it was last synced, and with those of the given locs whose
+        energy or geometry files have changed since they were read.
+        Conformers with no energy saved yet are not added to the list but
+        returned, so the caller can decide to wait for them.
+
+        :param cnf_save_fs: CONF object with save filesys prefix
+        :type cnf_save_fs: autofile.fs.conformer obj
+        :param mod_thy_info: level of theory of the energies
+        :type mod_thy_info: tuple(str)
+        :param locs_lst: locs of conformers whose files are checked
+        :type locs_lst: tuple(tuple(str))
+        :rtype: (dict[str: obj], tuple(tuple(str)))
+    """
+
+    traj = _load(cnf_save_fs, mod_thy_info)
+    check_locs = traj['check'] | set(tuple(locs) for locs in locs_lst)
+    traj['check'] = set()
+
+    saved_set = _saved_locs(traj)
+    for locs in tuple(traj['cnfs']):
+        if locs not in saved_set:
+            _drop(traj, locs)
+    for locs in check_locs:
+        if (locs in traj['cnfs'] and
+                traj['cnfs'][locs][2] != _stamp(traj, locs)):
+            _drop(traj, locs)
+
+    pending_locs = ()
+    for locs in sorted(saved_set - traj['cnfs'].keys()):
+        sp_fs = autofile.fs.single_point(cnf_save_fs[-1].path(locs))
+        if sp_fs[-1].file.energy.exists(mod_thy_info[1:4]):
+            _add(traj,
+                 sp_fs[-1].file.energy.read(mod_thy_info[1:4]),
+                 locs,
+                 cnf_save_fs[-1].file.geometry.read(locs))
+        else:
+            pending_locs += (locs,)
+
+    return traj, pending_locs
+
+
+def insert(traj, ene, locs, geo):
+    """ Insert a conformer saved by this process into the list, stamped
+        with the files its energy and geometry are saved in
+
+        :param traj: sorted list of conformers
+        :type traj: dict[str: obj]
+        :param ene: energy of the conformer
+        :type ene: float
+        :param locs: (ring-id, tors-id) CONF filesys locators
+        :type locs: tuple(str, str)
+        :param geo: geometry of the conformer
+        :type geo: automol.geom object
+    """
+
+    locs = tuple(locs)
+    _add(traj, ene, locs, geo)
+    _note_saved(traj, locs, True)
+
+
+def remove(traj, locs):
+    """ Remove a conformer removed by this process from the list, if it
+        is there
+
+        :param traj: sorted list of conformers
+        :type traj: dict[str: obj]
+        :param locs: (ring-id, tors-id) CONF filesys locators
+        :type locs: tuple(str, str)
+    """
+
+    locs = tuple(locs)
+    _drop(traj, locs)
+    _note_saved(traj, locs, False)
+
+
+def conformers(traj):
+    """ Obtain the energy, locs and geometry of the conformers in the
+        list, in order of energy
+
+        :param traj: sorted list of conformers
+        :type traj: dict[str: obj]
+        :rtype: tuple((float, tuple(str), automol.geom object))
+    """
+    return tuple((ene, locs, traj['cnfs'][locs][1])
+                 for ene, locs in traj['order'])
+
+
+def write(cnf_save_fs, traj, rid=None, force=False):
+    """ Write the ring-torsion trajectory file (and the torsion trajectory
+        file of a ring-id, if given) from the list, along with the sidecar
+        file. Unless forced, nothing is written if the files were written
+        less than TRAJ_INTERVAL seconds ago; the pending changes are then
+        written by a later call.
+
+        :param cnf_save_fs: CONF object with save filesys prefix
+        :type cnf_save_fs: autofile.fs.conformer obj
+        :param traj: sorted list of conformers
+        :type traj: dict[str: obj]
+        :param rid: ring-id locator for the torsion trajectory
+        :type rid: str
+        :param force: write the files regardless of the interval
+        :type force: bool
+    """
+
+    if rid is not None:
+        traj['rids'].add(rid)
+    if not traj['modified']:
+        return
+    if not force and time.time() - traj['written'] < TRAJ_INTERVAL:
+        return
+
+    cnfs = conformers(traj)
+    if cnfs:
+        ring_traj = tuple(
+            (geo, f'energy: {ene:<15.10f} \t {locs[0]}')
+            for ene, locs, geo in cnfs)
+        traj_path = cnf_save_fs[0].file.trajectory.path()
+        print(f"Updating ring-torsion trajectory file at {traj_path}")
+        cnf_save_fs[0].file.trajectory.write(ring_traj)
+
+    for _rid in sorted(traj['rids']):
+        tors_traj = tuple(
+            (geo, f'energy: {ene:>15.10f} \t {locs[0]} {locs[1]}')
+            for ene, locs, geo in cnfs
+            if locs[0] == _rid)
+        if tors_traj:
+            traj_path = cnf_save_fs[1].file.trajectory.path([_rid])
+            print(f"Updating torsion trajectory file at {traj_path}")
+            cnf_save_fs[1].file.trajectory.write(tors_traj, [_rid])
+
+    _write_file(cnf_save_fs, traj)
+    traj['modified'] = False
+    traj['written'] = time.time()
+
+
+def flush(cnf_save_fs, mod_thy_info, rid=None):
+    """ Write any changes to the list made by this process that have not
+        yet been written to the trajectory files
+
+        :param cnf_save_fs: CONF object with save filesys prefix
+        :type cnf_save_fs: autofile.fs.conformer obj
+        :param mod_thy_info: level of theory of the energies
+        :type mod_thy_info: tuple(str)
+        :param rid: ring-id locator for the torsion trajectory
+        :type rid: str
+    """
+
+    traj = _TRAJ_DCT.get(_traj_key(cnf_save_fs, mod_thy_info))
+    if traj is not None:
+        write(cnf_save_fs, traj, rid=rid, force=True)
+
+
+def _flush_all():
+    """ Write the changes to all lists not yet written by this process
+    """
+    for (cnfs_path, _), traj in _TRAJ_DCT.items():
+        if traj['modified'] and os.path.isdir(cnfs_path):
+            write(traj['fs'], traj, force=True)
+
+
+atexit.register(_flush_all)
+
+
+def _load(cnf_save_fs, mod_thy_info):
+    """ Obtain the list kept by this process, reading the sidecar file
+        only the first time the list is requested; the files of all of
+        the conformers read from it are checked on the next sync
+    """
+
+    key = _traj_key(cnf_save_fs, mod_thy_info)
+    traj = _TRAJ_DCT.get(key)
+    if traj is None:
+        traj = {'fs': cnf_save_fs, 'thy': key[1],
+                'sp_locs': tuple(mod_thy_info[1:4]),
+                'cnfs': {}, 'order': [], 'check': set(),
+                'saved': {}, 'dirs': {},
+                'rids': set(), 'modified': False, 'written': 0.0}
+        rec = _read_file(cnf_save_fs).get(key[1])
+        if rec is not None:
+            for ene, locs, geo, stamp in rec:
+                locs = tuple(locs)
+                traj['cnfs'][locs] = (
+                    ene,
+                    tuple((symb, tuple(xyz)) for symb, xyz in geo),
+                    stamp)
+                traj['order'].append((ene, locs))
+            traj['order'].sort()
+            traj['check'] = set(traj['cnfs'])
+        _TRAJ_DCT[key] = traj
+
+    return traj
+
+
+def _add(traj, ene, locs, geo):
+    """ Add a conformer to the list in order of energy, replacing any
+        conformer already at the locs
+    """
+    _drop(traj, locs)
+    bisect.insort(traj['order'], (ene, locs))
+    traj['cnfs'][locs] = (ene, geo, _stamp(traj, locs))
+    traj['modified'] = True
+
+
+def _drop(traj, locs):
+    """ Drop a conformer from the list, if it is there
+    """
+    cnf = traj['cnfs'].pop(locs, None)
+    if cnf is not None:
+        idx = bisect.bisect_left(traj['order'], (cnf[0], locs))
+        traj['order'].pop(idx)
+        traj['modified'] = True
+
+
+def _saved_locs(traj):
+    """ Obtain the locs of all conformers saved in the layer, listing
+        only the directories whose mtime has changed since they were
+        last listed
+    """
+
+    cnf_save_fs = traj['fs']
+    saved_dct = traj['saved']
+    if _dir_changed(traj, cnf_save_fs[0].path()):
+        rids = set(locs[0] for locs in cnf_save_fs[1].existing())
+        for rid in set(saved_dct) - rids:
+            saved_dct.pop(rid)
+            traj['dirs'].pop(cnf_save_fs[1].path([rid]), None)
+        for rid in rids - set(saved_dct):
+            saved_dct[rid] = set()
+    for rid, rid_locs in saved_dct.items():
+        if _dir_changed(traj, cnf_save_fs[1].path([rid])):
+            rid_locs.clear()
+            rid_locs.update(
+                tuple(locs) for locs in cnf_save_fs[-1].existing([rid]))
+
+    return set().union(*saved_dct.values())
+
+
+def _note_saved(traj, locs, saved):
+    """ Record a conformer saved or removed by this process, along with
+        the mtimes of the directories it changed, so that the change does
+        not make the next sync list the directories again
+    """
+
+    cnf_save_fs = traj['fs']
+    rid_locs = traj['saved'].setdefault(locs[0], set())
+    if saved:
+        rid_locs.add(locs)
+    else:
+        rid_locs.discard(locs)
+    for path in (cnf_save_fs[0].path(), cnf_save_fs[1].path([locs[0]])):
+        if path in traj['dirs']:
+            traj['dirs'][path] = _dir_stamp(path)
+
+
+def _dir_changed(traj, path):
+    """ Assess if a directory has changed since it was last listed, and
+        note its current mtime as listed
+    """
+    stamp = _dir_stamp(path)
+    changed = stamp is None or traj['dirs'].get(path) != stamp
+    traj['dirs'][path] = stamp
+    return changed
+
+
+def _dir_stamp(path):
+    """ Obtain the mtime of a directory, or None if it does not exist
+    """
+    try:
+        stamp = os.stat(path).st_mtime_ns
+    except OSError:
+        stamp = None
+    return stamp
+
+
+def _write_file(cnf_save_fs, traj):
+    """ Write the list into the sidecar file, alongside the lists of the
+        other levels of theory. Failures to write are not fatal since the
+        list is rebuilt from the filesystem if the sidecar is missing.
+    """
+
+    traj_path = _traj_path(cnf_save_fs)
+    if not os.path.isdir(os.path.dirname(traj_path)):
+        return
+
+    traj_dct = _read_file(cnf_save_fs)
+    traj_dct['version'] = TRAJ_VERSION
+    traj_dct[traj['thy']] = [
+        [ene, list(locs), geo, traj['cnfs'][locs][2]]
+        for ene, locs, geo in conformers(traj)]
+    tmp_path = f'{traj_path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as traj_file:
+            json.dump(traj_dct, traj_file, default=float)
+        os.replace(tmp_path, traj_path)
+    except OSError:
+        print(f'Unable to write conformer list at {traj_path}')
+
+
+def _read_file(cnf_save_fs):
+    """ Read the sidecar file, returning an empty set of lists if the
+        file is missing, unreadable or was written by another version
+    """
+
+    traj_dct = None
+    traj_path = _traj_path(cnf_save_fs)
+    if os.path.exists(traj_path):
+        try:
+            with open(traj_path, 'r', encoding='utf-8') as traj_file:
+                traj_dct = json.load(traj_file)
+        except (OSError, ValueError):
+            traj_dct = None
+    if traj_dct is None or traj_dct.get('version') != TRAJ_VERSION:
+        traj_dct = {'version': TRAJ_VERSION}
+
+    return traj_dct
+
+
+def _stamp(traj, locs):
+    """ Build the stamps of the energy and geometry files of a conformer
+    """
+    cnf_save_fs = traj['fs']
+    sp_fs = autofile.fs.single_point(cnf_save_fs[-1].path(locs))
+    return file_stamps((sp_fs[-1].file.energy.path(traj['sp_locs']),
+                        cnf_save_fs[-1].file.geometry.path(locs)))
+
+
+def _traj_key(cnf_save_fs, mod_thy_info):
+    """ Set the key of the list for a save filesystem and level of theory
+    """
+    return (cnf_save_fs[0].path(), thy_key(mod_thy_info[1:4]))
+
+
+def _traj_path(cnf_save_fs):
+    """ Path to the sidecar file in the CONFS layer
+    """
+    return os.path.join(cnf_save_fs[0].path(), TRAJ_NAME)
@@ -0,0 +1,241 @@
+""" Parsed results of electronic structure jobs, stored in a sidecar file
+    next to the output in the RUN filesystem
+
+    When a job finishes, the values the drivers read from its output (the
+    success of the job, energy, optimized geometry and Z-Matrix, gradient,
+    Hessian and frequencies) are parsed once and written into a small JSON
+    file in the job directory, along with a stamp of the output file.
+    Reading the job back loads the sidecar, if the output has not changed
+    since, and keeps its values in memory for the output string. The
+    readers below then return those values for that output rather than
+    parsing the (possibly very large) output again with elstruct; any
+    value not in the sidecar is parsed from the output as before.
+"""
+
+import os
+import json
+import collections
+import numpy
+import elstruct
+
+
+PARSED_NAME = 'output_parsed.json'
+PARSED_VERSION = 1
+# Number of outputs whose parsed values are kept in memory
+PARSED_CACHE_SIZE = 32
+
+# Values parsed from the output of each type of job, besides the energy
+JOB_VALUES_DCT = {
+    elstruct.Job.OPTIMIZATION: ('opt_geometry', 'opt_zmatrix', 'inp_zmatrix'),
+    elstruct.Job.GRADIENT: ('gradient',),
+    elstruct.Job.HESSIAN: ('hessian', 'harmonic_frequencies'),
+}
+
+# Parsed values of the outputs read by this process, keyed on the output
+_PARSED_DCT = collections.OrderedDict()
+
+
+def write(run_fs, job, prog, method, out_str, success, version=''):
+    """ Parse the values of a finished job from its output and write them
+        to the sidecar file in the job directory. Failures to write are
+        not fatal since the values can always be parsed from the output.
+
+        :param run_fs: filesystem object for the run filesys of the job
+        :type run_fs: autofile.fs.run object
+        :param job: label for job formatted to elstruct package definitions
+        :type job: str
+        :param prog: electronic structure program of the job
+        :type prog: str
+        :param method: electronic structure method of the job
+        :type method: str
+        :param out_str: output of the job
+        :type out_str: str
+        :param success: whether the output is that of a successful job
+        :type success: bool
+        :param version: version of the program
+        :type version: str
+    """
+
+    vals = {'success': bool(success), 'version': version}
+    if success:
+        parsed, ene = _parse('energy', prog, out_str, method)
+        if parsed:
+            vals['energy'] = {method: ene}
+        for name in JOB_VALUES_DCT.get(job, ()):
+            parsed, val = _parse(name, prog, out_str)
+            if parsed:
+                vals[name] = val
+    _remember(out_str, vals)
+
+    out_path = run_fs[-1].file.output.path([job])
+    parsed_path = os.path.join(run_fs[-1].path([job]), PARSED_NAME)
+    parsed_dct = _read_file(parsed_path)
+    parsed_dct[job] = {'stamp': _stamp(out_path), 'vals': vals}
+    tmp_path = f'{parsed_path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as parsed_file:
+            json.dump(parsed_dct, parsed_file, default=_jsonable)
+        os.replace(tmp_path, parsed_path)
+    except (OSError, TypeError, ValueError):
+        print(f'Unable to write parsed output at {parsed_path}')
+
+
+def read(run_fs, job, out_str):
+    """ Load the parsed values of a job from the sidecar file if it was
+        written for the current output of the job, keeping them in memory
+        for the readers below
+
+        :param run_fs: filesystem object for the run filesys of the job
+        :type run_fs: autofile.fs.run object
+        :param job: label for job formatted to elstruct package definitions
+        :type job: str
+        :param out_str: output of the job
+        :type out_str: str
+        :rtype: dict[str: obj] or None
+    """
+
+    vals = _PARSED_DCT.get(out_str)
+    if vals is None:
+        out_path = run_fs[-1].file.output.path([job])
+        rec = _read_file(
+            os.path.join(run_fs[-1].path([job]), PARSED_NAME)).get(job)
+        if rec is not None and rec['stamp'] == _stamp(out_path):
+            vals = {key: _from_json(key, val)
+                    for key, val in rec['vals'].items()}
+            _remember(out_str, vals)
+
+    return vals
+
+
+def energy(prog, method, out_str):
+    """ Energy of a job, from its parsed values if available
+    """
+    vals = _PARSED_DCT.get(out_str, {})
+    if method in vals.get('energy', {}):
+        return vals['energy'][method]
+    return elstruct.reader.energy(prog, method, out_str)
+
+
+def opt_geometry(prog, out_str):
+    """ Optimized geometry of a job, from its parsed values if available
+    """
+    return _value('opt_geometry', prog, out_str)
+
+
+def opt_zmatrix(prog, out_str):
+    """ Optimized Z-Matrix of a job, from its parsed values if available
+    """
+    return _value('opt_zmatrix', prog, out_str)
+
+
+def inp_zmatrix(prog, out_str):
+    """ Input Z-Matrix of a job, from its parsed values if available
+    """
+    return _value('inp_zmatrix', prog, out_str)
+
+
+def gradient(prog, out_str):
+    """ Gradient of a job, from its parsed values if available
+    """
+    return _value('gradient', prog, out_str)
+
+
+def hessian(prog, out_str):
+    """ Hessian of a job, from its parsed values if available
+    """
+    return _value('hessian', prog, out_str)
+
+
+def harmonic_frequencies(prog, out_str):
+    """ Harmonic frequencies of a job, from its parsed values if available
+    """
+    return _value('harmonic_frequencies', prog, out_str)
+
+
+def _value(name, prog, out_str):
+    """ Obtain a value parsed for an output, parsing it if not available
+    """
+    vals = _PARSED_DCT.get(out_str, {})
+    if name in vals:
+        return vals[name]
+    return getattr(elstruct.reader, name)(prog, out_str)
+
+
+def _parse(name, prog, out_str, *args):
+    """ Parse a value from an output, assessing if it could be parsed.
+        Values that could not are left out of the sidecar, so the reader
+        is called again (and raises as before) when they are requested.
+    """
+    parsed, val = True, None
+    try:
+        if name == 'energy':
+            val = elstruct.reader.energy(prog, *args, out_str)
+        else:
+            val = getattr(elstruct.reader, name)(prog, out_str)
+    except Exception:  # pylint: disable=broad-except
+        parsed = False
+    return parsed, val
+
+
+def _remember(out_str, vals):
+    """ Keep the parsed values of an output in memory
+    """
+    _PARSED_DCT[out_str] = vals
+    _PARSED_DCT.move_to_end(out_str)
+    while len(_PARSED_DCT) > PARSED_CACHE_SIZE:
+        _PARSED_DCT.popitem(last=False)
+
+
+def _jsonable(obj):
+    """ Convert the arrays and numbers of parsed values for JSON
+    """
+    if isinstance(obj, numpy.ndarray):
+        return {'array': obj.tolist()}
+    if isinstance(obj, numpy.generic):
+        return obj.item()
+    raise TypeError(f'Cannot write {type(obj)} to JSON')
+
+
+def _from_json(key, val):
+    """ Convert a value read from JSON back to the type the elstruct
+        reader returns it as
+    """
+
+    def _tuple(obj):
+        if isinstance(obj, dict) and 'array' in obj:
+            return numpy.array(obj['array'])
+        if isinstance(obj, list):
+            return tuple(_tuple(sub_obj) for sub_obj in obj)
+        return obj
+
+    return val if key in ('success', 'version', 'energy') else _tuple(val)
+
+
+def _read_file(parsed_path):
+    """ Read the sidecar file, returning an empty set of records if the
+        file is missing, unreadable or was written by another version
+    """
+
+    parsed_dct = None
+    if os.path.exists(parsed_path):
+        try:
+            with open(parsed_path, 'r', encoding='utf-8') as parsed_file:
+                parsed_dct = json.load(parsed_file)
+        except (OSError, ValueError):
+            parsed_dct = None
+    if parsed_dct is None or parsed_dct.get('version') != PARSED_VERSION:
+        parsed_dct = {'version': PARSED_VERSION}
+
+    return parsed_dct
+
+
+def _stamp(path):
+    """ Stamp (mtime, size) used to assess if the output has changed
+    """
+    try:
+        stat = os.stat(path)
+        stamp = [stat.st_mtime_ns, stat.st_size]
+    except OSError:
+        stamp = None
+    return stamp
+
@@ -0,0 +1,143 @@
+""" Bulk preloading of the parts of the save filesystem that a task will
+    read for a set of species and transition states
+
+    Reading the save filesystem through autofile makes a long series of
+    small stat, listdir and open calls. On network filesystems (e.g.,
+    Lustre or NFS) each of these is a round trip to a server, and their
+    latency rather than any computation sets the time it takes to read
+    the data. The preload walks the directory trees of the conformers of
+    the species and transition states at the theory levels of a model up
+    front, with many directories listed and files read at once in
+    threads, so the attributes and contents of the files are held in the
+    client and page caches when autofile reads them afterwards.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait, FIRST_COMPLETED
+from mechanalyzer.inf import spc as sinfo
+from mechanalyzer.inf import thy as tinfo
+from mechanalyzer.inf import rxn as rinfo
+from mechlib.filesys._build import build_fs
+from mechlib.filesys._build import root_locs
+
+
+# Directories not read by the preload: tau samples are large and only
+# needed by the tau models, which read them through the sample store
+PRELOAD_SKIP = ('TAU',)
+# Files larger than this (in bytes) are only stat-ed, not read
+PRELOAD_MAX_SIZE = 4 * 1024**2
+
+
+def model_save_paths(spc_dct, names, spc_model_dct_i, save_prefix):
+    """ Set the paths of the save filesystem holding the data read to
+        build the partition functions of a set of species and transition
+        states: the CONFORMER layers at each of the theory levels of the
+        species model that pf_filesys reads from
+
+        :param spc_dct: species dictionary
+        :type spc_dct: dict[str: dict]
+        :param names: names of the species and transition states
+        :type names: tuple(str)
+        :param spc_model_dct_i: species model used to build the
+            partition functions
+        :type spc_model_dct_i: dict[str: dict]
+        :param save_prefix: root-path to the save-filesystem
+        :type save_prefix: str
+        :rtype: tuple(str)
+    """
+
+    levels = _model_levels(spc_model_dct_i)
+
+    paths = []
+    for name in names:
+        spc_dct_i = spc_dct.get(name)
+        if spc_dct_i is None:
+            continue
+        saddle = name.startswith('ts_')
+        if saddle:
+            spc_info = rinfo.ts_info(spc_dct_i['rxn_info'])
+        else:
+            spc_info = sinfo.from_dct(spc_dct_i)
+        _root = root_locs(spc_dct_i, saddle=saddle, name=name)
+        for level in levels:
+            levelp = tinfo.modify_orb_label(level, spc_info)
+            _, cnf_save_fs = build_fs(
+                None, save_prefix, 'CONFORMER',
+                thy_locs=levelp[1:], **_root)
+            path = cnf_save_fs[0].path()
+            if path not in paths:
+                paths.append(path)
+
+    return tuple(paths)
+
+
+def _model_levels(spc_model_dct_i):
+    """ Theory levels of a species model whose filesystems are read by
+        pf_filesys
+    """
+
+    levels = [spc_model_dct_i['vib']['geolvl'][1][1]]
+    if 'mod' in spc_model_dct_i.get('symm', {}):
+        levels.append(spc_model_dct_i['symm']['geolvl'][1][1])
+    if spc_model_dct_i.get('tors', {}).get('mod', 'rigid') != 'rigid':
+        levels.append(spc_model_dct_i['tors']['geolvl'][1][1])
+    if spc_model_dct_i['vib']['mod'] == 'vpt2':
+        levels.append(spc_model_dct_i['vib']['vpt2lvl'][1][1])
+
+    return tuple(dict.fromkeys(levels))
+
+
+def preload(paths, nthreads=8,
+            skip_names=PRELOAD_SKIP, max_size=PRELOAD_MAX_SIZE):
+    """ Walk the directory trees under a set of paths, listing every
+        directory and stat-ing and reading every file in them, with up to
+        nthreads directories processed at once
+
+        :param paths: roots of the directory trees to load
+        :type paths: tuple(str)
+        :param nthreads: number of threads loading directories
+        :type nthreads: int
+        :param skip_names: names of directories not to descend into
+        :type skip_names: tuple(str)
+        :param max_size: largest file (in bytes) that is read
+        :type max_size: int
+        :rtype: (int, int): number of files and bytes read
+    """
+
+    def _load_dir(path):
+        """ List a directory and read its files, returning the paths of
+            its sub-directories
+        """
+        sub_paths, nfiles, nbytes = [], 0, 0
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in skip_names:
+                            sub_paths.append(entry.path)
+                    elif entry.is_file():
+                        size = entry.stat().st_size
+                        if size <= max_size:
+                            with open(entry.path, 'rb') as load_file:
+                                nbytes += len(load_file.read())
+                            nfiles += 1
+        except OSError:
+            pass
+
+        return sub_paths, nfiles, nbytes
+
+    tot_files, tot_bytes = 0, 0
+    with ThreadPoolExecutor(max_workers=max(nthreads, 1)) as executor:
+        pending = {executor.submit(_load_dir, path)
+                   for path in paths if os.path.isdir(path)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                sub_paths, nfiles, nbytes = future.result()
+                tot_files += nfiles
+                tot_bytes += nbytes
+                pending.update(executor.submit(_load_dir, sub_path)
+                               for sub_path in sub_paths)
+
+    return tot_files, tot_bytes
@@ -0,0 +1,394 @@
+""" Columnar store of the Monte Carlo samples in the TAU layer of the
+    save filesystem
+
+    The energies, geometries, gradients and Hessians of the samples are
+    kept as NumPy arrays in a directory of the TAU trunk, alongside the
+    per-sample files. Each column is stored as a series of chunks, every
+    chunk holding an array of values and an array of the locators of the
+    samples they belong to. New samples are appended as new chunks so
+    the existing chunks are never rewritten, and the chunks are read
+    back memory-mapped so that all samples are loaded in one shot.
+
+    Every save path that writes the values of a sample also appends them
+    to the store, and values of later chunks replace those of earlier
+    ones, so a sample saved again at the same locators is refreshed.
+    Chunks whose samples have all been appended again are removed.
+
+    Samples missing from the store are read from the per-sample files
+    and appended, so the store fills itself in for samples saved before
+    it existed.
+
+    The data file of the samples read by MESS is written into each run
+    directory in chunks of samples straight from the arrays and, as long
+    as the samples it holds are the first of the requested ones, is only
+    appended to when more samples have been saved.
+"""
+
+import os
+import json
+import time
+import numpy
+
+
+STORE_NAME = 'tau_arrays'
+
+# Number of samples formatted at a time when writing a MESS data file
+DAT_CHUNK = 500
+
+# Number of chunks of a column above which the chunks read for a set of
+# samples are merged into a single chunk
+MAX_CHUNKS = 16
+
+# Columns of the store and the save filesystem files they are read from
+COL_DCT = {
+    'ene': 'energy',
+    'geo': 'geometry',
+    'grad': 'gradient',
+    'hess': 'hessian'
+}
+
+
+def sample_arrays(tau_save_fs, locs_lst, cols, db_style='jsondb',
+                  merge=True):
+    """ Obtain arrays of values for the requested samples, reading the
+        values from the per-sample files for samples not yet in the store
+
+        Energies are returned with shape (nsamp,), geometries (as xyz
+        coordinates) and gradients with shape (nsamp, natom, 3) and
+        Hessians with shape (nsamp, 3*natom, 3*natom). The atomic symbols
+        of the geometries are returned under 'symbs'.
+
+        :param tau_save_fs: TAU object with save filesys prefix
+        :type tau_save_fs: autofile.fs.tau obj
+        :param locs_lst: locators of the samples
+        :type locs_lst: tuple(tuple(str))
+        :param cols: columns of the store to read
+        :type cols: tuple(str)
+        :param db_style: style of the per-sample files
+        :type db_style: str
+        :param merge: merge the chunks read into one if there are many
+        :type merge: bool
+        :rtype: dict[str: numpy.ndarray]
+    """
+
+    keys = tuple(_locs_key(locs) for locs in locs_lst)
+    arr_dct = {'symbs': None}
+    for col in cols:
+        found, arr, nchunks = _read_column(tau_save_fs, col, keys)
+        if not found.all():
+            miss_idxs = numpy.flatnonzero(~found)
+            print(f'Reading {len(miss_idxs)}/{len(keys)} samples '
+                  f'missing from the {col} array store...')
+            miss_locs = [locs_lst[idx] for idx in miss_idxs]
+            vals = _read_files(tau_save_fs, col, miss_locs, db_style)
+            append(tau_save_fs, miss_locs, {col: vals})
+            if col == 'geo':
+                arr_dct['symbs'] = numpy.array(
+                    [symb for symb, _ in vals[0]])
+            vals = _to_array(col, vals)
+            if arr is None:
+                arr = numpy.empty((len(keys),) + vals.shape[1:])
+            arr[miss_idxs] = vals
+        elif merge and nchunks > MAX_CHUNKS:
+            # Merge the many chunks of samples appended one at a time
+            try:
+                _write_chunk(tau_save_fs, col, numpy.array(keys), arr)
+            except OSError:
+                print('Unable to merge tau sample arrays at '
+                      f'{_store_path(tau_save_fs)}')
+        if arr is None:
+            arr = numpy.empty((0,))
+        arr_dct[col] = arr
+
+    if 'geo' in cols and arr_dct['symbs'] is None:
+        arr_dct['symbs'] = _read_symbols(tau_save_fs)
+
+    return arr_dct
+
+
+def append(tau_save_fs, locs_lst, val_dct):
+    """ Append the values of samples to the store as new chunks of the
+        columns. Failures to write are not fatal since the store only
+        ever caches data in the filesystem.
+
+        :param tau_save_fs: TAU object with save filesys prefix
+        :type tau_save_fs: autofile.fs.tau obj
+        :param locs_lst: locators of the samples
+        :type locs_lst: tuple(tuple(str))
+        :param val_dct: values of the samples for each column, with
+            geometries given as automol geometries
+        :type val_dct: dict[str: tuple(obj)]
+    """
+
+    if not locs_lst:
+        return
+
+    store_path = _store_path(tau_save_fs)
+    keys = numpy.array([_locs_key(locs) for locs in locs_lst])
+    try:
+        os.makedirs(store_path, exist_ok=True)
+        for col, vals in val_dct.items():
+            if col == 'geo':
+                symb_path = os.path.join(store_path, 'symbs.npy')
+                if not os.path.exists(symb_path):
+                    _save(symb_path,
+                          numpy.array([symb for symb, _ in vals[0]]))
+            _write_chunk(tau_save_fs, col, keys, _to_array(col, vals))
+    except (OSError, TypeError, ValueError):
+        print(f'Unable to write tau sample arrays at {store_path}')
+
+
+def stored_locs(tau_save_fs, col):
+    """ Obtain the locators of the samples with values in the store
+
+        :param tau_save_fs: TAU object with save filesys prefix
+        :type tau_save_fs: autofile.fs.tau obj
+        :param col: column of the store
+        :type col: str
+        :rtype: set(tuple(str))
+    """
+
+    locs_set = set()
+    for _, locs_path in _chunks(tau_save_fs, col):
+        locs_set.update(tuple(key.split('/'))
+                        for key in numpy.load(locs_path).tolist())
+
+    return locs_set
+
+
+def write_data_file(dat_path, tau_save_fs, locs_lst, cols, ref_ene,
+                    fmt_fxn, db_style='jsondb', chunk=DAT_CHUNK):
+    """ Write the MESS data file for the requested samples, formatting
+        chunks of samples read from the store so the data of all samples
+        is never held in memory. A record of the samples in the file is
+        kept next to it, and only the samples that are not already at the
+        start of the file are written.
+
+        :param dat_path: path to the data file
+        :type dat_path: str
+        :param tau_save_fs: TAU object with save filesys prefix
+        :type tau_save_fs: autofile.fs.tau obj
+        :param locs_lst: locators of the samples, in order
+        :type locs_lst: tuple(tuple(str))
+        :param cols: columns of the store written to the file
+        :type cols: tuple(str)
+        :param ref_ene: energy the sample energies are relative to
+        :type ref_ene: float
+        :param fmt_fxn: function formatting the arrays of a chunk of
+            samples, and the number of samples before it, into a string
+        :type fmt_fxn: function
+        :param db_style: style of the per-sample files
+        :type db_style: str
+        :param chunk: number of samples formatted at once
+        :type chunk: int
+    """
+
+    rec_path = f'{dat_path}.json'
+    dat_rec = {'ref_ene': ref_ene, 'cols': list(cols),
+               'keys': [_locs_key(locs) for locs in locs_lst]}
+
+    # Set how much of the existing file can be kept, then drop the record
+    # so that an interrupted write is never mistaken for a complete one
+    nkeep, size = _kept_samples(dat_path, rec_path, dat_rec)
+    if os.path.exists(rec_path):
+        os.remove(rec_path)
+
+    print(f'Writing {len(locs_lst)-nkeep} samples to the data file '
+          f'{dat_path}, keeping {nkeep}...')
+    with open(dat_path, mode='ab' if nkeep else 'wb') as dat_file:
+        dat_file.truncate(size)
+        for start in range(nkeep, len(locs_lst), chunk):
+            arr_dct = sample_arrays(
+                tau_save_fs, locs_lst[start:start+chunk], cols,
+                db_style=db_style, merge=False)
+            arr_dct['ene'] = arr_dct['ene'] - ref_ene
+            dat_str = fmt_fxn(arr_dct, start)
+            if not dat_str.endswith('\n'):
+                dat_str += '\n'
+            dat_file.write(dat_str.encode())
+        dat_rec['size'] = dat_file.tell()
+
+    tmp_path = f'{rec_path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, mode='w', encoding='utf-8') as rec_file:
+            json.dump(dat_rec, rec_file)
+        os.replace(tmp_path, rec_path)
+    except OSError:
+        print(f'Unable to write tau data file record at {rec_path}')
+
+
+def geometries(symbs, xyzs):
+    """ Build automol geometries from the symbols and coordinates
+
+        :param symbs: atomic symbols
+        :type symbs: numpy.ndarray
+        :param xyzs: coordinates of each geometry
+        :type xyzs: numpy.ndarray
+        :rtype: tuple(automol geom data structure)
+    """
+    if symbs is None:
+        return ()
+    symbs = tuple(symbs.tolist())
+    return tuple(tuple(zip(symbs, map(tuple, xyz)))
+                 for xyz in numpy.asarray(xyzs).tolist())
+
+
+def _kept_samples(dat_path, rec_path, dat_rec):
+    """ Number of samples at the start of an existing data file that are
+        the first of the requested ones, and the size of the file they
+        take up
+    """
+
+    nkeep, size = 0, 0
+    if os.path.exists(dat_path) and os.path.exists(rec_path):
+        try:
+            with open(rec_path, mode='r', encoding='utf-8') as rec_file:
+                old_rec = json.load(rec_file)
+        except (OSError, ValueError):
+            old_rec = None
+        if (old_rec is not None and
+                old_rec['ref_ene'] == dat_rec['ref_ene'] and
+                old_rec['cols'] == dat_rec['cols'] and
+                old_rec['keys'] == dat_rec['keys'][:len(old_rec['keys'])] and
+                os.path.getsize(dat_path) >= old_rec['size']):
+            nkeep, size = len(old_rec['keys']), old_rec['size']
+
+    return nkeep, size
+
+
+def _read_column(tau_save_fs, col, keys):
+    """ Read the values of a column for the samples from the chunks of
+        the store. Values of later chunks replace those of earlier ones.
+    """
+
+    row_dct = {key: idx for idx, key in enumerate(keys)}
+    found = numpy.zeros(len(keys), dtype=bool)
+    arr = None
+    nchunks = 0
+    for val_path, locs_path in _chunks(tau_save_fs, col):
+        try:
+            chunk_keys = numpy.load(locs_path).tolist()
+            chunk_vals = numpy.load(val_path, mmap_mode='r')
+        except (OSError, ValueError):
+            print(f'Skipping unreadable tau sample arrays at {val_path}')
+            continue
+        rows, chunk_rows = [], []
+        for chunk_row, key in enumerate(chunk_keys):
+            row = row_dct.get(key)
+            if row is not None:
+                rows.append(row)
+                chunk_rows.append(chunk_row)
+        if rows:
+            if arr is None:
+                arr = numpy.empty((len(keys),) + chunk_vals.shape[1:])
+            arr[rows] = chunk_vals[chunk_rows]
+            found[rows] = True
+            nchunks += 1
+
+    return found, arr, nchunks
+
+
+def _read_files(tau_save_fs, col, locs_lst, db_style):
+    """ Read the values of a column for the samples from the per-sample
+        files of the save filesystem
+    """
+
+    if db_style == 'jsondb':
+        vals = getattr(tau_save_fs[-1].json, COL_DCT[col]).read_all(locs_lst)
+    else:
+        fs_file = getattr(tau_save_fs[-1].file, COL_DCT[col])
+        vals = [fs_file.read(locs) for locs in locs_lst]
+
+    return vals
+
+
+def _read_symbols(tau_save_fs):
+    """ Read the atomic symbols of the sample geometries, if any were stored
+    """
+    symb_path = os.path.join(_store_path(tau_save_fs), 'symbs.npy')
+    return numpy.load(symb_path) if os.path.exists(symb_path) else None
+
+
+def _to_array(col, vals):
+    """ Convert the values read for a column into an array
+    """
+    if col == 'geo':
+        vals = [[xyz for _, xyz in geo] for geo in vals]
+    return numpy.array(vals, dtype=float)
+
+
+def _chunks(tau_save_fs, col):
+    """ Paths of the (values, locators) files of all complete chunks of a
+        column, in the order they were written
+    """
+
+    store_path = _store_path(tau_save_fs)
+    chunks = []
+    if os.path.isdir(store_path):
+        for name in sorted(os.listdir(store_path)):
+            if name.startswith(f'{col}.') and name.endswith('.locs.npy'):
+                val_name = name.replace('.locs.npy', '.npy')
+                if os.path.exists(os.path.join(store_path, val_name)):
+                    chunks.append((os.path.join(store_path, val_name),
+                                   os.path.join(store_path, name)))
+
+    return chunks
+
+
+def _write_chunk(tau_save_fs, col, keys, arr):
+    """ Write the values of samples as a new chunk of a column, then remove
+        the earlier chunks it replaces
+    """
+
+    store_path = _store_path(tau_save_fs)
+    os.makedirs(store_path, exist_ok=True)
+    # Write the locators last: chunks are only read once they exist
+    chunk = f'{col}.{_chunk_id()}'
+    _save(os.path.join(store_path, f'{chunk}.npy'), arr)
+    _save(os.path.join(store_path, f'{chunk}.locs.npy'), keys)
+    _prune(tau_save_fs, col, chunk, set(keys.tolist()))
+
+
+def _prune(tau_save_fs, col, new_chunk, new_keys):
+    """ Remove the chunks of a column written before a new chunk whose
+        samples are all replaced by those of the new chunk
+    """
+
+    for val_path, locs_path in _chunks(tau_save_fs, col):
+        if os.path.basename(val_path) >= f'{new_chunk}.npy':
+            continue
+        try:
+            if set(numpy.load(locs_path).tolist()) <= new_keys:
+                # Remove the locators first so the chunk is never read
+                os.remove(locs_path)
+                os.remove(val_path)
+        except (OSError, ValueError):
+            pass
+
+
+def _chunk_id():
+    """ Name for a new chunk that sorts after all existing chunks and is
+        unique across processes
+    """
+    return f'{time.time_ns():020d}-{os.getpid()}'
+
+
+def _save(path, arr):
+    """ Write an array to a file through a temporary file
+    """
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as arr_file:
+        numpy.save(arr_file, arr)
+    os.replace(tmp_path, path)
+
+
+def _locs_key(locs):
+    """ Set the string used to key the values of a sample
+    """
+    return '/'.join(locs)
+
+
+def _store_path(tau_save_fs):
+    """ Path to the directory of the store in the TAU trunk
+    """
+    return os.path.join(tau_save_fs[0].path(), STORE_NAME)
@@ -16,6 +16,9 @@ from automol.geom import hydrogen_bonded_structure
 from autorun import execute_function_in_parallel
 from mechanalyzer.inf import thy as tinfo
 from mechlib.amech_io import printer as ioprinter
+from mechlib.filesys import _cnfidx
+from mechlib.filesys import _cnffp
+from mechlib.filesys import _parsed
 
 
 def min_energy_conformer_locators(
@@ -69,6 +72,9 @@ def conformer_locators(
         :type cnf_range: str
         :param sort_info_lst: level info to include sp or zpe in sorting
         :type sort_info_lst: list of tuples or Nones
+        :param nprocs: number of processes used to evaluate the sort
+            energies of the conformers
+        :type nprocs: int
         :rtype: (tuple(str, str), str)
     """
 
@@ -82,6 +88,7 @@ def conformer_locators(
         fin_locs_lst, fin_paths_lst = (), ()
 
         cnf_locs_lst = cnf_save_fs[-1].existing()
+        _cnfidx.prune(_cnfidx.read(cnf_save_fs), cnf_locs_lst)
         if cnf_locs_lst:
             cnf_locs_lst, cnf_enes_lst = _sorted_cnf_lsts(
                 cnf_locs_lst, cnf_save_fs, mod_thy_info,
@@ -182,6 +189,9 @@ def conformer_locators(
         union_locs_lst += tmp_locs_lst
         union_paths_lst += tmp_paths_lst
 
+    # Keep the values read from the filesystem for the next search
+    _cnfidx.write(cnf_save_fs, _cnfidx.read(cnf_save_fs))
+
     return tuple(union_locs_lst), tuple(union_paths_lst)
 
 
@@ -199,23 +209,20 @@ def _sorted_cnf_lsts(
         :type cnf_save_fs: autofile.fs.conformer obj
         :param mod_thy_info: ???
         :type mod_thy_info: ???
+        :param nprocs: number of processes to evaluate sort energies over
+        :type nprocs: int
         :rtype (tuple(tuple(tuple(str),tuple(str))), tuple(float))
     """
 
     def _parallel_get_sort_energy_parameters(
-            cnf_save_fs, mod_thy_info, freq_info,
-            sp_info, sort_prop_dct, cnf_locs_lst,
+            sort_prop_dct, rrho_dct, first_enes, cnf_locs_lst,
             output_queue=None):
         locs_enes_dct = {}
-        first_enes = None
         for locs in cnf_locs_lst:
-            sort_ene, first_enes = _sort_energy_parameter(
-                locs, cnf_save_fs, mod_thy_info, freq_info,
-                sp_info, sort_prop_dct, first_enes=first_enes)
-            if first_enes is not None:
-                locs_enes_dct[tuple(locs)] = (sort_ene, sum(first_enes))
-            else:
-                locs_enes_dct[tuple(locs)] = (sort_ene, first_enes)
+            sort_ene, _ = _sort_energy_parameter(
+                locs, rrho_dct[tuple(locs)], sort_prop_dct,
+                first_enes=first_enes)
+            locs_enes_dct[tuple(locs)] = sort_ene
         output_queue.put((locs_enes_dct,))
 
     fnd_cnf_enes_lst = []
@@ -224,31 +231,39 @@ def _sorted_cnf_lsts(
         fnd_cnf_enes_lst = [10]
         fnd_cnf_locs_lst = cnf_locs_lst
     else:
-        args = (
-                cnf_save_fs, mod_thy_info, freq_info,
-                sp_info, sort_prop_dct
-                )
+        # Read the filesystem data (or pull it from the index) up front
+        # so the workers only evaluate the sort energies
+        cnf_idx = _cnfidx.read(cnf_save_fs)
+        rrho_dct = {}
+        for locs in cnf_locs_lst:
+            rrho_dct[tuple(locs)] = _indexed_rrho_params(
+                cnf_idx, cnf_save_fs, locs, sp_info, freq_info, mod_thy_info)
+
+        # Set the reference energies once so every worker evaluates
+        # the sort energies relative to the same conformer
+        first_enes = _reference_energies(
+            cnf_locs_lst, rrho_dct, sort_prop_dct)
+
+        # Only the RRHO-based sorts are expensive enough to farm out
+        if not sort_prop_dct or not any(
+                prop in sort_prop_dct for prop in ('entropy', 'gibbs')):
+            nprocs = 1
+        nprocs = max(min(nprocs, len(cnf_locs_lst)), 1)
+
+        args = (sort_prop_dct, rrho_dct, first_enes)
         locs_enes_dct_lst = execute_function_in_parallel(
             _parallel_get_sort_energy_parameters, cnf_locs_lst,
-            args, nprocs=1)
-        first_ene = None
-        for locs_enes_dct in locs_enes_dct_lst:
-            for locs in locs_enes_dct:
-                _, locs_first_ene = locs_enes_dct[locs]
-                if locs_first_ene is not None:
-                    first_ene = locs_first_ene
-                break
+            args, nprocs=nprocs)
+        locs_enes_dct = {}
+        for _locs_enes_dct in locs_enes_dct_lst:
+            locs_enes_dct.update(_locs_enes_dct)
 
+        # Collect the energies in the filesystem order of the conformers
         for locs in cnf_locs_lst:
-            for locs_enes_dct in locs_enes_dct_lst:
-                if tuple(locs) in locs_enes_dct:
-                    sort_ene, tmp_first_ene = locs_enes_dct[tuple(locs)]
-                    if sort_ene is not None:
-                        if first_ene is not None:
-                            sort_ene = sort_ene + (
-                                (tmp_first_ene - first_ene) / phycon.EH2KCAL)
-                        fnd_cnf_enes_lst.append(sort_ene)
-                        fnd_cnf_locs_lst.append(locs)
+            sort_ene = locs_enes_dct.get(tuple(locs))
+            if sort_ene is not None:
+                fnd_cnf_enes_lst.append(sort_ene)
+                fnd_cnf_locs_lst.append(locs)
             # commenting out from merge conflict
             # elif cnf_save_fs[-1].file.geometry_info.exists(locs):
             #     ioprinter.info_message(
@@ -284,6 +299,27 @@ def _sorted_cnf_lsts(
     return cnf_locs_lst, cnf_enes_lst
 
 
+def _reference_energies(cnf_locs_lst, rrho_dct, sort_prop_dct):
+    """ Obtain the (sp, zpe) energies [kcal/mol] of the first conformer
+        with the data needed for sorting, which all of the Gibbs energies
+        are evaluated relative to
+    """
+
+    first_enes = None
+    if sort_prop_dct is not None and 'gibbs' in sort_prop_dct:
+        for locs in cnf_locs_lst:
+            geo, freqs, sp_ene = rrho_dct[tuple(locs)]
+            sort_prop = _check_prop_requirements(
+                sort_prop_dct, geo, freqs, sp_ene, locs)
+            if sort_prop == 'gibbs':
+                zpe = 0.5 * sum(freqs) * phycon.WAVEN2EH
+                first_enes = (
+                    sp_ene * phycon.EH2KCAL, zpe * phycon.EH2KCAL)
+                break
+
+    return first_enes
+
+
 def _wait_for_energy_to_be_saved(cnf_save_fs, locs, sp_fs, sp_info):
     """ in case a geo was just written and its about to write and ene
     """
@@ -499,24 +535,11 @@ def _remove_hbonded_structures(
     """
     fin_locs_lst = ()
     fin_enes_lst = ()
+    cnf_idx = _cnfidx.read(cnf_save_fs)
     for locs, enes in zip(cnf_locs_lst, cnf_enes_lst):
-        if cnf_save_fs[-1].file.geometry.exists(locs):
-            geo = cnf_save_fs[-1].file.geometry.read(locs)
-
-            # Try and get a reaction object for transition state
-            zma_fs = autofile.fs.zmatrix(cnf_save_fs[-1].path(locs))
-            if zma_fs[-1].file.reaction.exists((0,)):
-                zrxn = zma_fs[-1].file.reaction.read((0,))
-                grxn = relabel_for_geometry(zrxn)
-            else:
-                grxn = None
-
-            if hbond_cutoffs is not None:
-                hydrogen_bonded_structure_ = hydrogen_bonded_structure(
-                    geo, *hbond_cutoffs, grxn=grxn)
-            else:
-                hydrogen_bonded_structure_ = hydrogen_bonded_structure(
-                    geo, grxn=grxn)
+        hydrogen_bonded_structure_ = _indexed_hbond_flag(
+            cnf_idx, cnf_save_fs, locs, hbond_cutoffs=hbond_cutoffs)
+        if hydrogen_bonded_structure_ is not None:
             if not hydrogen_bonded_structure_:
                 fin_locs_lst += (locs,)
                 fin_enes_lst += (enes,)
@@ -532,12 +555,42 @@ def _remove_nonhbonded_structures(
     """
     fin_locs_lst = ()
     fin_enes_lst = ()
+    cnf_idx = _cnfidx.read(cnf_save_fs)
     for locs, enes in zip(cnf_locs_lst, cnf_enes_lst):
+        hydrogen_bonded_structure_ = _indexed_hbond_flag(
+            cnf_idx, cnf_save_fs, locs, hbond_cutoffs=hbond_cutoffs)
+        if hydrogen_bonded_structure_ is not None:
+            if hydrogen_bonded_structure_:
+                fin_locs_lst += (locs,)
+                fin_enes_lst += (enes,)
+            else:
+                print(
+                    'Removing ', locs, ' from list because its not hbonded.',
+                    'Cutoffs are', hbond_cutoffs)
+    return fin_locs_lst, fin_enes_lst
+
+
+def _indexed_hbond_flag(cnf_idx, cnf_save_fs, locs, hbond_cutoffs=None):
+    """ Assess if a conformer has hydrogen bonds, using the flag stored
+        in the conformer index if the geometry has not changed.
+        Returns None if no geometry is saved for the conformer.
+    """
+
+    zma_fs = autofile.fs.zmatrix(cnf_save_fs[-1].path(locs))
+    paths = (cnf_save_fs[-1].file.geometry.path(locs),
+             zma_fs[-1].file.reaction.path((0,)))
+    if hbond_cutoffs is not None:
+        key = 'hbond_' + _cnfidx.thy_key(hbond_cutoffs)
+    else:
+        key = 'hbond'
+
+    found, hbnd = _cnfidx.lookup(cnf_idx, locs, key, paths)
+    if not found:
+        hbnd = None
         if cnf_save_fs[-1].file.geometry.exists(locs):
             geo = cnf_save_fs[-1].file.geometry.read(locs)
 
             # Try and get a reaction object for transition state
-            zma_fs = autofile.fs.zmatrix(cnf_save_fs[-1].path(locs))
             if zma_fs[-1].file.reaction.exists((0,)):
                 zrxn = zma_fs[-1].file.reaction.read((0,))
                 grxn = relabel_for_geometry(zrxn)
@@ -545,19 +598,15 @@ def _remove_nonhbonded_structures(
                 grxn = None
 
             if hbond_cutoffs is not None:
-                hydrogen_bonded_structure_ = hydrogen_bonded_structure(
+                hbnd = hydrogen_bonded_structure(
                     geo, *hbond_cutoffs, grxn=grxn)
             else:
-                hydrogen_bonded_structure_ = hydrogen_bonded_structure(
+                hbnd = hydrogen_bonded_structure(
                     geo, grxn=grxn)
-            if hydrogen_bonded_structure_:
-                fin_locs_lst += (locs,)
-                fin_enes_lst += (enes,)
-            else:
-                print(
-                    'Removing ', locs, ' from list because its not hbonded.',
-                    'Cutoffs are', hbond_cutoffs)
-    return fin_locs_lst, fin_enes_lst
+            hbnd = bool(hbnd)
+            _cnfidx.store(cnf_idx, locs, key, paths, hbnd)
+
+    return hbnd
 
 
 def _process_cnf_range(cnf_range):
@@ -674,8 +723,9 @@ def this_conformer_was_run_in_run(zma, cnf_fs):
                     method = inf_obj.method
                     prog = inf_obj.prog
                     out_str = run_fs[-1].file.output.read([job])
-                    idx_ene = elstruct.reader.energy(prog, method, out_str)
-                    idx_geo = elstruct.reader.opt_geometry(prog, out_str)
+                    _parsed.read(run_fs, job, out_str)
+                    idx_ene = _parsed.energy(prog, method, out_str)
+                    idx_geo = _parsed.opt_geometry(prog, out_str)
                     if idx == locs_idx:
                         # out_enes.append(10000)
                         # out_geos.append(None)
@@ -702,12 +752,9 @@ def _sym_unique(geo, ene, saved_geos, saved_enes, ethresh=1.0e-5):
     """
 
     sym_idx = None
-    new_saved_geos = []
-    idx_dct = {}
-    for i, (sene, sgeo) in enumerate(zip(saved_enes, saved_geos)):
-        if abs(ene - sene) < ethresh:
-            idx_dct[len(new_saved_geos)] = i
-            new_saved_geos.append(sgeo)
+    idx_dct = dict(enumerate(
+        _cnffp.energy_candidates(ene, saved_enes, ethresh)))
+    new_saved_geos = [saved_geos[idx] for idx in idx_dct.values()]
     if new_saved_geos:
         _, sym_idx = automol.geom.is_unique(
             geo, new_saved_geos, check_dct={'coulomb': 1e-2})
@@ -756,6 +803,44 @@ def collect_rrho_params(
     return geo, freqs, ene
 
 
+def _indexed_rrho_params(
+        cnf_idx, cnf_save_fs, locs, sp_info, freq_info, mod_thy_info):
+    """ get geo, freqs, and elec. ene from the conformer index if the
+        files they were read from have not changed, otherwise read them
+        from the filesystem and update the index
+
+        Frequencies at a different level than the conformer are matched
+        across filesystems, so those are always read from the filesystem.
+    """
+
+    if freq_info is None or freq_info == mod_thy_info:
+        if sp_info is not None:
+            sp_thy_info = sp_info[1:4]
+        else:
+            sp_thy_info = mod_thy_info[1:4]
+        sp_fs = autofile.fs.single_point(cnf_save_fs[-1].path(locs))
+        paths = (cnf_save_fs[-1].file.geometry.path(locs),
+                 cnf_save_fs[-1].file.harmonic_frequencies.path(locs),
+                 sp_fs[-1].file.energy.path(sp_thy_info))
+        key = 'rrho_' + _cnfidx.thy_key(sp_thy_info)
+
+        found, rrho_params = _cnfidx.lookup(cnf_idx, locs, key, paths)
+        if found:
+            geo, freqs, ene = rrho_params
+            geo = tuple((sym, tuple(xyz)) for sym, xyz in geo)
+        else:
+            geo, freqs, ene = collect_rrho_params(
+                cnf_save_fs, locs, sp_info, freq_info, mod_thy_info)
+            if geo is not None and ene is not None:
+                _cnfidx.store(
+                    cnf_idx, locs, key, paths, [geo, freqs, ene])
+    else:
+        geo, freqs, ene = collect_rrho_params(
+            cnf_save_fs, locs, sp_info, freq_info, mod_thy_info)
+
+    return geo, freqs, ene
+
+
 def get_freq_location(cnf_fs, geo, freq_thy_locs, cnf_locs):
     """ find the frequencies for a conformer at a different level of theory
     """
@@ -826,14 +911,13 @@ def _check_prop_requirements(sort_prop_dct, geo, freqs, sp_ene, locs):
 
 
 def _sort_energy_parameter(
-            locs, cnf_save_fs, mod_thy_info, freq_info,
-            sp_info, sort_prop_dct, first_enes=None):
+            locs, rrho_params, sort_prop_dct, first_enes=None):
     """ find the correct energy (gibbs, entropy, enthalpy)
-        at the zpe and sp or inp lvls of theory
+        at the zpe and sp or inp lvls of theory from the
+        geo, freqs, and elec. ene of the conformer
     """
     sort_ene = None
-    geo, freqs, sp_ene = collect_rrho_params(
-        cnf_save_fs, locs, sp_info, freq_info, mod_thy_info)
+    geo, freqs, sp_ene = rrho_params
     sort_prop = _check_prop_requirements(
         sort_prop_dct, geo, freqs, sp_ene, locs)
     if sort_prop in ['electronic', 'ground']:
@@ -1,6 +1,9 @@
 """ drivers for coordinate scans
 """
 
+import os
+import re
+import json
 import numpy
 from scipy.interpolate import CubicSpline
 from scipy.interpolate import Akima1DInterpolator
@@ -12,6 +15,8 @@ from mechanalyzer.inf import spc as sinfo
 from mechanalyzer.inf import thy as tinfo
 from mechanalyzer.inf import rxn as rinfo
 from mechlib.filesys._build import build_fs
+from mechlib.filesys._cnfidx import file_stamps
+from mechlib.filesys.save import ADAPTIVE_GRID_NAME
 from mechlib.filesys.mincnf import min_energy_conformer_locators
 
 
@@ -21,28 +26,30 @@ def potential(names, grid_vals, cnf_save_path,
               read_geom=False, read_grad=False,
               read_hess=False, read_zma=False,
               read_energy_backstep=True,
-              remove_bad_points=True):
+              remove_bad_points=True,
+              fill_interpolated=False):
     """ Get the potential for a hindered rotor
+
+        With fill_interpolated, the energies at points that an adaptive
+        scan judged could be interpolated, and so were not run, are set
+        from a periodic spline through the other points (1-D scans only).
     """
 
     print('potential test:')
     print('names', names)
     print('grids', grid_vals)
 
-    # Build initial lists for storing potential energies and Hessians
-    # grid_points = automol.pot.points(grid_vals)
+    # Read the energies of all points (and back steps) in one pass
+    scn_arrs = scan_arrays(
+        names, grid_vals, cnf_save_path,
+        mod_tors_ene_info, constraint_dct,
+        read_energy_backstep=read_energy_backstep)
     grid_coords = automol.pot.coords(grid_vals)
-    back_coords = tuple(tuple(val + 4*numpy.pi for val in grid)
-                        for grid in grid_coords)
     pot, geoms, grads, hessians, zmas, paths = {}, {}, {}, {}, {}, {}
 
     # Set up filesystem information
-    zma_fs = autofile.fs.zmatrix(cnf_save_path)
-    zma_path = zma_fs[-1].path([0])
-    if constraint_dct is None:
-        scn_fs = autofile.fs.scan(zma_path)
-    else:
-        scn_fs = autofile.fs.cscan(zma_path)
+    scn_fs = _scan_fs(cnf_save_path, constraint_dct)
+
     # Read the filesystem
     for idx, vals in enumerate(grid_coords):
 
@@ -51,38 +58,23 @@ def potential(names, grid_vals, cnf_save_path,
 
         # Get locs for reading filesysten
         locs = [names, vals]
-        back_locs = [names, back_coords[idx]]
         if constraint_dct is not None:
             locs = [constraint_dct] + locs
-            back_locs = [constraint_dct] + back_locs
-        # print('path', scn_fs[-1].path(locs))
-
-        # Read values of interest
-        ene = energy(scn_fs, locs, mod_tors_ene_info)
-        if read_energy_backstep:
-            back_ene = energy(scn_fs, back_locs, mod_tors_ene_info)
-            step_ene = None
-            if ene is not None:
-                if back_ene is not None:
-                    step_ene = min(ene, back_ene)
-                else:
-                    step_ene = ene
-            elif back_ene is not None:
-                step_ene = back_ene
-
-            if step_ene is not None:
-                enediff = (step_ene - ref_ene) * phycon.EH2KCAL
-                if idx == 0:
-                    if enediff > 0.05:
-                        print('Warning the first potential value does not',
-                              f'match the reference energy {enediff:.2f}')
-                    ref_ene = step_ene
-                    enediff = 0
-                pot[vals_conv] = enediff
-            else:
-                pot[vals_conv] = None
+
+        # Set the energy relative to the reference
+        step_ene = scn_arrs['enes'][idx]
+        step_ene = None if numpy.isnan(step_ene) else float(step_ene)
+        if step_ene is not None:
+            enediff = (step_ene - ref_ene) * phycon.EH2KCAL
+            if read_energy_backstep and idx == 0:
+                if enediff > 0.05:
+                    print('Warning the first potential value does not',
+                          f'match the reference energy {enediff:.2f}')
+                ref_ene = step_ene
+                enediff = 0
+            pot[vals_conv] = enediff
         else:
-            pot[vals_conv] = (ene - ref_ene) * phycon.EH2KCAL
+            pot[vals_conv] = None
 
         if read_geom:
             if scn_fs[-1].file.geometry.exists(locs):
@@ -108,7 +100,14 @@ def potential(names, grid_vals, cnf_save_path,
             else:
                 zmas[vals_conv] = None
 
-        paths[vals] = scn_fs[-1].path(locs)
+        paths[vals] = scn_arrs['paths'][idx]
+
+    # Fill in the points an adaptive scan left to be interpolated
+    if fill_interpolated and len(names) == 1:
+        coord_locs = names if constraint_dct is None else constraint_dct
+        interp_vals = interpolated_scan_points(scn_fs, coord_locs)
+        if interp_vals:
+            pot = _fill_interpolated_points(pot, grid_coords, interp_vals)
 
     # If potential has any terms that are not None, ID and remove bad points
     if remove_bad_points and len(names) == 1:
@@ -124,6 +123,167 @@ def potential(names, grid_vals, cnf_save_path,
     return pot, geoms, grads, hessians, zmas, paths
 
 
+def scan_arrays(names, grid_vals, cnf_save_path,
+                mod_tors_ene_info, constraint_dct,
+                read_geom=False, read_energy_backstep=True,
+                cache=True):
+    """ Read the energies, and optionally the geometries, at every point
+        of a one- or multi-dimensional scan into arrays.
+
+        If read_energy_backstep is set, the energy at each point is the
+        lower of the energies saved at the point and at its back step
+        (the point shifted by 4pi). Missing values are NaN.
+
+        With cache set, the arrays are also written to a consolidated file
+        in the directory of the scan branch along with stamps of the files
+        they were read from, and are read back from that file as long as
+        none of those files have changed.
+
+        :param names: names of the scan coordinates
+        :type names: tuple(str)
+        :param grid_vals: grid values for each scan coordinate
+        :type grid_vals: tuple(tuple(float))
+        :param cnf_save_path: path to the conformer the scan is run from
+        :type cnf_save_path: str
+        :param mod_tors_ene_info: theory info for the scan energies
+        :type mod_tors_ene_info: tuple(str)
+        :param constraint_dct: values of constrained coordinates
+        :type constraint_dct: dict[str: float]
+        :rtype: dict[str: numpy.ndarray/tuple]: 'coords' (npts x ncoords),
+            'enes' (npts), 'paths' (npts) and, if read_geom, 'symbs' and
+            'xyzs' (npts x natoms x 3)
+    """
+
+    grid_coords = automol.pot.coords(grid_vals)
+    scn_fs = _scan_fs(cnf_save_path, constraint_dct)
+
+    # Set the locs and paths for all of the points and back steps
+    steps = ((0.0, 4*numpy.pi) if read_energy_backstep else (0.0,))
+    locs_lst, ene_paths = [], []
+    for vals in grid_coords:
+        for step in steps:
+            locs = [names, tuple(val + step for val in vals)]
+            if constraint_dct is not None:
+                locs = [constraint_dct] + locs
+            locs_lst.append(locs)
+            sp_fs = autofile.fs.single_point(scn_fs[-1].path(locs))
+            ene_paths.append(
+                sp_fs[-1].file.energy.path(mod_tors_ene_info[1:4]))
+    geo_paths = [scn_fs[-1].file.geometry.path(locs)
+                 for locs in locs_lst[::len(steps)]]
+    paths = tuple(scn_fs[-1].path(locs) for locs in locs_lst[::len(steps)])
+
+    coords = numpy.array(grid_coords, dtype=float)
+    stamps = _stamp_array(ene_paths + (geo_paths if read_geom else []))
+    thy_str = re.sub(
+        r'[^\w.+-]', '-', '_'.join(str(inf) for inf in mod_tors_ene_info[1:4]))
+    cache_path = os.path.join(
+        os.path.dirname(paths[0]),
+        f'scan_{thy_str}'
+        f'{"_back" if read_energy_backstep else ""}'
+        f'{"_geo" if read_geom else ""}.npz')
+    scn_arrs = _read_scan_cache(cache_path, coords, stamps) if cache else None
+
+    if scn_arrs is None:
+        scn_arrs = {'coords': coords}
+
+        # Read the energies, taking the lowest of each point and back step
+        enes = numpy.full(len(ene_paths), numpy.nan)
+        for idx, locs in enumerate(locs_lst):
+            if stamps[idx][0] >= 0:
+                ene = energy(scn_fs, locs, mod_tors_ene_info)
+                if ene is not None:
+                    enes[idx] = ene
+        enes = enes.reshape(len(grid_coords), len(steps))
+        scn_arrs['enes'] = numpy.array([
+            numpy.nan if numpy.all(numpy.isnan(step_enes))
+            else numpy.nanmin(step_enes) for step_enes in enes])
+
+        # Read the geometries, stacking their coordinates
+        if read_geom:
+            symbs, xyzs = None, []
+            for locs in locs_lst[::len(steps)]:
+                if scn_fs[-1].file.geometry.exists(locs):
+                    geo = scn_fs[-1].file.geometry.read(locs)
+                    symbs = automol.geom.symbols(geo)
+                    xyzs.append(automol.geom.coordinates(geo))
+                else:
+                    xyzs.append(None)
+            natms = len(symbs) if symbs is not None else 0
+            scn_arrs['symbs'] = numpy.array(symbs or (), dtype=str)
+            scn_arrs['xyzs'] = numpy.array([
+                numpy.full((natms, 3), numpy.nan) if xyz is None else xyz
+                for xyz in xyzs], dtype=float).reshape(-1, natms, 3)
+
+        if cache:
+            _write_scan_cache(cache_path, scn_arrs, stamps)
+
+    scn_arrs['paths'] = paths
+    if read_geom:
+        scn_arrs['symbs'] = tuple(str(symb) for symb in scn_arrs['symbs'])
+
+    return scn_arrs
+
+
+def _scan_fs(cnf_save_path, constraint_dct):
+    """ Build the scan filesystem for the zmatrix of a conformer
+    """
+
+    zma_fs = autofile.fs.zmatrix(cnf_save_path)
+    zma_path = zma_fs[-1].path([0])
+    if constraint_dct is None:
+        scn_fs = autofile.fs.scan(zma_path)
+    else:
+        scn_fs = autofile.fs.cscan(zma_path)
+
+    return scn_fs
+
+
+def _stamp_array(paths):
+    """ Build an (npaths x 2) array of the stamps of a set of files,
+        with -1 for files that do not exist
+    """
+    return numpy.array(
+        [stamp if stamp is not None else [-1, -1]
+         for stamp in file_stamps(paths)], dtype=numpy.int64).reshape(-1, 2)
+
+
+def _read_scan_cache(cache_path, coords, stamps):
+    """ Read the arrays of a consolidated scan file, if it exists and was
+        written for the same grid and the same files
+    """
+
+    scn_arrs = None
+    if os.path.exists(cache_path):
+        try:
+            with numpy.load(cache_path) as cache_file:
+                if (cache_file['coords'].shape == coords.shape and
+                        numpy.allclose(cache_file['coords'], coords) and
+                        numpy.array_equal(cache_file['stamps'], stamps)):
+                    scn_arrs = {key: cache_file[key]
+                                for key in cache_file.files
+                                if key != 'stamps'}
+        except (OSError, ValueError, KeyError):
+            scn_arrs = None
+
+    return scn_arrs
+
+
+def _write_scan_cache(cache_path, scn_arrs, stamps):
+    """ Write the arrays of a scan to its consolidated file. Failures to
+        write are not fatal since the file only caches the filesystem.
+    """
+
+    if os.path.isdir(os.path.dirname(cache_path)):
+        tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+        try:
+            with open(tmp_path, 'wb') as cache_file:
+                numpy.savez(cache_file, stamps=stamps, **scn_arrs)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            print(f'Unable to write consolidated scan file at {cache_path}')
+
+
 def identify_bad_point(pot, thresh=0.05):
     """ Identifies a single bad point in a torsional potential based on a
         comparison of Akima and cubic spline fits
@@ -179,6 +339,113 @@ def identify_bad_point(pot, thresh=0.05):
     return bad_angle
 
 
+def periodic_splines(angles, enes, period, new_angles):
+    """ Evaluate periodic cubic and Akima splines through the energies of
+        a 1-D potential at new angles. The difference between the two
+        measures how well the points determine the potential in between.
+
+        :param angles: angles of the known points
+        :type angles: numpy.ndarray
+        :param enes: energies of the known points
+        :type enes: numpy.ndarray
+        :param period: period of the potential, in units of the angles
+        :type period: float
+        :param new_angles: angles to evaluate the splines at
+        :type new_angles: numpy.ndarray
+        :rtype: (numpy.ndarray, numpy.ndarray)
+    """
+
+    # Sort the points over one period starting from the first angle
+    start = angles[0]
+    shifted = numpy.mod(numpy.asarray(angles) - start, period)
+    sort_idxs = numpy.argsort(shifted)
+    shifted, enes = shifted[sort_idxs], numpy.asarray(enes)[sort_idxs]
+    new_shifted = numpy.mod(numpy.asarray(new_angles) - start, period)
+
+    # Close the period for the cubic spline and pad it for the Akima one
+    cub_spline = CubicSpline(
+        numpy.append(shifted, period), numpy.append(enes, enes[0]),
+        bc_type='periodic')
+    akima_spline = Akima1DInterpolator(
+        numpy.concatenate((shifted[-2:] - period, shifted,
+                           shifted[:2] + period)),
+        numpy.concatenate((enes[-2:], enes, enes[:2])))
+
+    return cub_spline(new_shifted), akima_spline(new_shifted)
+
+
+def grid_period(angles):
+    """ Obtain the period of the potential along a 1-D rotor grid, which
+        spans one period of the rotor symmetry in even steps without
+        repeating its start
+
+        :param angles: angles of the grid, in radians
+        :type angles: numpy.ndarray
+        :rtype: float
+    """
+
+    angles = numpy.asarray(angles)
+    step = angles[1] - angles[0]
+    period = len(angles) * step
+    assert numpy.allclose(numpy.diff(angles), step), (
+        f'Rotor grid {angles} is not evenly spaced')
+    nperiod = 2.0 * numpy.pi / period
+    assert numpy.isclose(nperiod, round(nperiod)), (
+        f'Rotor grid {angles} does not span one period of the rotor')
+
+    return period
+
+
+def interpolated_scan_points(scn_fs, coord_locs):
+    """ Read the grid values of the points of a 1-D scan that an adaptive
+        scan left to be interpolated, if it was run adaptively
+
+        :param scn_fs: SCAN/CSCAN object with save filesys prefix
+        :type scn_fs: autofile.fs.scan or autofile.fs.cscan object
+        :param coord_locs: locators of the scan branch
+        :type coord_locs: tuple(str) or dict[str: float]
+        :rtype: tuple(float) or None
+    """
+
+    interp_vals = None
+    if scn_fs[1].exists([coord_locs]):
+        interp_path = os.path.join(
+            scn_fs[1].path([coord_locs]), ADAPTIVE_GRID_NAME)
+        if os.path.exists(interp_path):
+            try:
+                with open(interp_path, 'r', encoding='utf-8') as interp_file:
+                    interp_vals = tuple(json.load(interp_file)['interpolated'])
+            except (OSError, ValueError, KeyError):
+                interp_vals = None
+
+    return interp_vals
+
+
+def _fill_interpolated_points(pot, grid_coords, interp_vals):
+    """ Set the missing energies of a 1-D potential at the interpolated
+        points from a periodic spline through the other points
+    """
+
+    angles = numpy.array([vals[0] for vals in grid_coords])
+    pot_keys = tuple(pot.keys())
+    enes = numpy.array(
+        [numpy.nan if pot[key] is None else pot[key] for key in pot_keys])
+    known = ~numpy.isnan(enes)
+    fill_idxs = [idx for idx, angle in enumerate(angles)
+                 if not known[idx] and
+                 numpy.any(numpy.isclose(angle, interp_vals, atol=1.0e-4))]
+    if fill_idxs and numpy.count_nonzero(known) >= 4:
+        period = grid_period(angles)
+        fill_enes, _ = periodic_splines(
+            angles[known], enes[known], period, angles[fill_idxs])
+        print(f'Interpolating the potential at {len(fill_idxs)} points '
+              'of the adaptive scan')
+        for idx, ene in zip(fill_idxs, fill_enes):
+            pot[pot_keys[idx]] = float(ene)
+
+    return pot
+
+
 def remove_bad_point(pot, bad_angle):
     """ Remove a single bad angle from a potential
     """
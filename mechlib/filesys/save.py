@@ -2,10 +2,17 @@
  functions for reading and writing the filesystem
 """
 
+import os
+import json
 import automol
 import elstruct
 import autofile
 from mechlib.amech_io import printer as ioprinter
+from mechlib.filesys import _parsed
+
+
+# Sidecar in a scan branch listing the points an adaptive scan interpolates
+ADAPTIVE_GRID_NAME = 'adaptive_grid.json'
 
 
 def atom(sp_ret, cnf_fs, thy_locs, zma,
@@ -141,6 +148,28 @@ def scan_point_structure(opt_ret, scn_fs, scn_locs, thy_locs, job,
     _save_energy(opt_ret, sp_fs, thy_locs)
 
 
+def interpolated_scan_points(scn_fs, coord_locs, grid_vals):
+    """ Record the grid values of the points of a 1-D scan that an
+        adaptive scan left to be interpolated rather than run
+
+        :param scn_fs: SCAN/CSCAN object with save filesys prefix
+        :type scn_fs: autofile.fs.scan or autofile.fs.cscan object
+        :param coord_locs: locators of the scan branch
+        :type coord_locs: tuple(str) or dict[str: float]
+        :param grid_vals: values of the interpolated points
+        :type grid_vals: tuple(float)
+    """
+
+    scn_fs[1].create([coord_locs])
+    interp_path = os.path.join(
+        scn_fs[1].path([coord_locs]), ADAPTIVE_GRID_NAME)
+    tmp_path = f'{interp_path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as interp_file:
+        json.dump({'interpolated': [float(val) for val in grid_vals]},
+                  interp_file)
+    os.replace(tmp_path, interp_path)
+
+
 def init_cnf_samp(cnf_fs, cnf_locs):
     """ init cnf samp
     """
@@ -311,15 +340,15 @@ def read_job_zma(ret, init_zma=None, rebuild=False):
     #         zma = automol.reac.ts_zmatrix(zrxn, geo)
 
     _, _, out_str, prog, _ = _unpack_ret(ret)
-    zma = elstruct.reader.opt_zmatrix(prog, out_str)
+    zma = _parsed.opt_zmatrix(prog, out_str)
     if zma is None or rebuild:
         print('Getting ZMA from a geometry...')
-        geo = elstruct.reader.opt_geometry(prog, out_str)
+        geo = _parsed.opt_geometry(prog, out_str)
         if init_zma is not None:
             print('Resetting ZMA coords using opt geoms...')
             zma = rebuild_zma_from_opt_geo(init_zma, geo)
         else:
-            init_zma = elstruct.reader.inp_zmatrix(prog, out_str)
+            init_zma = _parsed.inp_zmatrix(prog, out_str)
             if init_zma is not None:
                 print('Resetting ZMA coords using opt geoms...')
                 zma = rebuild_zma_from_opt_geo(init_zma, geo)
@@ -359,7 +388,7 @@ def _save_geom(ret, cnf_fs, cnf_locs):
 
     print(" - Reading geometry from output...")
     inf_obj, inp_str, out_str, prog, _ = _unpack_ret(ret)
-    geo = elstruct.reader.opt_geometry(prog, out_str)
+    geo = _parsed.opt_geometry(prog, out_str)
     _save_geom_parsed(geo, inf_obj, inp_str, cnf_fs, cnf_locs)
 
 
@@ -370,7 +399,7 @@ def _save_grad(ret, cnf_fs, cnf_locs):
     print(" - Reading gradient from output...")
     inf_obj, inp_str, out_str, prog, _ = _unpack_ret(ret)
 
-    grad = elstruct.reader.gradient(prog, out_str)
+    grad = _parsed.gradient(prog, out_str)
 
     cnf_fs[-1].create(cnf_locs)
     cnf_path = cnf_fs[-1].path(cnf_locs)
@@ -405,7 +434,7 @@ def _save_zmatrix(ret, zma_fs, zma_locs, init_zma=None):
     zma = None
     if init_zma is not None:
         print('using opt geo fro zma')
-        geo = elstruct.reader.opt_geometry(prog, out_str)
+        geo = _parsed.opt_geometry(prog, out_str)
         zma = read_zma_from_geo(init_zma, geo)
     if zma is None:
         zma = read_job_zma(ret, init_zma=init_zma)
@@ -431,7 +460,7 @@ def _save_energy(ret, sp_fs, sp_locs):
     print(" - Reading energy from output...")
     inf_obj, inp_str, out_str, prog, method = _unpack_ret(ret)
 
-    ene = elstruct.reader.energy(prog, method, out_str)
+    ene = _parsed.energy(prog, method, out_str)
     _save_energy_parsed(ene, inf_obj, inp_str, sp_fs, sp_locs)
 
 
@@ -455,8 +484,8 @@ def _save_hessian(ret, cnf_fs, cnf_locs):
     print(" - Reading hessian and harmonic frequencies from output...")
     inf_obj, inp_str, out_str, prog, _ = _unpack_ret(ret)
 
-    hess = elstruct.reader.hessian(prog, out_str)
-    freqs = elstruct.reader.harmonic_frequencies(prog, out_str)
+    hess = _parsed.hessian(prog, out_str)
+    freqs = _parsed.harmonic_frequencies(prog, out_str)
     _save_hessian_parsed(hess, freqs, inf_obj, inp_str, cnf_fs, cnf_locs)
 
 
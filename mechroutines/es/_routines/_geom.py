@@ -7,6 +7,7 @@ import elstruct
 import autorun
 from mechanalyzer.inf import thy as tinfo
 from mechlib.amech_io import printer as ioprinter
+from mechlib.filesys import _parsed as parsed
 from mechroutines.es import runner as es_runner
 from mechroutines.es.runner import qchem_params
 
@@ -141,7 +142,7 @@ def _opt(spc_info, mod_thy_info, geo, run_fs,
     if success:
         inf_obj, _, out_str = ret
         prog = inf_obj.prog
-        ret_geo = elstruct.reader.opt_geometry(prog, out_str)
+        ret_geo = parsed.opt_geometry(prog, out_str)
     else:
         ret_geo = None
 
@@ -170,7 +171,7 @@ def _hess(spc_info, mod_thy_info, geo, run_fs,
     if success:
         inf_obj, _, out_str = ret
         prog = inf_obj.prog
-        ret_hess = elstruct.reader.hessian(prog, out_str)
+        ret_hess = parsed.hessian(prog, out_str)
     else:
         ret_hess = None
 
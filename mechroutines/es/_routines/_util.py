@@ -68,3 +68,89 @@ def nsamp_init(nsamp_par, ntaudof):
     else:
         nsamp = nsamp_par[5]
     return nsamp
+
+
+# Distances (bohr) at which the pairwise potentials are tabulated
+POT_GRID = numpy.linspace(0.5, 20.0, 1951)
+
+# Pairwise potential tables built by this process, keyed on symbols
+_POT_TABLE_DCT = {}
+
+
+def repulsion_differences(ref_geo, samp_geos, ref_pot=None):
+    """ Compute the intramolecular interaction potential sum of each sample
+        geometry relative to that of the reference geometry, evaluated for
+        all of the samples at once over a (samples x atom-pairs) distance
+        array using tabulated pairwise potentials.
+
+        The pairwise potentials are tabulated from automol's potential sum
+        for isolated atom pairs. If the tables do not reproduce automol's
+        value for the reference geometry and for the first sample, None is
+        returned and the caller should fall back to
+        automol.pot.intramol_interaction_potential_sum.
+
+        :param ref_geo: reference geometry
+        :type ref_geo: automol.geom object
+        :param samp_geos: sample geometries with the same atom ordering
+        :type samp_geos: tuple(automol.geom object)
+        :param ref_pot: automol potential sum of the reference, if known
+        :type ref_pot: float
+        :rtype: numpy.ndarray/None
+    """
+
+    symbs = automol.geom.symbols(ref_geo)
+    idxs1, idxs2 = numpy.triu_indices(len(symbs), k=1)
+    pair_keys = tuple(
+        tuple(sorted((symbs[idx1], symbs[idx2])))
+        for idx1, idx2 in zip(idxs1, idxs2))
+    pair_masks = {
+        key: numpy.array([pkey == key for pkey in pair_keys])
+        for key in set(pair_keys)}
+
+    ref_xyzs = numpy.array([automol.geom.coordinates(ref_geo)])
+    tab_ref_pot = _pot_sums(ref_xyzs, idxs1, idxs2, pair_masks)[0]
+    if ref_pot is None:
+        ref_pot = automol.pot.intramol_interaction_potential_sum(ref_geo)
+    if not numpy.isclose(tab_ref_pot, ref_pot, rtol=1.0e-3, atol=0.5):
+        return None
+
+    if not samp_geos:
+        return numpy.zeros(0)
+    samp_xyzs = numpy.array(
+        [automol.geom.coordinates(geo) for geo in samp_geos])
+    tab_samp_pots = _pot_sums(samp_xyzs, idxs1, idxs2, pair_masks)
+    samp_pot = automol.pot.intramol_interaction_potential_sum(samp_geos[0])
+    if not numpy.isclose(tab_samp_pots[0], samp_pot, rtol=1.0e-3, atol=0.5):
+        return None
+
+    return tab_samp_pots - tab_ref_pot
+
+
+def _pot_sums(xyzs, idxs1, idxs2, pair_masks):
+    """ Sum the tabulated pairwise potentials over all atom pairs for a
+        (samples x atoms x 3) array of coordinates
+    """
+
+    dists = numpy.linalg.norm(xyzs[:, idxs1, :] - xyzs[:, idxs2, :], axis=2)
+    pots = numpy.zeros_like(dists)
+    for key, mask in pair_masks.items():
+        pots[:, mask] = numpy.interp(
+            dists[:, mask], POT_GRID, _pot_table(key), right=0.0)
+
+    return numpy.sum(pots, axis=1)
+
+
+def _pot_table(key):
+    """ Tabulate the potential of an isolated pair of atoms over POT_GRID
+    """
+
+    if key not in _POT_TABLE_DCT:
+        pot_vals = [
+            automol.pot.intramol_interaction_potential_sum(
+                automol.geom.from_data(
+                    key, ((0.0, 0.0, 0.0), (0.0, 0.0, dist))))
+            for dist in POT_GRID]
+        _POT_TABLE_DCT[key] = numpy.nan_to_num(
+            numpy.array(pot_vals, dtype=float), posinf=1.0e10)
+
+    return _POT_TABLE_DCT[key]
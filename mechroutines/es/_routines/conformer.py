@@ -3,20 +3,29 @@
 
 import shutil
 import time
+import functools
 import automol
 import elstruct
 import autofile
 from autofile import fs
 from mechanalyzer.inf import thy as tinfo
 from mechlib import filesys
+from mechlib.filesys import _cnftraj as cnftraj
+from mechlib.filesys import _cnffp as cnffp
+from mechlib.filesys import _cnfreg as cnfreg
 from mechlib.amech_io.printer import info_message, warning_message
 from mechlib.amech_io.printer import debug_message, error_message, obj
 from mechlib.amech_io.printer import existing_path, bad_conformer, checking
+from mechlib.filesys import _parsed as parsed
 from mechroutines.es import runner as es_runner
 from mechroutines.es._routines import _util as util
 from mechroutines.es._routines._geom import remove_imag
 
 
+# Minimum number of sample Z-Matrices screened for repulsion at once
+SAMP_BLOCK = 50
+
+
 # Initial conformer
 def initial_conformer(spc_dct_i, spc_info, ini_method_dct, method_dct,
                       ini_cnf_save_fs, cnf_run_fs, cnf_save_fs,
@@ -236,8 +245,8 @@ def _optimize_molecule(spc_info, zma_init,
     # read the geometry
     if success:
         inf_obj, _, out_str = ret
-        geo = elstruct.reader.opt_geometry(inf_obj.prog, out_str)
-        zma = elstruct.reader.opt_zmatrix(inf_obj.prog, out_str)
+        geo = parsed.opt_geometry(inf_obj.prog, out_str)
+        zma = parsed.opt_zmatrix(inf_obj.prog, out_str)
         if zma is None:
             zma = automol.geom.zmatrix(geo)
         geo_conn = bool(automol.geom.connected(geo))
@@ -313,6 +322,7 @@ def single_conformer(zma, spc_info, mod_thy_info,
         else:
             locs = use_locs
         cnf_run_fs[-1].create(locs)
+        cnfreg.record(cnf_run_fs, locs, zma)
         cnf_run_path = cnf_run_fs[-1].path(locs)
         run_fs = autofile.fs.run(cnf_run_path)
 
@@ -337,8 +347,8 @@ def single_conformer(zma, spc_info, mod_thy_info,
             inf_obj, _, out_str = ret
             prog = inf_obj.prog
             method = inf_obj.method
-            ene = elstruct.reader.energy(prog, method, out_str)
-            geo = elstruct.reader.opt_geometry(prog, out_str)
+            ene = parsed.energy(prog, method, out_str)
+            geo = parsed.opt_geometry(prog, out_str)
             # zma = elstruct.reader.opt_zmatrix(prog, out_str)
             saved_locs, saved_geos, saved_enes = _saved_cnf_info(
                 cnf_save_fs, mod_thy_info)
@@ -404,8 +414,13 @@ def conformer_sampling(zma, spc_info, thy_info,
                        zrxn=None, two_stage=False,
                        retryfail=False, resave=False,
                        repulsion_thresh=40.0, print_debug=True,
+                       njobs=1,
                        **kwargs):
     """ run sampling algorithm to find conformers
+
+        If njobs > 1, the samples are generated in batches and up to njobs
+        optimizations are run at once, with the results of each batch
+        saved once its optimizations have finished.
     """
 
     # Check if any saving needs to be done before hand
@@ -435,9 +450,22 @@ def conformer_sampling(zma, spc_info, thy_info,
         info_message(
             f'Running {nsamp-nsampd} samples...', newline=1)
 
+    if njobs > 1:
+        _concurrent_conformer_sampling(
+            zma, spc_info, thy_info,
+            cnf_run_fs, cnf_save_fs, rid, inf_obj,
+            nsamp0, nsampd, tors_range_dct,
+            script_str, overwrite, njobs,
+            zrxn=zrxn, two_stage=two_stage, retryfail=retryfail,
+            repulsion_thresh=repulsion_thresh, print_debug=print_debug,
+            **kwargs)
+        cnftraj.flush(cnf_save_fs, thy_info, rid=rid)
+        return
+
     # Generate all of the conformers, as needed
     samp_idx = 1
     samp_attempt_idx = 1
+    samp_zmas = []
     while True:
         nsamp = nsamp0 - nsampd
         # Break the while loop if enough sampls completed
@@ -452,73 +480,36 @@ def conformer_sampling(zma, spc_info, thy_info,
                 'Run again if more samples desired.')
             break
 
-        # Run the conformer sampling
-        if nsampd > 0:
-            samp_zma, = automol.zmat.samples(zma, 1, tors_range_dct)
-        else:
-            samp_zma = zma
-
-        info_message(
-            'Generating sample Z-Matrix that does not have',
-            'high intramolecular repulsion...')
-        bad_geo_cnt = 0
-        ref_pot = automol.pot.intramol_interaction_potential_sum(
-            automol.zmat.geometry(zma))
-        samp_pot = automol.pot.intramol_interaction_potential_sum(
-            automol.zmat.geometry(samp_zma))
-        while samp_pot-ref_pot > repulsion_thresh and bad_geo_cnt < 1000:
-            if print_debug:
-                warning_message('Structure has high repulsion.')
-                warning_message(
-                    'Sums of intramol LJ potential interactions [kcal/mol]:',
-                    f'Ref:{ref_pot:.2f}, Test:{samp_pot:.2f}, '
-                    f'Diff:{samp_pot-ref_pot:.2f}')
-                warning_message(
-                    'Generating new sample Z-Matrix')
-            samp_zma, = automol.zmat.samples(zma, 1, tors_range_dct)
-            samp_pot = automol.pot.intramol_interaction_potential_sum(
-                automol.zmat.geometry(samp_zma))
-            bad_geo_cnt += 1
+        # Run the conformer sampling, screening a new block of samples
+        # for high intramolecular repulsion whenever the last one is used
+        if not samp_zmas:
+            info_message(
+                'Generating sample Z-Matrices that do not have',
+                'high intramolecular repulsion...')
+            samp_zmas = _screened_samples(
+                zma, nsamp, tors_range_dct,
+                repulsion_thresh=repulsion_thresh,
+                include_ref=bool(nsampd == 0),
+                print_debug=print_debug)
+        samp_zma = samp_zmas.pop(0)
 
         cid = autofile.schema.generate_new_conformer_id()
         locs = [rid, cid]
 
         cnf_run_fs[-1].create(locs)
+        cnfreg.record(cnf_run_fs, locs, samp_zma)
         cnf_run_path = cnf_run_fs[-1].path(locs)
         run_fs = autofile.fs.run(cnf_run_path)
 
         info_message(f"Run {samp_idx}/{tot_samp}")
         tors_names = tuple(tors_range_dct.keys())
         print('two_stage test:', two_stage, tors_names)
-        if two_stage and tors_names:
-            frozen_coords_lst = (tors_names, ())
-            success, ret = es_runner.multi_stage_optimization(
-                script_str=script_str,
-                run_fs=run_fs,
-                geo=samp_zma,
-                spc_info=spc_info,
-                thy_info=thy_info,
-                frozen_coords_lst=frozen_coords_lst,
-                zrxn=zrxn,
-                overwrite=overwrite,
-                saddle=bool(zrxn is not None),
-                retryfail=retryfail,
-                **kwargs
-            )
-        else:
-            success, ret = es_runner.execute_job(
-                job=elstruct.Job.OPTIMIZATION,
-                script_str=script_str,
-                run_fs=run_fs,
-                geo=samp_zma,
-                spc_info=spc_info,
-                thy_info=thy_info,
-                zrxn=zrxn,
-                overwrite=overwrite,
-                saddle=bool(zrxn is not None),
-                retryfail=retryfail,
-                **kwargs
-            )
+        success, ret = _optimize_sample(
+            samp_zma, run_fs, spc_info, thy_info,
+            script_str, overwrite,
+            tors_names=tors_names, zrxn=zrxn,
+            two_stage=two_stage, retryfail=retryfail,
+            **kwargs)
 
         # save function added here
         if success:
@@ -537,6 +528,211 @@ def conformer_sampling(zma, spc_info, thy_info,
         # Increment attempt counter
         samp_attempt_idx += 1
 
+    # Write the trajectory files with all of the conformers saved
+    cnftraj.flush(cnf_save_fs, thy_info, rid=rid)
+
+
+def _concurrent_conformer_sampling(
+        zma, spc_info, thy_info,
+        cnf_run_fs, cnf_save_fs, rid, inf_obj,
+        nsamp0, nsampd, tors_range_dct,
+        script_str, overwrite, njobs,
+        zrxn=None, two_stage=False, retryfail=False,
+        repulsion_thresh=40.0, print_debug=True,
+        **kwargs):
+    """ Generate batches of low-repulsion sample Z-Matrices and run up to
+        njobs of their optimizations at once. The optimizations run in
+        separate processes, and this process saves each conformer as soon
+        as its optimization finishes.
+    """
+
+    tors_names = tuple(tors_range_dct.keys())
+    brk_tot_samp = nsamp0 * 5
+
+    samp_attempt_idx = 0
+    while True:
+        nsamp = nsamp0 - nsampd
+        # Break the while loop if enough sampls completed
+        if nsamp <= 0:
+            info_message(
+                'Requested number of samples have been completed.',
+                'Conformer search complete.')
+            break
+        if samp_attempt_idx >= brk_tot_samp:
+            info_message(
+                f'Max sample num: 5*{nsamp0} attempted, ending search',
+                'Run again if more samples desired.')
+            break
+
+        # Build the batch of samples, starting from the input zma if needed
+        samp_zmas = _screened_samples(
+            zma, nsamp, tors_range_dct,
+            repulsion_thresh=repulsion_thresh,
+            include_ref=bool(nsampd == 0 and samp_attempt_idx == 0),
+            print_debug=print_debug)
+        locs_lst = []
+        for samp_zma in samp_zmas:
+            locs = [rid, autofile.schema.generate_new_conformer_id()]
+            cnf_run_fs[-1].create(locs)
+            cnfreg.record(cnf_run_fs, locs, samp_zma)
+            locs_lst.append(locs)
+
+        info_message(
+            f'Running a batch of {len(samp_zmas)} samples '
+            f'with up to {njobs} optimizations at once...')
+
+        # Save each conformer as soon as its optimization finishes; the
+        # callback runs in this process, so uniqueness is still assessed
+        # one conformer at a time against everything saved before it
+        saved = []
+        es_runner.run_in_budget(
+            _run_sample_optimization,
+            tuple((samp_zma, cnf_run_fs[-1].path(locs),
+                   spc_info, thy_info, script_str, overwrite,
+                   tors_names, zrxn, two_stage, retryfail, kwargs)
+                  for samp_zma, locs in zip(samp_zmas, locs_lst)),
+            ((1, 0.0),)*len(samp_zmas), njobs,
+            callback=functools.partial(
+                _save_sample, samp_zmas, locs_lst,
+                cnf_run_fs, cnf_save_fs, rid, inf_obj,
+                spc_info, thy_info, zrxn, saved))
+        if saved:
+            nsampd = inf_obj.nsamp
+
+        samp_attempt_idx += len(samp_zmas)
+
+
+def _save_sample(samp_zmas, locs_lst,
+                 cnf_run_fs, cnf_save_fs, rid, inf_obj,
+                 spc_info, thy_info, zrxn, saved, idx, _):
+    """ Read the optimization of a sample once its process has finished
+        and save the conformer, noting the index of each sample saved;
+        the callback of the processes launched by the concurrent sampling
+    """
+
+    locs = locs_lst[idx]
+    run_fs = autofile.fs.run(cnf_run_fs[-1].path(locs))
+    success, ret = es_runner.read_job(
+        job=elstruct.Job.OPTIMIZATION, run_fs=run_fs)
+    if success:
+        save_conformer(
+            ret, cnf_run_fs, cnf_save_fs, locs, thy_info,
+            zrxn=zrxn, orig_ich=spc_info[0], rid_traj=True,
+            init_zma=samp_zmas[idx])
+
+        inf_obj.nsamp = util.calc_nsampd(cnf_save_fs, cnf_run_fs, rid) + 1
+        cnf_save_fs[1].file.info.write(inf_obj, [rid])
+        cnf_run_fs[1].file.info.write(inf_obj, [rid])
+        saved.append(idx)
+
+
+def _run_sample_optimization(samp_zma, run_path, spc_info, thy_info,
+                             script_str, overwrite,
+                             tors_names, zrxn, two_stage, retryfail,
+                             kwargs):
+    """ Optimize a sampled Z-Matrix in its run directory; the target of
+        the processes launched by the concurrent sampling, with all of
+        its arguments passed positionally
+    """
+    _optimize_sample(
+        samp_zma, autofile.fs.run(run_path), spc_info, thy_info,
+        script_str, overwrite,
+        tors_names=tors_names, zrxn=zrxn,
+        two_stage=two_stage, retryfail=retryfail,
+        **kwargs)
+
+
+def _screened_samples(zma, nsamp, tors_range_dct,
+                      repulsion_thresh=40.0, include_ref=False,
+                      print_debug=True):
+    """ Generate sample Z-Matrices whose intramolecular repulsion does
+        not exceed that of the reference Z-Matrix by more than the
+        threshold. Candidates are drawn in blocks and screened together;
+        if 1000 candidates in a row are rejected, the least repulsive of
+        them is kept.
+    """
+
+    samp_zmas = [zma] if include_ref else []
+    ref_geo = automol.zmat.geometry(zma)
+    ref_pot = automol.pot.intramol_interaction_potential_sum(ref_geo)
+    bad_geo_cnt, best_bad = 0, None
+    while len(samp_zmas) < nsamp:
+        nblock = min(max(nsamp - len(samp_zmas), SAMP_BLOCK), 1000)
+        blk_zmas = automol.zmat.samples(zma, nblock, tors_range_dct)
+        blk_geos = tuple(automol.zmat.geometry(samp_zma)
+                         for samp_zma in blk_zmas)
+        diffs = util.repulsion_differences(
+            ref_geo, blk_geos, ref_pot=ref_pot)
+        if diffs is None:
+            diffs = (automol.pot.intramol_interaction_potential_sum(geo) -
+                     ref_pot for geo in blk_geos)
+
+        nrej = 0
+        for samp_zma, diff in zip(blk_zmas, diffs):
+            if len(samp_zmas) == nsamp:
+                break
+            if diff <= repulsion_thresh:
+                samp_zmas.append(samp_zma)
+                bad_geo_cnt, best_bad = 0, None
+            else:
+                nrej += 1
+                bad_geo_cnt += 1
+                if best_bad is None or diff < best_bad[0]:
+                    best_bad = (diff, samp_zma)
+                if bad_geo_cnt == 1000:
+                    samp_zmas.append(best_bad[1])
+                    bad_geo_cnt, best_bad = 0, None
+
+        if print_debug and nrej:
+            warning_message(
+                f'{nrej} of {nblock} sample Z-Matrices have high repulsion.',
+                'Sums of intramol LJ potential interactions [kcal/mol]:',
+                f'Ref:{ref_pot:.2f}, Diff > {repulsion_thresh:.2f}')
+
+    return samp_zmas
+
+
+def _optimize_sample(samp_zma, run_fs, spc_info, thy_info,
+                     script_str, overwrite,
+                     tors_names=(), zrxn=None,
+                     two_stage=False, retryfail=False,
+                     **kwargs):
+    """ Optimize a sampled Z-Matrix, with the torsions first frozen
+        if a two-stage optimization was requested
+    """
+
+    if two_stage and tors_names:
+        frozen_coords_lst = (tors_names, ())
+        success, ret = es_runner.multi_stage_optimization(
+            script_str=script_str,
+            run_fs=run_fs,
+            geo=samp_zma,
+            spc_info=spc_info,
+            thy_info=thy_info,
+            frozen_coords_lst=frozen_coords_lst,
+            zrxn=zrxn,
+            overwrite=overwrite,
+            saddle=bool(zrxn is not None),
+            retryfail=retryfail,
+            **kwargs
+        )
+    else:
+        success, ret = es_runner.execute_job(
+            job=elstruct.Job.OPTIMIZATION,
+            script_str=script_str,
+            run_fs=run_fs,
+            geo=samp_zma,
+            spc_info=spc_info,
+            thy_info=thy_info,
+            zrxn=zrxn,
+            overwrite=overwrite,
+            saddle=bool(zrxn is not None),
+            retryfail=retryfail,
+            **kwargs
+        )
+
+    return success, ret
+
 
 def _num_samp_zmas(ring_atoms, nsamp_par):
     """ choose starting number of sample zmas
@@ -553,6 +749,7 @@ def ring_conformer_sampling(
         nsamp_par=(False, 3, 1, 3, 50, 50),
         ring_tors_dct=None,
         zrxn=None, two_stage=False, retryfail=False,
+        repulsion_thresh=40.0,
         **kwargs):
     """ run sampling algorithm to find conformers
     """
@@ -563,6 +760,7 @@ def ring_conformer_sampling(
 
     # Set up torsions
     geo = automol.zmat.geometry(zma)
+    ref_pot = automol.pot.intramol_interaction_potential_sum(geo)
     tors_dcts = ring_tors_dct.items() if ring_tors_dct is not None else {}
     rings_atoms = []
     for ring_atoms, samp_range_dct in tors_dcts:
@@ -588,28 +786,42 @@ def ring_conformer_sampling(
         ring_atoms = [int(idx)-1 for idx in ring_atoms.split('-')]
         dist_value_dct = automol.zmat.ring_distances(zma, ring_atoms)
         nsamp = _num_samp_zmas(ring_atoms, nsamp_par)
-        samp_zmas = automol.zmat.samples(zma, nsamp, samp_range_dct)
-        for samp_zma in samp_zmas:
+        samp_zmas, samp_geos = [], []
+        for samp_zma in automol.zmat.samples(zma, nsamp, samp_range_dct):
             if automol.zmat.ring_distances_reasonable(
                     samp_zma, ring_atoms, dist_value_dct):
                 samp_geo = automol.zmat.geometry(samp_zma)
-                frag_samp_geo = automol.geom.ring_fragments_geometry(
-                    samp_geo, rings_atoms, ngbs)
                 if automol.geom.ring_angles_reasonable(samp_geo, ring_atoms):
                     print('   - reasonable check 2')
-                    if not automol.pot.low_repulsion_struct(geo, samp_geo):
-                        print('   - reasonable check 3')
-                        frag_samp_unique = automol.geom.is_unique(
-                            frag_samp_geo, frag_saved_geos, check_dct)
-                        samp_unique = automol.geom.is_unique(
-                            frag_samp_geo, unique_frag_geos, check_dct)
-                        if frag_samp_unique:
-                            print('   - reasonable check 4')
-                            if samp_unique:
-                                print('   - reasonable check 5')
-                                unique_zmas.append(samp_zma)
-                                unique_geos.append(samp_geo)
-                                unique_frag_geos.append(frag_samp_geo)
+                    samp_zmas.append(samp_zma)
+                    samp_geos.append(samp_geo)
+
+        # Screen the repulsion of all of the reasonable samples at once,
+        # keeping those within the threshold of the reference
+        diffs = util.repulsion_differences(geo, samp_geos, ref_pot=ref_pot)
+        if diffs is None:
+            diffs = tuple(
+                automol.pot.intramol_interaction_potential_sum(samp_geo) -
+                ref_pot for samp_geo in samp_geos)
+        low_reps = tuple(diff <= repulsion_thresh for diff in diffs)
+
+        for samp_zma, samp_geo, low_rep in zip(
+                samp_zmas, samp_geos, low_reps):
+            if low_rep:
+                print('   - reasonable check 3')
+                frag_samp_geo = automol.geom.ring_fragments_geometry(
+                    samp_geo, rings_atoms, ngbs)
+                frag_samp_unique = automol.geom.is_unique(
+                    frag_samp_geo, frag_saved_geos, check_dct)
+                samp_unique = automol.geom.is_unique(
+                    frag_samp_geo, unique_frag_geos, check_dct)
+                if frag_samp_unique:
+                    print('   - reasonable check 4')
+                    if samp_unique:
+                        print('   - reasonable check 5')
+                        unique_zmas.append(samp_zma)
+                        unique_geos.append(samp_geo)
+                        unique_frag_geos.append(frag_samp_geo)
 
     # Set the samples
     nsamp = len(unique_zmas)
@@ -642,6 +854,7 @@ def ring_conformer_sampling(
         locs = (rid, cid)
 
         cnf_run_fs[-1].create(locs)
+        cnfreg.record(cnf_run_fs, locs, samp_zma)
         cnf_run_path = cnf_run_fs[-1].path(locs)
         run_fs = autofile.fs.run(cnf_run_path)
 
@@ -693,6 +906,9 @@ def ring_conformer_sampling(
             cnf_save_fs[0].file.info.write(inf_obj)
             cnf_run_fs[0].file.info.write(inf_obj)
 
+    # Write the trajectory files with all of the conformers saved
+    cnftraj.flush(cnf_save_fs, thy_info)
+
 
 def _presamp_save(spc_info, cnf_run_fs, cnf_save_fs,
                   thy_info, zrxn=None, rid=None):
@@ -745,8 +961,8 @@ def save_conformer(ret, cnf_run_fs, cnf_save_fs, locs, thy_info, zrxn=None,
     inf_obj, _, out_str = ret
     prog = inf_obj.prog
     method = inf_obj.method
-    ene = elstruct.reader.energy(prog, method, out_str)
-    geo = elstruct.reader.opt_geometry(prog, out_str)
+    ene = parsed.energy(prog, method, out_str)
+    geo = parsed.opt_geometry(prog, out_str)
     zma = None
     if init_zma is not None:
         zma = filesys.save.read_zma_from_geo(init_zma, geo)
@@ -764,6 +980,7 @@ def save_conformer(ret, cnf_run_fs, cnf_save_fs, locs, thy_info, zrxn=None,
 
     # Determine uniqueness of conformer, save if needed
     if viable:
+        traj, _ = cnftraj.sync(cnf_save_fs, thy_info, locs_lst=(locs,))
         if _geo_unique(geo, ene, saved_geos, saved_enes, zrxn):
             sym_id = _sym_unique(
                 geo, ene, saved_geos, saved_enes)
@@ -773,6 +990,8 @@ def save_conformer(ret, cnf_run_fs, cnf_save_fs, locs, thy_info, zrxn=None,
                     ret, None, cnf_save_fs, thy_info[1:],
                     init_zma=init_zma,  zrxn=zrxn,
                     rng_locs=(locs[0],), tors_locs=(locs[1],))
+                if cnf_save_fs[-1].exists(locs):
+                    cnftraj.insert(traj, ene, locs, geo)
             else:
                 sym_locs = saved_locs[sym_id]
                 filesys.save.sym_indistinct_conformer(
@@ -780,6 +999,7 @@ def save_conformer(ret, cnf_run_fs, cnf_save_fs, locs, thy_info, zrxn=None,
                 if cnf_save_fs[-1].exists(locs):
                     cnf_save_path = cnf_save_fs[-1].path(locs)
                     shutil.rmtree(cnf_save_path)
+                    cnftraj.remove(traj, locs)
                 if cnf_run_fs[-1].exists(locs):
                     cnf_run_path = cnf_run_fs[-1].path(locs)
                     shutil.rmtree(cnf_run_path)
@@ -787,61 +1007,64 @@ def save_conformer(ret, cnf_run_fs, cnf_save_fs, locs, thy_info, zrxn=None,
             if cnf_save_fs[-1].exists(locs):
                 cnf_save_path = cnf_save_fs[-1].path(locs)
                 shutil.rmtree(cnf_save_path)
+                cnftraj.remove(traj, locs)
             if cnf_run_fs[-1].exists(locs):
                 cnf_run_path = cnf_run_fs[-1].path(locs)
                 shutil.rmtree(cnf_run_path)
 
-        # Update the conformer trajectory file
+        # Update the conformer trajectory files, which are rewritten at
+        # most once per interval; samplers flush them when they finish
         obj('vspace')
         rid = None
         if rid_traj:
             rid = locs[0]
-        filesys.mincnf.traj_sort(cnf_save_fs, thy_info, rid=rid)
+        cnftraj.write(cnf_save_fs, traj, rid=rid)
 
 
 def _saved_cnf_info(cnf_save_fs, mod_thy_info, orig_locs=None):
     """ get the locs, geos and enes for saved conformers
+
+        The data comes from the energy-sorted conformer list kept for the
+        save filesystem, so only conformers saved since the list was last
+        synced are read from the filesystem.
     """
 
-    saved_locs = list(cnf_save_fs[-1].existing())
-    saved_locs = [locs for locs in saved_locs if not locs == orig_locs]
-    saved_geos = [cnf_save_fs[-1].file.geometry.read(locs)
-                  for locs in saved_locs]
-    found_saved_locs = []
-    found_saved_geos = []
-    found_saved_enes = []
-    for idx, locs in enumerate(saved_locs):
+    traj, pending_locs = cnftraj.sync(cnf_save_fs, mod_thy_info)
+    for locs in pending_locs:
         path = cnf_save_fs[-1].path(locs)
         sp_save_fs = autofile.fs.single_point(path)
-        if sp_save_fs[-1].file.energy.exists(mod_thy_info[1:4]):
-            found_saved_enes.append(sp_save_fs[-1].file.energy.read(
-                mod_thy_info[1:4]))
-            found_saved_locs.append(saved_locs[idx])
-            found_saved_geos.append(saved_geos[idx])
-        else:
+        info_message(
+            f'No energy saved in single point directory for {path}')
+        geo_inf_obj = cnf_save_fs[-1].file.geometry_info.read(
+            locs)
+        geo_end_time = geo_inf_obj.utc_end_time
+        current_time = autofile.schema.utc_time()
+        if (current_time - geo_end_time).total_seconds() < 120:
+            last_time = (current_time - geo_end_time).total_seconds()
+            wait_time = 120 - last_time
             info_message(
-                f'No energy saved in single point directory for {path}')
-            # geo_inf_obj = cnf_save_fs[-1].file.geometry_info.read(
-            #     mod_thy_info[1:4])
-            geo_inf_obj = cnf_save_fs[-1].file.geometry_info.read(
-                locs)
-            geo_end_time = geo_inf_obj.utc_end_time
-            current_time = autofile.schema.utc_time()
-            if (current_time - geo_end_time).total_seconds() < 120:
-                last_time = (current_time - geo_end_time).total_seconds()
-                wait_time = 120 - last_time
-                info_message(
-                    f'Geo was saved in the last {last_time:3.2f} seconds, '
-                    f'waiting for {wait_time:3.2f} seconds')
-                time.sleep(wait_time)
-                if sp_save_fs[-1].file.energy.exists(mod_thy_info[1:4]):
-                    found_saved_enes.append(sp_save_fs[-1].file.energy.read(
-                        mod_thy_info[1:4]))
-                    found_saved_locs.append(saved_locs[idx])
-                    found_saved_geos.append(saved_geos[idx])
-                    info_message('the energy is now found')
-                else:
-                    info_message('waiting helped nothing')
+                f'Geo was saved in the last {last_time:3.2f} seconds, '
+                f'waiting for {wait_time:3.2f} seconds')
+            time.sleep(wait_time)
+            if sp_save_fs[-1].file.energy.exists(mod_thy_info[1:4]):
+                cnftraj.insert(
+                    traj,
+                    sp_save_fs[-1].file.energy.read(mod_thy_info[1:4]),
+                    locs,
+                    cnf_save_fs[-1].file.geometry.read(locs))
+                info_message('the energy is now found')
+            else:
+                info_message('waiting helped nothing')
+
+    orig_locs = tuple(orig_locs) if orig_locs is not None else None
+    found_saved_locs = []
+    found_saved_geos = []
+    found_saved_enes = []
+    for ene, locs, geo in cnftraj.conformers(traj):
+        if locs != orig_locs:
+            found_saved_enes.append(ene)
+            found_saved_locs.append(list(locs))
+            found_saved_geos.append(geo)
 
     return found_saved_locs, found_saved_geos, found_saved_enes
 
@@ -873,10 +1096,15 @@ def _init_geom_is_running(cnf_run_fs):
 def this_conformer_was_run_in_save(zma, cnf_fs):
     """ Assess if a conformer was run in save
     """
-    running = False
-    for locs in cnf_fs[-1].existing(ignore_bad_formats=True):
-        cnf_path = cnf_fs[-1].path(locs)
-        if cnf_fs[-1].file.geometry_input.exists(locs):
+
+    # Record the input of saved conformers missing from the registry
+    existing_locs = tuple(
+        tuple(locs) for locs in cnf_fs[-1].existing(ignore_bad_formats=True))
+    reg_recs = cnfreg.records(cnf_fs)
+    for locs in existing_locs:
+        if locs not in reg_recs and cnf_fs[-1].file.geometry_input.exists(
+                locs):
+            cnf_path = cnf_fs[-1].path(locs)
             print('checking input at ', cnf_path)
             inp_str = cnf_fs[-1].file.geometry_input.read(locs)
             inp_str = inp_str.replace('=', '')
@@ -884,54 +1112,91 @@ def this_conformer_was_run_in_save(zma, cnf_fs):
             prog = inf_obj.prog
             try:
                 inp_zma = elstruct.reader.inp_zmatrix(prog, inp_str)
-                if automol.zmat.almost_equal(inp_zma, zma,
-                                             dist_rtol=0.018, ang_atol=.2):
-                    info_message(
-                        f'This conformer was already run in {cnf_path}.')
-                    running = True
-                    break
             except:
                 info_message(f'Program {prog} lacks inp ZMA reader for check')
+                inp_zma = None
+            cnfreg.record(cnf_fs, locs, inp_zma, prog=prog)
+
+    running = False
+    existing_locs = set(existing_locs)
+    for locs in cnfreg.similar_locs(cnf_fs, zma):
+        if locs in existing_locs:
+            cnf_path = cnf_fs[-1].path(locs)
+            info_message(
+                f'This conformer was already run in {cnf_path}.')
+            running = True
+            break
     return running
 
 
 def this_conformer_is_running(zma, cnf_run_fs):
     """ Check the RUN filesystem for similar geometry
         submissions that are currently running
+
+        As before the registry existed, conformers run with Molpro are
+        never reported as running, since the check is disabled for them.
     """
 
-    running = False
+    # Record the input of conformers missing from the registry (i.e.,
+    # launched before it existed), so it is only ever parsed once
     job = elstruct.Job.OPTIMIZATION
+    reg_recs = cnfreg.records(cnf_run_fs)
     for locs in cnf_run_fs[-1].existing(ignore_bad_formats=True):
-        cnf_run_path = cnf_run_fs[-1].path(locs)
-        run_fs = autofile.fs.run(cnf_run_path)
-        run_path = run_fs[-1].path([job])
+        if tuple(locs) in reg_recs:
+            continue
+        run_fs = autofile.fs.run(cnf_run_fs[-1].path(locs))
         if run_fs[-1].file.info.exists([job]):
-            inf_obj = run_fs[-1].file.info.read([job])
-            status = inf_obj.status
-            if status == autofile.schema.RunStatus.RUNNING:
-                start_time = inf_obj.utc_start_time
+            prog = run_fs[-1].file.info.read([job]).prog
+            subrun_fs = autofile.fs.subrun(run_fs[-1].path([job]))
+            inp_zma = None
+            if 'molpro' in prog:
+                print('Warning: Since using Molpro, check for running '
+                      'conformer is disabled!')
+            elif subrun_fs[0].file.input.exists([0, 0]):
+                inp_str = subrun_fs[0].file.input.read([0, 0])
+                inp_str = inp_str.replace('=', '')
+                try:
+                    inp_zma = elstruct.reader.inp_zmatrix(prog, inp_str)
+                except:
+                    info_message(
+                        f'Program {prog} lacks inp ZMA reader for check')
+            cnfreg.record(cnf_run_fs, locs, inp_zma, prog=prog)
+
+    running = False
+    for locs in cnfreg.similar_locs(cnf_run_fs, zma):
+        inf_obj = _running_info(cnf_run_fs, locs)
+        # Samplers record conformers before their program is known
+        if inf_obj is not None and 'molpro' not in inf_obj.prog:
+            run_path = autofile.fs.run(cnf_run_fs[-1].path(locs))[-1].path(
+                [job])
+            current_time = autofile.schema.utc_time()
+            _hr = (current_time - inf_obj.utc_start_time).total_seconds()
+            info_message(
+                'This conformer was started in the last ' +
+                f'{_hr/3600.:3.4f} hours in {run_path}.')
+            running = True
+            break
+    return running
+
+
+def _running_info(cnf_run_fs, locs):
+    """ Read the info of the optimization of a conformer in the RUN
+        filesystem if it was started recently and is still running
+    """
+
+    inf_obj = None
+    job = elstruct.Job.OPTIMIZATION
+    if cnf_run_fs[-1].exists(locs):
+        run_fs = autofile.fs.run(cnf_run_fs[-1].path(locs))
+        if run_fs[-1].file.info.exists([job]):
+            _inf_obj = run_fs[-1].file.info.read([job])
+            if _inf_obj.status == autofile.schema.RunStatus.RUNNING:
+                start_time = _inf_obj.utc_start_time
                 current_time = autofile.schema.utc_time()
                 if (current_time - start_time).total_seconds() < 3000000:
-                    subrun_fs = autofile.fs.subrun(run_path)
-                    inp_str = subrun_fs[0].file.input.read([0, 0])
-                    inp_str = inp_str.replace('=', '')
-                    prog = inf_obj.prog
-                    if 'molpro' in prog:
-                        print('Warning: Since using Molpro, check for running '
-                              'conformer is disabled!')
-                        running = False
-                    else:
-                        inp_zma = elstruct.reader.inp_zmatrix(prog, inp_str)
-                        if automol.zmat.almost_equal(
-                            inp_zma, zma, dist_rtol=0.018, ang_atol=.2):
-                            _hr = (current_time - start_time).total_seconds()/3600.
-                            info_message(
-                                'This conformer was started in the last ' +
-                                f'{_hr:3.4f} hours in {run_path}.')
-                            running = True
-                            break
-    return running
+                    inf_obj = _inf_obj
+
+    return inf_obj
 
 
 def _geo_connected(geo, rxn):
@@ -968,16 +1233,16 @@ def _geo_unique(geo, ene, seen_geos, seen_enes, zrxn=None):
     else:
         check_dct = {'dist': 0.3}
 
-    no_similar_energies = True
-    for sene in seen_enes:
-        if abs(sene - ene) < 1e-5:
-            no_similar_energies = False
-
-    if no_similar_energies:
-        unique = True
-    else:
-        unique, _ = automol.geom.is_unique(
-            geo, seen_geos, check_dct=check_dct)
+    # Only compare against the saved geometries whose sorted distances
+    # allow them to be similar, if any saved energy is close to the new one
+    unique = True
+    if cnffp.energy_candidates(ene, seen_enes, 1e-5):
+        cand_idxs = cnffp.distance_candidates(
+            geo, seen_geos, check_dct['dist'])
+        if cand_idxs:
+            unique, _ = automol.geom.is_unique(
+                geo, [seen_geos[idx] for idx in cand_idxs],
+                check_dct=check_dct)
 
     if not unique:
         bad_conformer('not unique')
@@ -1020,12 +1285,9 @@ def _sym_unique(geo, ene, saved_geos, saved_enes, ethresh=1.0e-5):
     """
 
     sym_idx = None
-    new_saved_geos = []
-    idx_dct = {}
-    for i, (sene, sgeo) in enumerate(zip(saved_enes, saved_geos)):
-        if abs(ene - sene) < ethresh:
-            idx_dct[len(new_saved_geos)] = i
-            new_saved_geos.append(sgeo)
+    idx_dct = dict(enumerate(
+        cnffp.energy_candidates(ene, saved_enes, ethresh)))
+    new_saved_geos = [saved_geos[idx] for idx in idx_dct.values()]
     if new_saved_geos:
         _, sym_idx = automol.geom.is_unique(
             geo, new_saved_geos, check_dct={'coulomb': 1e-2})
@@ -5,6 +5,7 @@ import automol
 import elstruct
 from mechlib.amech_io import printer as ioprinter
 from mechroutines.es.runner import scan, qchem_params
+from mechroutines.es.runner import run_in_budget
 
 
 def hindered_rotor_scans(
@@ -15,8 +16,24 @@ def hindered_rotor_scans(
         zrxn=None,
         saddle=False,
         increment=0.5235987756,
-        retryfail=True):
+        retryfail=True,
+        njobs=1,
+        adapt_grid=False):
     """ Perform scans over each of the torsional coordinates
+
+        If adapt_grid is set, the scans of 1-D rotors are run on a coarse
+        grid first and only refined where the potential needs it (see
+        scan.execute_adaptive_scan).
+
+        For rigid (1dhrfa) scans with njobs > 1, the energies at all points
+        of all rotors are run at once, up to njobs at a time, since none of
+        them depend on each other; with adapt_grid, whose refinement
+        depends on the coarse points, the rotors are instead scanned as
+        below. Otherwise, if njobs > 1, the scans of
+        up to njobs rotors are run at once, each in its own process. The
+        scans of different rotors write to separate branches of the SCAN
+        filesystems, and a rotor with a scan point marked as RUNNING (e.g.,
+        by another MechDriver process) is left alone.
     """
 
     if tors_model != '1dhrfa':
@@ -47,7 +64,10 @@ def hindered_rotor_scans(
         zma, run_tors_names, tors_model)
 
     ioprinter.run_rotors(run_tors_names, const_names)
-    for tors_names, tors_grids in zip(run_tors_names, run_tors_grids):
+
+    def _scan_rotor(tors_names, tors_grids):
+        """ Run the scan of one rotor, followed by its backsteps
+        """
 
         ioprinter.info_message(
             f'Running Rotor: {"-".join(tors_names)}', newline=1)
@@ -56,6 +76,34 @@ def hindered_rotor_scans(
         constraint_dct = automol.zmat.constraint_dct(
             zma, const_names, tors_names)
         print('in hr', tors_names)
+        if njobs > 1 and scan.scan_is_running(
+                tors_names, tors_grids, scn_run_fs, scn_typ,
+                constraint_dct=constraint_dct):
+            ioprinter.info_message(
+                f'Rotor {tors_names} is currently running, skipping...')
+            return
+        if adapt_grid and len(tors_names) == 1 and (
+                len(automol.pot.coords(tors_grids)) >= scan.ADAPT_MIN_NPTS):
+            scan.execute_adaptive_scan(
+                zma=zma,
+                spc_info=spc_info,
+                mod_thy_info=mod_thy_info,
+                coord_names=tors_names,
+                coord_grids=tors_grids,
+                scn_run_fs=scn_run_fs,
+                scn_save_fs=scn_save_fs,
+                scn_typ=scn_typ,
+                script_str=script_str,
+                overwrite=overwrite,
+                zrxn=zrxn,
+                update_guess=update_guess,
+                backstep=backstep,
+                saddle=saddle,
+                constraint_dct=constraint_dct,
+                retryfail=retryfail,
+                **kwargs,
+            )
+            return
         scan.execute_scan(
             zma=zma,
             spc_info=spc_info,
@@ -94,6 +142,36 @@ def hindered_rotor_scans(
                 **kwargs,
             )
 
+    if njobs > 1 and scn_typ == 'rigid' and not adapt_grid:
+        # The points of rigid scans are independent, so run all of them
+        scans = tuple(
+            (tors_names, tors_grids,
+             automol.zmat.constraint_dct(zma, const_names, tors_names))
+            for tors_names, tors_grids in zip(run_tors_names, run_tors_grids))
+        scan.execute_rigid_scans(
+            zma, spc_info, mod_thy_info, scans,
+            scn_run_fs, scn_save_fs,
+            script_str, overwrite, njobs,
+            zrxn=zrxn, retryfail=retryfail,
+            **kwargs)
+    elif njobs > 1 and len(run_tors_names) > 1:
+        ioprinter.info_message(
+            f'Running the scans of {len(run_tors_names)} rotors '
+            f'with up to {njobs} rotors at once...', newline=1)
+        exit_codes = run_in_budget(
+            _scan_rotor, tuple(zip(run_tors_names, run_tors_grids)),
+            ((1, 0.0),)*len(run_tors_names), njobs, stop_on_fail=True)
+        failed = tuple(
+            ','.join(tors_names)
+            for tors_names, code in zip(run_tors_names, exit_codes)
+            if code not in (0, None))
+        if failed:
+            raise RuntimeError(
+                f'Scans failed for rotors {"; ".join(failed)}')
+    else:
+        for tors_names, tors_grids in zip(run_tors_names, run_tors_grids):
+            _scan_rotor(tors_names, tors_grids)
+
 
 def check_hr_pot(tors_pots, tors_zmas, tors_paths, emax=-0.5, emin=-10.0):
     """ Check hr pot to see if a new mimnimum is needed
@@ -111,6 +189,9 @@ def check_hr_pot(tors_pots, tors_zmas, tors_paths, emax=-0.5, emin=-10.0):
         zmas = tors_zmas[name].values()
         paths = tors_paths[name].values()
         for pot, zma, path in zip(pots, zmas, paths):
+            # Skip points that failed or that an adaptive scan never ran
+            if pot is None or zma is None:
+                continue
             if emin < pot < emax:
                 if pot < new_emin:
                     new_min_zma = zma
@@ -17,6 +17,8 @@ import autorun
 from phydat import phycon, symm
 from mechlib.amech_io import printer as ioprinter
 from mechlib.amech_io import job_path
+from mechlib.filesys import _parsed as parsed
+from mechlib.filesys import _tauarr as tauarr
 from mechroutines.es import runner as es_runner
 from mechroutines.es.runner._par import qchem_params
 from mechroutines.es._routines.conformer import save_conformer
@@ -111,7 +113,7 @@ def run_energy(zma, geo, spc_info, thy_info,
             inf_obj, inp_str, out_str = ret
 
             ioprinter.info_message(" - Reading energy from output...")
-            ene = elstruct.reader.energy(inf_obj.prog, inf_obj.method, out_str)
+            ene = parsed.energy(inf_obj.prog, inf_obj.method, out_str)
 
             ioprinter.energy(ene)
             sp_save_fs[-1].create(thy_info[1:4])
@@ -190,7 +192,7 @@ def run_gradient(zma, geo, spc_info, thy_info,
                 else:
                     ioprinter.info_message(
                         " - Reading gradient from output...")
-                    grad = elstruct.reader.gradient(inf_obj.prog, out_str)
+                    grad = parsed.gradient(inf_obj.prog, out_str)
 
                     ioprinter.info_message(" - Saving gradient...")
                     if _json_database(geo_save_path):
@@ -198,6 +200,7 @@ def run_gradient(zma, geo, spc_info, thy_info,
                         geo_save_fs[-1].json.gradient_input.write(
                             inp_str, locs)
                         geo_save_fs[-1].json.gradient.write(grad, locs)
+                        tauarr.append(geo_save_fs, (locs,), {'grad': (grad,)})
                     else:
                         geo_save_fs[-1].file.gradient_info.write(inf_obj, locs)
                         geo_save_fs[-1].file.gradient_input.write(
@@ -248,7 +251,7 @@ def rerun_hessian_and_opt(
 
         if success:
             inf_obj, _, out_str = ret
-            tight_geo = elstruct.reader.opt_geometry(inf_obj.prog, out_str)
+            tight_geo = parsed.opt_geometry(inf_obj.prog, out_str)
             save_conformer(
                 ret, geo_run_fs, geo_save_fs, locs,
                 thy_info,  orig_ich=spc_info[0],
@@ -343,7 +346,7 @@ def run_hessian(zma, geo, spc_info, thy_info,
 
                 # If requested, determine if there are too many frequencies
                 if correct_vals:
-                    hfrqs = elstruct.reader.harmonic_frequencies(
+                    hfrqs = parsed.harmonic_frequencies(
                         inf_obj.prog, out_str)
                     imags = tuple(x for x in hfrqs if x < 0.0)
                     nimags = len(imags)
@@ -356,7 +359,7 @@ def run_hessian(zma, geo, spc_info, thy_info,
                 # If requested, determine if there are frequencies below thrsh
                 correct_low_vals = False
                 if correct_low_vals:
-                    hfrqs = elstruct.reader.harmonic_frequencies(
+                    hfrqs = parsed.harmonic_frequencies(
                         inf_obj.prog, out_str)
                     reals = tuple(x for x in hfrqs if x > 0.0)
                     has_low_freqs = any(x for x in reals if x < 30.0)
@@ -399,7 +402,7 @@ def run_hessian(zma, geo, spc_info, thy_info,
                         imag_success = True
 
                     if imag_success:
-                        hess = elstruct.reader.hessian(inf_obj.prog, out_str)
+                        hess = parsed.hessian(inf_obj.prog, out_str)
 
                         ioprinter.info_message(" - Saving Hessian...")
                         if _json_database(geo_save_path):
@@ -409,6 +412,8 @@ def run_hessian(zma, geo, spc_info, thy_info,
                                 inp_str, locs)
                             geo_save_fs[-1].json.hessian.write(
                                 hess, locs)
+                            tauarr.append(
+                                geo_save_fs, (locs,), {'hess': (hess,)})
                         else:
                             geo_save_fs[-1].file.hessian_info.write(
                                 inf_obj, locs)
@@ -695,13 +700,14 @@ def _hess_grad(prog, out_str, geo_save_fs,
         # Read the Gradient from the electronic structure output
         ioprinter.info_message(
             " - Attempting to read gradient from Hessian from output...")
-        grad = elstruct.reader.gradient(prog, out_str)
+        grad = parsed.gradient(prog, out_str)
 
         if grad is not None:
 
             # Calculate and save the harmonic frequencies
             if _json_database(save_path):
                 geo_save_fs[-1].json.gradient.write(grad, locs)
+                tauarr.append(geo_save_fs, (locs,), {'grad': (grad,)})
             else:
                 geo_save_fs[-1].file.gradient.write(grad, locs)
             ioprinter.save_gradient(save_path)
@@ -7,9 +7,11 @@ import elstruct
 import autofile
 from phydat import phycon
 from mechlib import filesys
+from mechlib.filesys import _tauarr as tauarr
 from mechlib.amech_io.printer import reading, info_message
 from mechlib.amech_io.printer import debug_message, warning_message
 from mechlib.amech_io.printer import save_geo, save_energy
+from mechlib.filesys import _parsed as parsed
 from mechroutines.es import runner as es_runner
 from mechroutines.es._routines import _util as util
 
@@ -184,6 +186,7 @@ def save_tau(tau_run_fs, tau_save_fs, mod_thy_info, db_style='directory'):
         if db_style == 'jsondb':
             save_info = [[], [], [], [], []]
             sp_save_info = [[], [], [], [], []]
+        arr_info = [[], [], []]
         for locs in tau_run_fs[-1].existing():
             run_path = tau_run_fs[-1].path(locs)
             run_fs = autofile.fs.run(run_path)
@@ -197,9 +200,9 @@ def save_tau(tau_run_fs, tau_save_fs, mod_thy_info, db_style='directory'):
                 inf_obj, inp_str, out_str = ret
                 prog = inf_obj.prog
                 method = inf_obj.method
-                ene = elstruct.reader.energy(prog, method, out_str)
+                ene = parsed.energy(prog, method, out_str)
 
-                geo = elstruct.reader.opt_geometry(prog, out_str)
+                geo = parsed.opt_geometry(prog, out_str)
                 if db_style == 'directory':
                     save_geo(save_path)
                     tau_save_fs[-1].create(locs)
@@ -237,6 +240,9 @@ def save_tau(tau_run_fs, tau_save_fs, mod_thy_info, db_style='directory'):
                     sp_save_fs[-1].json.energy.write(ene, mod_thy_info[1:4])
 
                 saved_geos.append(geo)
+                arr_info[0].append(locs)
+                arr_info[1].append(ene)
+                arr_info[2].append(geo)
 
         print('\nWriting the geometries and energies into JSON file...')
         if db_style == 'jsondb':
@@ -258,6 +264,11 @@ def save_tau(tau_run_fs, tau_save_fs, mod_thy_info, db_style='directory'):
                 sp_save_fs_i[-1].json.energy.write(
                     sp_save_info[4][i], sp_save_info[1][i])
 
+        # Append the saved samples to the columnar store, replacing the
+        # values of samples saved again at the same locators
+        tauarr.append(tau_save_fs, arr_info[0],
+                      {'ene': arr_info[1], 'geo': arr_info[2]})
+
         # update the tau trajectory file
         filesys.mincnf.traj_sort(tau_save_fs, mod_thy_info)
 
@@ -267,28 +278,27 @@ def assess_pf_convergence(tau_save_fs, ref_ene,
     """ Determine how much the partition function has converged
     """
 
-    # Calculate sigma values at various temperatures for the PF
-    for temp in temps:
-        sumq = 0.
-        sum2 = 0.
-        idx = 0
-        debug_message('integral convergence for T = ', temp)
-        inf_obj_s = tau_save_fs[0].file.info.read()
-        nsamp = inf_obj_s.nsamp
-        saved_locs = tau_save_fs[-1].json_existing()
-        ratio = len(saved_locs) / float(nsamp)
-        for locs in saved_locs:
-            idx += 1
-            ene = tau_save_fs[-1].json.energy.read(locs)
-            ene = (ene - ref_ene) * phycon.EH2KCAL
-            tmp = numpy.exp(-ene*349.7/(0.695*temp))
-            sumq = sumq + tmp
-            sum2 = sum2 + tmp**2
-            sigma = numpy.sqrt(
-                (abs(sum2/float(idx)-(sumq/float(idx))**2))/float(idx))
+    inf_obj_s = tau_save_fs[0].file.info.read()
+    nsamp = inf_obj_s.nsamp
+    saved_locs = tau_save_fs[-1].json_existing()
+    ratio = len(saved_locs) / float(nsamp)
+
+    # Calculate sigma values at all temperatures for the PF at once, with
+    # running sums over the samples (rows: temperature, cols: sample)
+    enes = tauarr.sample_arrays(tau_save_fs, saved_locs, ('ene',))['ene']
+    enes = (enes - ref_ene) * phycon.EH2KCAL
+    tmp = numpy.exp(-numpy.outer(1.0/(0.695*numpy.array(temps)), enes*349.7))
+    idxs = numpy.arange(1, len(enes)+1, dtype=float)
+    sumq = numpy.cumsum(tmp, axis=1)
+    sum2 = numpy.cumsum(tmp**2, axis=1)
+    sigma = numpy.sqrt(numpy.abs(sum2/idxs - (sumq/idxs)**2)/idxs)
+    if len(enes) > 0:
+        for tidx, temp in enumerate(temps):
+            debug_message('integral convergence for T = ', temp)
             debug_message(
-                sumq/float(idx), sigma, 100.*sigma*float(idx)/sumq, idx)
-        info_message('Ratio of good to sampled geometries: ', ratio)
+                sumq[tidx, -1]/idxs[-1], sigma[tidx, -1],
+                100.*sigma[tidx, -1]*idxs[-1]/sumq[tidx, -1], len(enes))
+    info_message('Ratio of good to sampled geometries: ', ratio)
 
 
 def _check_vma(zma, tau_save_fs):
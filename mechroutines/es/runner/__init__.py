@@ -10,6 +10,8 @@ from mechroutines.es.runner._run import run_job
 from mechroutines.es.runner._run import read_job
 from mechroutines.es.runner._opt import multi_stage_optimization
 from mechroutines.es.runner._par import qchem_params
+from mechroutines.es.runner._par import job_resources
+from mechroutines.es.runner._pool import run_in_budget
 from mechroutines.es.runner._wfn import multireference_calculation_parameters
 from mechroutines.es.runner import scan
 
@@ -20,6 +22,8 @@ __all__ = [
     'read_job',
     'multi_stage_optimization',
     'qchem_params',
+    'job_resources',
+    'run_in_budget',
     'multireference_calculation_parameters',
     'scan'
 ]
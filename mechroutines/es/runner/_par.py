@@ -40,6 +40,25 @@ def qchem_params(method_dct, job=None, geo=None, spc_info=None):
     return ret
 
 
+def job_resources(method_dct):
+    """ Determine the number of processors and the memory (in GB) that
+        a single job run with the method will request, using the same
+        defaults used to build the job parameters for each program.
+
+        :param method_dct:
+        :type method_dct: dict[str: obj]
+        :rtype: (int, float)
+    """
+
+    prog = method_dct.get('program', None)
+    if prog in RESOURCE_FXN_DCT:
+        nprocs, memory = RESOURCE_FXN_DCT[prog](method_dct)
+    else:
+        nprocs, memory = _resources(method_dct, 1, 0.0)
+
+    return nprocs, memory
+
+
 def _gaussian(method_dct, prog, job=None, geo=None, spc_info=None):
     """ Build kwargs dictionary and BASH submission script for Gaussian jobs.
 
@@ -53,10 +72,7 @@ def _gaussian(method_dct, prog, job=None, geo=None, spc_info=None):
     _, _ = geo, spc_info
 
     # Set the options
-    nprocs = method_dct.get('nprocs', 9)
-    memory = method_dct.get('mem', 20)
-    nprocs = nprocs if nprocs is not None else 9
-    memory = memory if memory is not None else 20
+    nprocs, memory = _gaussian_resources(method_dct)
 
     method = method_dct.get('method')
 
@@ -141,24 +157,11 @@ def _molpro(method_dct, prog, job=None, geo=None, spc_info=None):
 
     # Pull stuff from the method_dct
     method = method_dct.get('method')
-    if method in ('caspt2', 'caspt2c', 'caspt2i'):
-        nprocs = method_dct.get('nprocs', 4)
-        memory = method_dct.get('mem', 20)
-        econv = method_dct.get('econv', 1.0e-6)
-        gconv = method_dct.get('gconv', 3.0e-4)
-        nprocs = nprocs if nprocs is not None else 4
-        memory = memory if memory is not None else 10
-        econv = econv if econv is not None else 1.0e-6
-        gconv = gconv if gconv is not None else 3.0e-4
-    else:
-        nprocs = method_dct.get('nprocs', 4)
-        memory = method_dct.get('mem', 20)
-        econv = method_dct.get('econv', 1.0e-6)
-        gconv = method_dct.get('gconv', 3.0e-4)
-        nprocs = nprocs if nprocs is not None else 4
-        memory = memory if memory is not None else 20
-        econv = econv if econv is not None else 1.0e-6
-        gconv = gconv if gconv is not None else 3.0e-4
+    nprocs, memory = _molpro_resources(method_dct)
+    econv = method_dct.get('econv', 1.0e-6)
+    gconv = method_dct.get('gconv', 3.0e-4)
+    econv = econv if econv is not None else 1.0e-6
+    gconv = gconv if gconv is not None else 3.0e-4
 
     scf_econv_line = f'energy={econv:.1E}'.replace('E', 'd')
     corr_econv_line = f'energy={econv:.1E}'.replace('E', 'd')
@@ -252,10 +255,7 @@ def _psi4(method_dct, prog, job=None, geo=None, spc_info=None):
 
     # Job unneeded for now
     method = method_dct.get('method')
-    nprocs = method_dct.get('nprocs', 8)
-    memory = method_dct.get('mem', 10)
-    nprocs = nprocs if nprocs is not None else 8
-    memory = memory if memory is not None else 10
+    _, memory = _psi4_resources(method_dct)
 
     # Build the submission script string
     script_str = SCRIPT_DCT[prog]
@@ -305,10 +305,7 @@ def _qchem(method_dct, prog, job=None, geo=None, spc_info=None):
     _, _ = geo, spc_info
 
     # Set the options
-    nprocs = method_dct.get('nprocs', 8)
-    memory = method_dct.get('mem', 20)
-    nprocs = nprocs if nprocs is not None else 8
-    memory = memory if memory is not None else 20
+    nprocs, memory = _qchem_resources(method_dct)
 
     method = method_dct.get('method')
 
@@ -322,6 +319,47 @@ def _qchem(method_dct, prog, job=None, geo=None, spc_info=None):
     return script_str, kwargs
 
 
+def _gaussian_resources(method_dct):
+    """ Number of processors and memory of Gaussian jobs
+    """
+    return _resources(method_dct, 9, 20)
+
+
+def _molpro_resources(method_dct):
+    """ Number of processors and memory of Molpro jobs
+    """
+    if method_dct.get('method') in ('caspt2', 'caspt2c', 'caspt2i'):
+        nprocs, memory = _resources(method_dct, 4, 10)
+        if 'mem' not in method_dct:
+            memory = 20
+    else:
+        nprocs, memory = _resources(method_dct, 4, 20)
+    return nprocs, memory
+
+
+def _psi4_resources(method_dct):
+    """ Number of processors and memory of Psi4 jobs
+    """
+    return _resources(method_dct, 8, 10)
+
+
+def _qchem_resources(method_dct):
+    """ Number of processors and memory of QChem jobs
+    """
+    return _resources(method_dct, 8, 20)
+
+
+def _resources(method_dct, nprocs, memory):
+    """ Number of processors and memory set in the method, or the given
+        defaults if they are not set
+    """
+    if method_dct.get('nprocs') is not None:
+        nprocs = method_dct['nprocs']
+    if method_dct.get('mem') is not None:
+        memory = method_dct['mem']
+    return nprocs, memory
+
+
 INI_PARAM_BUILD_DCT = {
     elstruct.par.Program.GAUSSIAN09: _gaussian,
     elstruct.par.Program.GAUSSIAN16: _gaussian,
@@ -330,3 +368,13 @@ INI_PARAM_BUILD_DCT = {
     elstruct.par.Program.PSI4: _psi4,
     elstruct.par.Program.QCHEM5: _qchem,
 }
+
+# Number of processors and memory requested by the jobs of each program
+RESOURCE_FXN_DCT = {
+    elstruct.par.Program.GAUSSIAN09: _gaussian_resources,
+    elstruct.par.Program.GAUSSIAN16: _gaussian_resources,
+    elstruct.par.Program.MOLPRO2021: _molpro_resources,
+    elstruct.par.Program.MOLPRO2015: _molpro_resources,
+    elstruct.par.Program.PSI4: _psi4_resources,
+    elstruct.par.Program.QCHEM5: _qchem_resources,
+}
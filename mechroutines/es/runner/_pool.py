@@ -0,0 +1,82 @@
+""" Launch independent pieces of electronic structure work concurrently
+    while keeping the processors and memory requested by the running
+    jobs within a budget for the node.
+
+    Each piece of work is run in its own (forked) process, since the
+    job runners change into the run directories of the jobs. All results
+    are communicated through the run and save filesystems.
+"""
+
+import multiprocessing
+from multiprocessing.connection import wait
+from mechlib.amech_io import printer as ioprinter
+
+
+def run_in_budget(fxn, args_lst, costs, ncores, mem=None, callback=None,
+                  stop_on_fail=False):
+    """ Call fxn(*args) for each set of args in a separate process.
+        Processes are launched in the order of args_lst as soon as the
+        summed (nprocs, memory) costs of the running processes leave
+        room for the next one. Work that requests more than the entire
+        budget is run by itself. If stop_on_fail is set, no further calls
+        are launched once a call fails, though the running ones are
+        allowed to finish; the calls never launched have no exit code.
+
+        :param fxn: function to call
+        :type fxn: function
+        :param args_lst: arguments for each call of the function
+        :type args_lst: tuple(tuple(obj))
+        :param costs: (nprocs, memory) requested by each call
+        :type costs: tuple((int, float))
+        :param ncores: number of processors available for all calls
+        :type ncores: int
+        :param mem: memory available for all calls, no limit if None
+        :type mem: float
+        :param callback: function called in this process with the index
+            and exit code of each call as soon as the call finishes
+        :type callback: function
+        :param stop_on_fail: stop launching calls once a call fails
+        :type stop_on_fail: bool
+        :rtype: tuple(int): exit codes of each process (None if not run)
+    """
+
+    waiting = list(enumerate(zip(args_lst, costs)))
+    running = {}
+    exit_codes = [None] * len(waiting)
+    used_procs, used_mem = 0, 0.0
+    while waiting or running:
+
+        # Launch as many of the waiting calls as the budget allows
+        while waiting:
+            idx, (args, (nprocs, job_mem)) = waiting[0]
+            fits = used_procs + nprocs <= ncores
+            if mem is not None:
+                fits = fits and used_mem + job_mem <= mem
+            if not fits and running:
+                break
+            waiting.pop(0)
+            proc = multiprocessing.Process(target=fxn, args=args)
+            proc.start()
+            running[proc.sentinel] = (idx, proc, nprocs, job_mem)
+            used_procs += nprocs
+            used_mem += job_mem
+
+        # Wait for at least one call to finish to free up its resources
+        for sentinel in wait(tuple(running)):
+            idx, proc, nprocs, job_mem = running.pop(sentinel)
+            proc.join()
+            exit_codes[idx] = proc.exitcode
+            used_procs -= nprocs
+            used_mem -= job_mem
+            if proc.exitcode != 0:
+                ioprinter.warning_message(
+                    f'Concurrent job {idx+1}/{len(exit_codes)} exited '
+                    f'with code {proc.exitcode}')
+                if stop_on_fail and waiting:
+                    ioprinter.warning_message(
+                        f'Not launching the {len(waiting)} remaining jobs')
+                    waiting = []
+            if callback is not None:
+                callback(idx, proc.exitcode)
+
+    return tuple(exit_codes)
@@ -5,6 +5,7 @@ import functools
 import elstruct
 import autofile
 import automol
+from mechlib.filesys import _parsed as parsed
 from . import _seq as optseq
 
 
@@ -178,7 +179,8 @@ def run_job(job, script_str, run_fs,
 
         inf_obj.utc_end_time = autofile.schema.utc_time()
         prog = inf_obj.prog
-        if is_successful_output(out_str, job, prog):
+        success = bool(is_successful_output(out_str, job, prog))
+        if success:
             run_fs[-1].file.output.write(out_str, [job])
             print(" - Run succeeded.")
             status = autofile.schema.RunStatus.SUCCESS
@@ -195,6 +197,10 @@ def run_job(job, script_str, run_fs,
         run_fs[-1].file.info.write(inf_obj, [job])
         run_fs[-1].file.input.write(inp_str, [job])
 
+        # Store the values read from the output, so it is only parsed once
+        parsed.write(run_fs, job, prog, inf_obj.method, out_str, success,
+                     version=version)
+
 
 def read_job(job, run_fs):
     """ Searches for an output file for the specified electronic
@@ -220,7 +226,15 @@ def read_job(job, run_fs):
         prog = inf_obj.prog
         ret = (inf_obj, inp_str, out_str)
 
-        success = bool(is_successful_output(out_str, job, prog))
+        # Use the values parsed when the job finished, if stored for this
+        # output; otherwise parse them now so they are for the next read
+        vals = parsed.read(run_fs, job, out_str)
+        if vals is not None and 'success' in vals:
+            success = vals['success']
+        else:
+            success = bool(is_successful_output(out_str, job, prog))
+            parsed.write(run_fs, job, prog, inf_obj.method, out_str,
+                         success, version=inf_obj.version)
         if success:
             print(" - Reading successful output...")
     else:
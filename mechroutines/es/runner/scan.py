@@ -3,6 +3,7 @@
     SCAN or CSAN layers of the save filesystem.
 """
 
+import functools
 import numpy
 
 import automol
@@ -13,6 +14,19 @@ from mechlib import filesys
 from mechlib.amech_io import printer as ioprinter
 from mechroutines.es.runner._run import execute_job
 from mechroutines.es.runner._run import read_job
+from mechroutines.es.runner._pool import run_in_budget
+
+
+# Thresholds (kcal/mol) for running a point of an adaptive scan rather than
+# interpolating it from the coarse grid: the spread of spline predictions
+# and the second difference of the coarse energies around the point
+ADAPT_FIT_THRESH = 0.2
+ADAPT_CURV_THRESH = 2.0
+# Smallest number of grid points for which a scan is run adaptively
+ADAPT_MIN_NPTS = 8
+# Drop in energy (kcal/mol) past the maximum of a streaming scan at which
+# the scan is stopped
+STREAM_STOP_MARGIN = 2.0
 
 
 def execute_scan(zma, spc_info, mod_thy_info,
@@ -58,6 +72,333 @@ def execute_scan(zma, spc_info, mod_thy_info,
             mod_thy_info=mod_thy_info)
 
 
+def execute_adaptive_scan(zma, spc_info, mod_thy_info,
+                          coord_names, coord_grids,
+                          scn_run_fs, scn_save_fs, scn_typ,
+                          script_str, overwrite,
+                          zrxn=None,
+                          update_guess=True, backstep=True,
+                          saddle=False,
+                          constraint_dct=None, retryfail=True,
+                          fit_thresh=ADAPT_FIT_THRESH,
+                          curv_thresh=ADAPT_CURV_THRESH,
+                          **kwargs):
+    """ Run a 1-D scan adaptively: every other point of the grid is run
+        first, then the points in between are only run where the coarse
+        potential is not smooth enough to interpolate them. The other
+        points are recorded in the scan branch as interpolated, and are
+        filled in from a spline when the potential is read.
+
+        A point in between is run if a periodic cubic and an Akima spline
+        through the coarse points disagree on its energy by more than
+        fit_thresh (kcal/mol), if the second difference of the coarse
+        energies around it exceeds curv_thresh (kcal/mol), if it may be
+        a new minimum, or if one of its neighbors is missing.
+
+        Rather than a full reverse sweep, back steps are only taken around
+        a point the spline check of the final potential suspects of
+        hysteresis.
+    """
+
+    if constraint_dct is None:
+        coord_locs = coord_names
+    else:
+        coord_locs = constraint_dct
+
+    fine_vals = automol.pot.coords(coord_grids)
+    npts = len(fine_vals)
+    cand_idxs = tuple(range(1, npts, 2))
+
+    # Assess if the scan was already run adaptively
+    interp_vals = filesys.read.interpolated_scan_points(
+        scn_save_fs, coord_locs)
+    if interp_vals is not None and not overwrite:
+        run_vals = tuple(vals[0] for vals in fine_vals
+                         if not numpy.any(numpy.isclose(
+                             vals[0], interp_vals, atol=1.0e-4)))
+        if _scan_finished(coord_names, (run_vals,), scn_save_fs,
+                          constraint_dct=constraint_dct):
+            return
+
+    scn_save_fs[1].create([coord_locs])
+    inf_obj = autofile.schema.info_objects.scan_branch(
+        dict(zip(coord_names, coord_grids)))
+    scn_save_fs[1].file.info.write(inf_obj, [coord_locs])
+
+    scn_kwargs = {
+        'spc_info': spc_info, 'mod_thy_info': mod_thy_info,
+        'coord_names': coord_names,
+        'scn_run_fs': scn_run_fs, 'scn_save_fs': scn_save_fs,
+        'scn_typ': scn_typ, 'script_str': script_str,
+        'overwrite': overwrite, 'zrxn': zrxn, 'retryfail': retryfail,
+        'saddle': saddle, 'constraint_dct': constraint_dct}
+    save_kwargs = {
+        'scn_run_fs': scn_run_fs, 'scn_save_fs': scn_save_fs,
+        'scn_typ': scn_typ, 'coord_names': coord_names,
+        'constraint_dct': constraint_dct, 'mod_thy_info': mod_thy_info}
+
+    # Run the coarse grid
+    ioprinter.info_message(
+        f'Running {npts-len(cand_idxs)}/{npts} points of the adaptive scan '
+        'on the coarse grid...')
+    _run_scan(guess_zma=zma, grid_vals=fine_vals[::2],
+              update_guess=update_guess, **scn_kwargs, **kwargs)
+    save_scan(**save_kwargs)
+
+    # Refine the points that cannot be interpolated from the coarse grid
+    enes = _scan_energies(
+        fine_vals, coord_names, constraint_dct, scn_save_fs, mod_thy_info)
+    refine_idxs = _adaptive_refine_points(
+        fine_vals, enes, cand_idxs, fit_thresh, curv_thresh)
+    ioprinter.info_message(
+        f'Refining the adaptive scan at {len(refine_idxs)}/{len(cand_idxs)} '
+        'points between the coarse grid points...')
+    for idx in refine_idxs:
+        _run_scan(
+            guess_zma=_scan_point_zma(
+                zma, fine_vals, enes, idx, coord_names, constraint_dct,
+                scn_save_fs),
+            grid_vals=(fine_vals[idx],), update_guess=False,
+            **scn_kwargs, **kwargs)
+    if refine_idxs:
+        save_scan(**save_kwargs)
+
+    # Take back steps around a point suspected of hysteresis
+    if backstep:
+        enes = _scan_energies(
+            fine_vals, coord_names, constraint_dct, scn_save_fs,
+            mod_thy_info)
+        known = numpy.flatnonzero(~numpy.isnan(enes))
+        if len(known) > 3:
+            conv_pot = {
+                (fine_vals[idx][0] * phycon.RAD2DEG,): enes[idx] - enes[0]
+                for idx in known}
+            bad_angle = filesys.read.identify_bad_point(
+                conv_pot, thresh=0.018)
+            if bad_angle is not None:
+                print('Akima spline identified potential hysteresis at ',
+                      bad_angle*phycon.DEG2RAD)
+                bad_idx = known[numpy.argmin(numpy.abs(numpy.mod(
+                    numpy.array([fine_vals[idx][0] for idx in known]) -
+                    bad_angle*phycon.DEG2RAD + numpy.pi, 2*numpy.pi) -
+                    numpy.pi))]
+                _adaptive_backsteps(
+                    zma, fine_vals, known, bad_idx,
+                    scn_kwargs, kwargs)
+                save_scan(**save_kwargs)
+
+    # Record the points left to be interpolated
+    enes = _scan_energies(
+        fine_vals, coord_names, constraint_dct, scn_save_fs, mod_thy_info)
+    interp_vals = tuple(fine_vals[idx][0] for idx in cand_idxs
+                        if idx not in refine_idxs and numpy.isnan(enes[idx]))
+    filesys.save.interpolated_scan_points(
+        scn_save_fs, coord_locs, interp_vals)
+    ioprinter.info_message(
+        f'Adaptive scan ran {npts-len(interp_vals)}/{npts} points, '
+        f'{len(interp_vals)} are interpolated')
+
+
+def execute_streaming_scan(zma, spc_info, mod_thy_info,
+                           coord_names, coord_grids,
+                           scn_run_fs, scn_save_fs, scn_typ,
+                           script_str, overwrite,
+                           zrxn=None,
+                           update_guess=True,
+                           saddle=False,
+                           constraint_dct=None, retryfail=True,
+                           stop_margin=STREAM_STOP_MARGIN,
+                           **kwargs):
+    """ Run a 1-D scan one point at a time, in grid order, assessing the
+        energy profile after each point. The scan stops once it has passed
+        a maximum: the highest energy of the points run so far lies above
+        that of the first point and more than stop_margin (kcal/mol) above
+        that of the latest point.
+
+        Points already saved are read rather than run again, so a scan
+        that was stopped is not extended when it is requested again. The
+        points past the one the scan stopped at are not run. Each point is
+        saved once its job has finished, and the trajectory file is
+        written from all of the saved points once the scan is done.
+    """
+
+    if _scan_finished(coord_names, coord_grids, scn_save_fs,
+                      constraint_dct=constraint_dct, overwrite=overwrite):
+        return
+
+    if constraint_dct is None:
+        coord_locs = coord_names
+    else:
+        coord_locs = constraint_dct
+    scn_save_fs[1].create([coord_locs])
+    inf_obj = autofile.schema.info_objects.scan_branch(
+        dict(zip(coord_names, coord_grids)))
+    scn_save_fs[1].file.info.write(inf_obj, [coord_locs])
+
+    scn_kwargs = {
+        'spc_info': spc_info, 'mod_thy_info': mod_thy_info,
+        'coord_names': coord_names,
+        'scn_run_fs': scn_run_fs, 'scn_save_fs': scn_save_fs,
+        'scn_typ': scn_typ, 'script_str': script_str,
+        'overwrite': overwrite, 'zrxn': zrxn, 'retryfail': retryfail,
+        'saddle': saddle, 'constraint_dct': constraint_dct}
+    job = _set_job(scn_typ)
+
+    grid_vals = automol.pot.coords(coord_grids)
+    npts = len(grid_vals)
+    enes = numpy.full(npts, numpy.nan)
+    guess_zma = zma
+    for idx, vals in enumerate(grid_vals):
+
+        locs = [coord_names, vals]
+        if constraint_dct is not None:
+            locs = [constraint_dct] + locs
+
+        # Run and save the point, unless it was saved by an earlier scan
+        if overwrite or not scn_save_fs[-1].file.zmatrix.exists(locs):
+            _run_scan(guess_zma=guess_zma, grid_vals=(vals,),
+                      update_guess=False, **scn_kwargs, **kwargs)
+            run_fs = autofile.fs.run(scn_run_fs[-1].path(locs))
+            success, ret = read_job(job, run_fs)
+            if success:
+                init_zma = automol.zmat.set_values_by_name(
+                    guess_zma, dict(zip(coord_names, vals)),
+                    angstrom=False, degree=False)
+                filesys.save.scan_point_structure(
+                    ret, scn_save_fs, locs, mod_thy_info[1:], job,
+                    init_zma=init_zma, init_geo=None)
+
+        # Read the energy of the point and its structure for the next guess
+        sp_save_fs = autofile.fs.single_point(scn_save_fs[-1].path(locs))
+        if sp_save_fs[-1].file.energy.exists(mod_thy_info[1:4]):
+            ene = sp_save_fs[-1].file.energy.read(mod_thy_info[1:4])
+            enes[idx] = ene * phycon.EH2KCAL
+            if update_guess and scn_save_fs[-1].file.zmatrix.exists(locs):
+                guess_zma = scn_save_fs[-1].file.zmatrix.read(locs)
+
+        if _passed_maximum(enes[:idx+1], stop_margin):
+            ioprinter.info_message(
+                f'Energy at point {idx+1}/{npts} of the scan lies more than '
+                f'{stop_margin:.2f} kcal/mol below the maximum, '
+                'stopping the scan')
+            break
+
+    write_scan_traj(scn_save_fs, coord_names, constraint_dct, mod_thy_info)
+
+
+def execute_rigid_scans(zma, spc_info, mod_thy_info, scans,
+                        scn_run_fs, scn_save_fs,
+                        script_str, overwrite, njobs,
+                        zrxn=None, retryfail=True,
+                        **kwargs):
+    """ Run the energies at all points of several rigid scans at once.
+        None of the points of a rigid scan depend on each other, so the
+        points of all scans are run concurrently, up to njobs at a time.
+        Each point is saved as soon as its job finishes, and the
+        trajectory files are written once all of the jobs have finished.
+
+        A scan with a point marked as RUNNING (e.g., by another MechDriver
+        process) is left alone.
+
+        :param scans: (coord_names, coord_grids, constraint_dct) of each
+            scan to run
+        :type scans: tuple(tuple(tuple(str), tuple(tuple(float)), dict))
+        :param njobs: number of energy jobs to run at once
+        :type njobs: int
+    """
+
+    job = _set_job('rigid')
+
+    # Set the points of all scans that still have to be run
+    pts, run_scn_idxs = [], []
+    for scn_idx, (coord_names, coord_grids, constraint_dct) in enumerate(
+            scans):
+        if _scan_finished(coord_names, coord_grids, scn_save_fs,
+                          constraint_dct=constraint_dct, overwrite=overwrite):
+            continue
+        grid_vals = automol.pot.coords(coord_grids)
+        if _scan_is_running(
+                grid_vals, coord_names, constraint_dct, scn_run_fs, job):
+            ioprinter.info_message(
+                f'Scan of {coord_names} is currently running, skipping...')
+            continue
+
+        if constraint_dct is None:
+            coord_locs = coord_names
+        else:
+            coord_locs = constraint_dct
+        scn_save_fs[1].create([coord_locs])
+        inf_obj = autofile.schema.info_objects.scan_branch(
+            dict(zip(coord_names, coord_grids)))
+        scn_save_fs[1].file.info.write(inf_obj, [coord_locs])
+        run_scn_idxs.append(scn_idx)
+
+        for vals in grid_vals:
+            locs = [coord_names, vals]
+            if constraint_dct is not None:
+                locs = [constraint_dct] + locs
+            if scn_save_fs[-1].file.geometry.exists(locs) and not overwrite:
+                continue
+            scn_run_fs[-1].create(locs)
+            pt_zma = automol.zmat.set_values_by_name(
+                zma, dict(zip(coord_names, vals)),
+                angstrom=False, degree=False)
+            pts.append((locs, pt_zma))
+
+    ioprinter.info_message(
+        f'Running {len(pts)} points of {len(run_scn_idxs)} rigid scans '
+        f'with up to {njobs} jobs at once...', newline=1)
+
+    # Save each point as soon as its job finishes, in this process
+    run_in_budget(
+        _run_rigid_point,
+        tuple((scn_run_fs[-1].path(locs), pt_zma, job, script_str,
+               spc_info, mod_thy_info, zrxn, overwrite, retryfail, kwargs)
+              for locs, pt_zma in pts),
+        ((1, 0.0),)*len(pts), njobs,
+        callback=functools.partial(
+            _save_rigid_point, pts, job, scn_run_fs, scn_save_fs,
+            mod_thy_info))
+
+    # Build the trajectory files from all saved points of the scans
+    for scn_idx in run_scn_idxs:
+        coord_names, _, constraint_dct = scans[scn_idx]
+        write_scan_traj(scn_save_fs, coord_names, constraint_dct,
+                        mod_thy_info)
+
+
+def _save_rigid_point(pts, job, scn_run_fs, scn_save_fs, mod_thy_info,
+                      idx, _):
+    """ Read the energy job at a point of a rigid scan once its process
+        has finished and save the point
+    """
+    locs, pt_zma = pts[idx]
+    run_fs = autofile.fs.run(scn_run_fs[-1].path(locs))
+    success, ret = read_job(job, run_fs)
+    if success:
+        filesys.save.scan_point_structure(
+            ret, scn_save_fs, locs, mod_thy_info[1:], job,
+            init_zma=pt_zma, init_geo=None)
+
+
+def _run_rigid_point(run_path, pt_zma, job, script_str, spc_info,
+                     mod_thy_info, zrxn, overwrite, retryfail, kwargs):
+    """ Run the energy job at a point of a rigid scan
+    """
+    execute_job(
+        job=job,
+        script_str=script_str,
+        run_fs=autofile.fs.run(run_path),
+        geo=pt_zma,
+        spc_info=spc_info,
+        thy_info=mod_thy_info,
+        zrxn=zrxn,
+        overwrite=overwrite,
+        retryfail=retryfail,
+        **kwargs
+    )
+
+
 def run_scan(zma, spc_info, mod_thy_info,
              coord_names, coord_grids,
              scn_run_fs, scn_save_fs, scn_typ,
@@ -286,6 +627,143 @@ def run_backsteps(
             #     break
 
 
+def _scan_energies(grid_vals, coord_names, constraint_dct, scn_save_fs,
+                   mod_thy_info):
+    """ Read the energies (kcal/mol) saved at each point of a scan, taking
+        the lower of the point and its back step. Missing values are NaN.
+    """
+
+    enes = numpy.full(len(grid_vals), numpy.nan)
+    for idx, vals in enumerate(grid_vals):
+        for step in (0.0, 4*numpy.pi):
+            locs = [coord_names, tuple(val + step for val in vals)]
+            if constraint_dct is not None:
+                locs = [constraint_dct] + locs
+            sp_save_fs = autofile.fs.single_point(scn_save_fs[-1].path(locs))
+            if sp_save_fs[-1].file.energy.exists(mod_thy_info[1:4]):
+                ene = sp_save_fs[-1].file.energy.read(mod_thy_info[1:4])
+                enes[idx] = numpy.fmin(enes[idx], ene * phycon.EH2KCAL)
+
+    return enes
+
+
+def _passed_maximum(enes, stop_margin):
+    """ Assess if the energies (kcal/mol) along a scan, with NaN for the
+        points that failed, have passed a maximum by more than a margin
+    """
+
+    enes = enes[~numpy.isnan(enes)]
+    passed = False
+    if len(enes) > 2:
+        max_idx = int(numpy.argmax(enes))
+        passed = (0 < max_idx < len(enes) - 1 and
+                  enes[max_idx] - enes[-1] > stop_margin)
+
+    return passed
+
+
+def _adaptive_refine_points(grid_vals, enes, cand_idxs,
+                            fit_thresh, curv_thresh):
+    """ Select the points between the coarse points of an adaptive scan
+        whose energy cannot be reliably interpolated
+    """
+
+    npts = len(grid_vals)
+    angles = numpy.array([vals[0] for vals in grid_vals])
+    known = ~numpy.isnan(enes)
+    cand_idxs = [idx for idx in cand_idxs if not known[idx]]
+    if numpy.count_nonzero(known) < 4:
+        return tuple(cand_idxs)
+
+    period = filesys.read.grid_period(angles)
+    cub_enes, akima_enes = filesys.read.periodic_splines(
+        angles[known], enes[known], period, angles[cand_idxs])
+    min_ene = numpy.min(enes[known])
+
+    def _curvature(idx):
+        """ Second difference of the coarse energies around a point """
+        trip = enes[[(idx-2) % npts, idx, (idx+2) % npts]]
+        return abs(trip[0] - 2*trip[1] + trip[2])
+
+    refine_idxs = []
+    for cidx, idx in enumerate(cand_idxs):
+        nbr_idxs = ((idx-1) % npts, (idx+1) % npts)
+        if not all(known[nbr] for nbr in nbr_idxs):
+            refine_idxs.append(idx)
+        elif abs(cub_enes[cidx] - akima_enes[cidx]) > fit_thresh:
+            refine_idxs.append(idx)
+        elif min(cub_enes[cidx], akima_enes[cidx]) < min_ene - fit_thresh:
+            refine_idxs.append(idx)
+        elif any(_curvature(nbr) > curv_thresh for nbr in nbr_idxs):
+            refine_idxs.append(idx)
+
+    return tuple(refine_idxs)
+
+
+def _scan_point_zma(zma, grid_vals, enes, idx, coord_names, constraint_dct,
+                    scn_save_fs):
+    """ Get the Z-Matrix saved at the point before (or, failing that,
+        after) a point of a scan to use as the guess for the point
+    """
+
+    npts = len(grid_vals)
+    guess_zma = zma
+    for nbr in ((idx-1) % npts, (idx+1) % npts):
+        locs = [coord_names, grid_vals[nbr]]
+        if constraint_dct is not None:
+            locs = [constraint_dct] + locs
+        if (not numpy.isnan(enes[nbr]) and
+                scn_save_fs[-1].file.zmatrix.exists(locs)):
+            guess_zma = scn_save_fs[-1].file.zmatrix.read(locs)
+            break
+
+    return guess_zma
+
+
+def _adaptive_backsteps(zma, grid_vals, known, bad_idx, scn_kwargs, kwargs):
+    """ Take back steps at a point suspected of hysteresis and the run
+        point before it, sweeping in the reverse direction starting from
+        the structure of the run point after it
+    """
+
+    pos = int(numpy.flatnonzero(known == bad_idx)[0])
+    nknown = len(known)
+    guess_locs = [scn_kwargs['coord_names'],
+                  grid_vals[known[(pos+1) % nknown]]]
+    if scn_kwargs['constraint_dct'] is not None:
+        guess_locs = [scn_kwargs['constraint_dct']] + guess_locs
+    scn_save_fs = scn_kwargs['scn_save_fs']
+    if scn_save_fs[-1].file.zmatrix.exists(guess_locs):
+        zma = scn_save_fs[-1].file.zmatrix.read(guess_locs)
+
+    back_vals = tuple(
+        tuple(val + 4*numpy.pi for val in grid_vals[known[pos+step]])
+        for step in (0, -1))
+    ioprinter.info_message(
+        'Taking back steps around the suspected point at ',
+        grid_vals[bad_idx])
+    _run_scan(guess_zma=zma, grid_vals=back_vals, update_guess=True,
+              **scn_kwargs, **kwargs)
+
+
+def scan_is_running(coord_names, coord_grids, scn_run_fs, scn_typ,
+                    constraint_dct=None):
+    """ Assess if any point of a scan is currently being run, as marked
+        by the RUNNING status of its job in the run filesystem.
+
+        :param coord_names: names of the scan coordinates in the Z-Matrix
+        :type coord_names: tuple(str)
+        :param coord_grids: values of the coordinates along the scan
+        :type coord_grids: tuple(tuple(float))
+        :param scn_typ: label for scan type ('relaxed' or 'rigid')
+        :type scn_typ: str
+        :rtype: bool
+    """
+    return _scan_is_running(
+        automol.pot.coords(coord_grids), coord_names, constraint_dct,
+        scn_run_fs, _set_job(scn_typ))
+
+
 def _scan_is_running(grid_vals, coord_names, constraint_dct, scn_run_fs, job):
     """ Is the rotor you requested currently being progressed on?
     """
@@ -611,6 +1089,35 @@ def write_traj(ini_locs, scn_save_fs, mod_thy_info, locs_lst):
     scn_save_fs[1].file.trajectory.write(traj, [ini_locs])
 
 
+def write_scan_traj(scn_save_fs, coord_names, constraint_dct,
+                    mod_thy_info):
+    """ Write the trajectory file of a scan from all of its points saved
+        with a geometry and an energy in the SCAN/CSCAN filesystem.
+
+        :param scn_save_fs: SCAN/CSCAN object with save filesys prefix
+        :type scn_save_fs: autofile.fs.scan or autofile.fs.cscan object
+        :param coord_names: names of the scan coordinates
+        :type coord_names: tuple(tuple(str))
+        :param constraint_dct: values of coordinates to constrain during scan
+        :type constraint_dct: dict[str: float]
+    """
+
+    _, save_locs = scan_locs(
+        scn_save_fs, coord_names, constraint_dct=constraint_dct)
+    locs_lst = []
+    for locs in save_locs:
+        sp_save_fs = autofile.fs.single_point(scn_save_fs[-1].path(locs))
+        if (scn_save_fs[-1].file.geometry.exists(locs) and
+                sp_save_fs[-1].file.energy.exists(mod_thy_info[1:4])):
+            locs_lst.append(locs)
+
+    if locs_lst:
+        if constraint_dct is not None:
+            write_traj(constraint_dct, scn_save_fs, mod_thy_info, locs_lst)
+        else:
+            write_traj(coord_names, scn_save_fs, mod_thy_info, locs_lst)
+
+
 # DERIVED FUNCTION THAT RUNS RUN_SCAN AND SAVE IN TWO DIRECTIONS #
 def run_two_way_scan(ts_zma, ts_info, mod_thy_info,
                      grid1, grid2, coord_name,
@@ -49,24 +49,47 @@ def internal_coordinates_scan(ts_zma, zrxn,
         geo=automol.zmat.geometry(ts_zma), spc_info=ts_info)
     kwargs.update(mref_params)
 
-    es_runner.scan.execute_scan(
-        zma=ts_zma,
-        spc_info=ts_info,
-        mod_thy_info=mod_thy_info,
-        coord_names=coord_names,
-        coord_grids=coord_grids,
-        scn_run_fs=_scn_run_fs,
-        scn_save_fs=_scn_save_fs,
-        scn_typ='relaxed',
-        script_str=script_str,
-        overwrite=es_keyword_dct['overwrite'],
-        update_guess=update_guess,
-        reverse_sweep=False,
-        saddle=False,
-        constraint_dct=constraint_dct,
-        retryfail=False,
-        **kwargs,
-    )
+    # Stop 1-D scans for a maximum once it has been passed, if requested
+    stop_margin = es_keyword_dct.get('stop_margin')
+    if (find_max and stop_margin is not None and
+            zrxn.class_ != automol.par.ReactionClass.Typ.ELIMINATION):
+        es_runner.scan.execute_streaming_scan(
+            zma=ts_zma,
+            spc_info=ts_info,
+            mod_thy_info=mod_thy_info,
+            coord_names=coord_names,
+            coord_grids=coord_grids,
+            scn_run_fs=_scn_run_fs,
+            scn_save_fs=_scn_save_fs,
+            scn_typ='relaxed',
+            script_str=script_str,
+            overwrite=es_keyword_dct['overwrite'],
+            update_guess=update_guess,
+            saddle=False,
+            constraint_dct=constraint_dct,
+            retryfail=False,
+            stop_margin=stop_margin,
+            **kwargs,
+        )
+    else:
+        es_runner.scan.execute_scan(
+            zma=ts_zma,
+            spc_info=ts_info,
+            mod_thy_info=mod_thy_info,
+            coord_names=coord_names,
+            coord_grids=coord_grids,
+            scn_run_fs=_scn_run_fs,
+            scn_save_fs=_scn_save_fs,
+            scn_typ='relaxed',
+            script_str=script_str,
+            overwrite=es_keyword_dct['overwrite'],
+            update_guess=update_guess,
+            reverse_sweep=False,
+            saddle=False,
+            constraint_dct=constraint_dct,
+            retryfail=False,
+            **kwargs,
+        )
 
     if find_max:
         include_endpts = not mref_params
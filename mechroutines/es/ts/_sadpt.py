@@ -9,6 +9,7 @@ from mechanalyzer.inf import thy as tinfo
 from mechanalyzer.inf import rxn as rinfo
 from mechlib.amech_io import printer as ioprinter
 from mechlib import filesys
+from mechlib.filesys import _parsed as parsed
 from mechroutines.es import runner as es_runner
 from mechroutines.es.runner import qchem_params
 from mechroutines.es.ts import _rpath as rpath
@@ -254,7 +255,7 @@ def optimize_saddle_point(guess_zmas, ts_dct,
         # Obtain geometry from optimization
         opt_inf_obj, _, opt_out_str = opt_ret
         opt_prog = opt_inf_obj.prog
-        geo = elstruct.reader.opt_geometry(opt_prog, opt_out_str)
+        geo = parsed.opt_geometry(opt_prog, opt_out_str)
 
         # Set up the script str
         script_str, kwargs = qchem_params(
@@ -293,8 +294,8 @@ def assess_saddle_point(opt_ret, hess_ret, runfs_dct, cnf_locs):
         hess_inf, _, hess_out_str = hess_ret
 
         # zma = elstruct.reader.opt_zmatrix(opt_inf.prog, opt_out_str)
-        geo = elstruct.reader.opt_geometry(opt_inf.prog, opt_out_str)
-        hess = elstruct.reader.hessian(hess_inf.prog, hess_out_str)
+        geo = parsed.opt_geometry(opt_inf.prog, opt_out_str)
+        hess = parsed.hessian(hess_inf.prog, hess_out_str)
 
         # Set filesys information
         runlvl_cnf_run_fs = runfs_dct['runlvl_cnf']
@@ -12,6 +12,7 @@ from mechanalyzer.inf import spc as sinfo
 from mechlib import filesys
 from mechlib.filesys import build_fs
 from mechlib.filesys import root_locs
+from mechlib.filesys import _tauarr as tauarr
 from mechlib.amech_io import printer as ioprinter
 from mechroutines.es._routines import conformer
 from mechroutines.es._routines import hr
@@ -263,6 +264,7 @@ def conformer_tsk(job, spc_dct, spc_name,
                 zrxn=zrxn, two_stage=two_stage,
                 retryfail=retryfail, resave=resave,
                 repulsion_thresh=40.0, print_debug=print_debug,
+                njobs=es_keyword_dct['njobs'],
                 **kwargs)
         else:
             ioprinter.info_message(
@@ -531,13 +533,19 @@ def tau_tsk(job, spc_dct, spc_name,
         if db_style == 'jsondb':
             tau_save_fs[-1].root.create()
             tau_save_fs[-1].json_create()
+            arr_dct = {'ene': ([], []), 'geo': ([], []),
+                       'grad': ([], []), 'hess': ([], [])}
             for locs in tau_save_fs[-1].existing():
                 if tau_save_fs[-1].file.geometry.exists(locs):
                     geol = tau_save_fs[-1].file.geometry.read(locs)
                     tau_save_fs[-1].json.geometry.write(geol, locs)
+                    arr_dct['geo'][0].append(locs)
+                    arr_dct['geo'][1].append(geol)
                 if tau_save_fs[-1].file.energy.exists(locs):
                     enel = tau_save_fs[-1].file.energy.read(locs)
                     tau_save_fs[-1].json.energy.write(enel, locs)
+                    arr_dct['ene'][0].append(locs)
+                    arr_dct['ene'][1].append(enel)
                 if tau_save_fs[-1].file.geometry_info.exists(locs):
                     geo_infl = tau_save_fs[-1].file.geometry_info.read(locs)
                     tau_save_fs[-1].json.geometry_info.write(geo_infl, locs)
@@ -559,9 +567,13 @@ def tau_tsk(job, spc_dct, spc_name,
                 if tau_save_fs[-1].file.gradient.exists(locs):
                     gradl = tau_save_fs[-1].file.gradient.read(locs)
                     tau_save_fs[-1].json.gradient.write(gradl, locs)
+                    arr_dct['grad'][0].append(locs)
+                    arr_dct['grad'][1].append(gradl)
                 if tau_save_fs[-1].file.hessian.exists(locs):
                     hessl = tau_save_fs[-1].file.hessian.read(locs)
                     tau_save_fs[-1].json.energy.hessian(hessl, locs)
+                    arr_dct['hess'][0].append(locs)
+                    arr_dct['hess'][1].append(hessl)
                 if tau_save_fs[-1].file.zmatrix.exists(locs):
                     zmatl = tau_save_fs[-1].file.zmatrix.read(locs)
                     tau_save_fs[-1].json.zmatrix.write(zmatl, locs)
@@ -587,6 +599,10 @@ def tau_tsk(job, spc_dct, spc_name,
                         inf_objl = sp_save_fs[-1].file.info.read(sp_locs)
                         jsp_save_fs[-1].json.info.write(inf_objl, sp_locs)
 
+            # Refresh the columnar store with the values moved into JSON
+            for col, (arr_locs, vals) in arr_dct.items():
+                tauarr.append(tau_save_fs, arr_locs, {col: vals})
+
         if job == 'samp':
 
             # Set up the script
@@ -885,7 +901,9 @@ def hr_tsk(job, spc_dct, spc_name,
                 zrxn=zrxn,
                 saddle=saddle,
                 increment=increment,
-                retryfail=retryfail)
+                retryfail=retryfail,
+                njobs=es_keyword_dct['njobs'],
+                adapt_grid=es_keyword_dct['adapt_grid'])
 
         elif job == 'reopt':
 
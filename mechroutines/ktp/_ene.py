@@ -11,9 +11,13 @@ from mechlib import filesys
 def set_reference_ene(rxn_lst, spc_dct, tsk_key_dct,
                       model_basis_energy_dct,
                       thy_dct, pes_model_dct_i, spc_model_dct_i,
-                      run_prefix, save_prefix, ref_idx=0):
+                      run_prefix, save_prefix, ref_idx=0,
+                      spc_data_dct=None):
     """ Sets the reference species for the PES for which all energies
         are scaled relative to.
+
+        If a spc_data_dct is given, the species data read here is stored
+        in it to be reused by the channels.
     """
 
     # Set the index for the reference species, right now defualt to 1st spc
@@ -39,11 +43,18 @@ def set_reference_ene(rxn_lst, spc_dct, tsk_key_dct,
             run_prefix, save_prefix, saddle=False,
             cnf_range=cnf_range, sort_info_lst=sort_info_lst,
             name=rgt)
-        chnl_infs_i, model_basis_energy_dct = build.read_spc_data(
-            spc_dct, rgt,
-            pes_model_dct_i, spc_model_dct_i,
-            run_prefix, save_prefix, model_basis_energy_dct,
-            spc_locs=spc_locs_lst[0])
+        if spc_data_dct is not None:
+            chnl_infs_i, model_basis_energy_dct = build.read_spc_data_cached(
+                spc_data_dct, spc_dct, rgt,
+                pes_model_dct_i, spc_model_dct_i,
+                run_prefix, save_prefix, model_basis_energy_dct,
+                spc_locs=spc_locs_lst[0])
+        else:
+            chnl_infs_i, model_basis_energy_dct = build.read_spc_data(
+                spc_dct, rgt,
+                pes_model_dct_i, spc_model_dct_i,
+                run_prefix, save_prefix, model_basis_energy_dct,
+                spc_locs=spc_locs_lst[0])
 
         hf0k += chnl_infs_i['ene_chnlvl']
         # hf0k += chnl_infs_i['ene_tsref']
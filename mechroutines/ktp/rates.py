@@ -7,11 +7,14 @@ import copy
 import ioformat
 import automol
 import autorun
+from autorun import execute_function_in_parallel
 import mess_io
 from mechlib.amech_io.parser.spc import tsnames_in_dct, base_tsname
 from mechlib.amech_io import reader
+from mechlib.amech_io import writer
 from mechlib.amech_io import printer as ioprinter
 from mechlib import filesys
+from mechlib.filesys import _preload as preload
 from mechroutines.models import blocks
 from mechroutines.models import build
 from mechroutines.models import etrans
@@ -156,7 +159,7 @@ def _full_mess_v1(energy_trans_str, rxn_chan_str, dats,
     ioprinter.obj('line_plus')
     ioprinter.writing('MESS input file', base_mess_path)
     ioprinter.debug_message('MESS Input:\n\n'+mess_inp_str)
-    autorun.write_input(
+    writer.mess.write_input(
         base_mess_path, mess_inp_str,
         aux_dct=dats, input_name='mess.inp')
 
@@ -193,7 +196,7 @@ def _full_mess_v1(energy_trans_str, rxn_chan_str, dats,
         ioprinter.writing('New Well-Extended MESS input file '
                           f'at path {wext_mess_path}')
         ioprinter.debug_message('MESS Input:\n\n'+wext_mess_inp_str)
-        autorun.write_input(
+        writer.mess.write_input(
             wext_mess_path, wext_mess_inp_str,
             aux_dct=dats, input_name='mess.inp')
 
@@ -244,7 +247,7 @@ def _full_mess_v2(energy_trans_str, rxn_chan_str, dats,
     ioprinter.obj('line_plus')
     ioprinter.writing('MESS input file', base_mess_path)
     ioprinter.debug_message('MESS Input:\n\n'+mess_inp_str)
-    autorun.write_input(
+    writer.mess.write_input(
         base_mess_path, mess_inp_str,
         aux_dct=dats, input_name='mess.inp')
 
@@ -276,6 +279,29 @@ def make_global_etrans_str(rxn_lst, spc_dct, etrans_dct):
 
 
 # Reaction Channel Writers for the PES
+def _preload_pes(spc_dct, rxn_lst, pes_idx, spc_model_dct_i,
+                 save_prefix, nthreads):
+    """ Read the conformer save filesystems, at the levels of the species
+        model, of all of the species and transition states of the channels
+        of a PES ahead of the many small reads made to build their MESS
+        strings
+    """
+
+    names = ()
+    for chnl_idx, (reacs, prods) in rxn_lst:
+        names += tuple(reacs) + tuple(prods)
+        names += tsnames_in_dct(pes_idx, chnl_idx, spc_dct)
+    names = tuple(dict.fromkeys(names))
+
+    ioprinter.info_message(
+        f'Preloading save filesystem for {len(names)} species and TSs')
+    paths = preload.model_save_paths(
+        spc_dct, names, spc_model_dct_i, save_prefix)
+    nfiles, nbytes = preload.preload(paths, nthreads=nthreads)
+    ioprinter.info_message(
+        f'Preloaded {nfiles} files ({nbytes/1024**2:.1f} MB)')
+
+
 def make_pes_mess_str(spc_dct, rxn_lst, pes_idx, pesgrp_num,
                       unstable_chnls,
                       run_prefix, save_prefix, label_dct,
@@ -290,42 +316,43 @@ def make_pes_mess_str(spc_dct, rxn_lst, pes_idx, pesgrp_num,
     # Initialize data carrying objects and empty MESS strings
     basis_energy_dct = {}
     basis_energy_dct[spc_model] = {}
+    spc_data_dct = {}
+    spc_data_dct[spc_model] = {}
 
     full_well_str, full_bi_str, full_ts_str = '', '', ''
     full_dat_str_dct = {}
 
+    # Load the save filesystem of every species and TS of the PES at once
+    if tsk_key_dct.get('preload', False):
+        _preload_pes(spc_dct, rxn_lst, pes_idx, spc_model_dct_i,
+                     save_prefix, tsk_key_dct.get('nprocs', 1))
+
     # Set the energy and model for the first reference species
     ioprinter.info_message('\nCalculating reference energy for PES')
     ref_ene, model_basis_energy_dct = set_reference_ene(
         rxn_lst, spc_dct, tsk_key_dct,
         basis_energy_dct[spc_model],
         thy_dct, pes_model_dct_i, spc_model_dct_i,
-        run_prefix, save_prefix, ref_idx=0)
+        run_prefix, save_prefix, ref_idx=0,
+        spc_data_dct=spc_data_dct[spc_model])
     basis_energy_dct[spc_model].update(model_basis_energy_dct)
 
+    # Read the data for all the channels, concurrently if requested
+    chnl_data_dct = _gather_channel_data(
+        rxn_lst, pes_idx, spc_dct, tsk_key_dct,
+        basis_energy_dct[spc_model],
+        thy_dct, pes_model_dct_i, spc_model_dct_i,
+        run_prefix, save_prefix, spc_data_dct[spc_model],
+        nprocs=tsk_key_dct.get('nprocs', 1))
+
     # Loop over all the channels and write the MESS strings
     written_labels = []
     hot_enes_dct = {}
     for rxn in rxn_lst:
 
         chnl_idx, (reacs, prods) = rxn
-
-        ioprinter.obj('vspace')
-        ioprinter.reading('PES electronic structure data')
-        ioprinter.channel(chnl_idx+1, reacs, prods)
-
-        # Get the names for all of the configurations of the TS
         tsname = base_tsname(pes_idx, chnl_idx)
-        tsname_allconfigs = tsnames_in_dct(pes_idx, chnl_idx, spc_dct)
-
-        # Pass in full ts class
-        chnl_infs, chn_basis_ene_dct = get_channel_data(
-            reacs, prods, tsname_allconfigs,
-            spc_dct, tsk_key_dct,
-            basis_energy_dct[spc_model],
-            thy_dct, pes_model_dct_i, spc_model_dct_i,
-            run_prefix, save_prefix)
-
+        chnl_infs, chn_basis_ene_dct = chnl_data_dct[chnl_idx]
         basis_energy_dct[spc_model].update(chn_basis_ene_dct)
 
         # Calculate the relative energies of all spc on the channel
@@ -360,6 +387,124 @@ def make_pes_mess_str(spc_dct, rxn_lst, pes_idx, pesgrp_num,
     return rxn_chan_str, full_dat_str_dct, hot_enes_dct
 
 
+def _gather_channel_data(rxn_lst, pes_idx, spc_dct, tsk_key_dct,
+                         model_basis_energy_dct,
+                         thy_dct, pes_model_dct_i, spc_model_dct_i,
+                         run_prefix, save_prefix, spc_data_dct,
+                         nprocs=1):
+    """ Read the data for the reactants, products and TS configurations
+        of every channel of the PES with get_channel_data.
+
+        With nprocs > 1, the reactants and products of all channels are
+        first read once each, split over that many processes, and stored
+        in spc_data_dct, so that a species appearing on several channels
+        is not read again in several processes. The channels, now only
+        needing their TS configurations read, are then split over that
+        many processes, each with its own copy of the basis energies and
+        species data read so far. The basis energies read for each
+        channel are returned with its data, to be merged by the caller in
+        channel order.
+
+        :param rxn_lst: channels of the PES as (chnl_idx, (reacs, prods))
+        :type rxn_lst: tuple
+        :param nprocs: number of processes reading channels
+        :type nprocs: int
+        :rtype: dict[int: (dict[str:__], dict)]
+    """
+
+    args = (spc_dct, tsk_key_dct, model_basis_energy_dct,
+            thy_dct, pes_model_dct_i, spc_model_dct_i,
+            run_prefix, save_prefix, spc_data_dct)
+
+    nprocs = max(min(nprocs, len(rxn_lst)), 1)
+    if nprocs == 1:
+        chnl_data_dct = _read_channels(pes_idx, *args, rxn_lst)
+    else:
+        # Read each reactant and product once, over all channels
+        rgt_lst = tuple(dict.fromkeys(
+            (rgt, len(rgts) == 1)
+            for _, (reacs, prods) in rxn_lst
+            for rgts in (reacs, prods) for rgt in rgts))
+        rgt_nprocs = max(min(nprocs, len(rgt_lst)), 1)
+        ioprinter.info_message(
+            f'Reading data for {len(rgt_lst)} reactants and products '
+            f'with {rgt_nprocs} processes')
+        for _spc_data_dct, _basis_ene_dct in execute_function_in_parallel(
+                _read_reagents, list(rgt_lst), args, nprocs=rgt_nprocs):
+            spc_data_dct.update(_spc_data_dct)
+            model_basis_energy_dct.update(_basis_ene_dct)
+
+        ioprinter.info_message(
+            f'Reading data for {len(rxn_lst)} channels '
+            f'with {nprocs} processes')
+        chnl_data_dct = {}
+        for _chnl_data_dct in execute_function_in_parallel(
+                _read_channels, list(rxn_lst), (pes_idx,) + args,
+                nprocs=nprocs):
+            chnl_data_dct.update(_chnl_data_dct)
+
+    return chnl_data_dct
+
+
+def _read_channels(pes_idx, spc_dct, tsk_key_dct, model_basis_energy_dct,
+                   thy_dct, pes_model_dct_i, spc_model_dct_i,
+                   run_prefix, save_prefix, spc_data_dct,
+                   rxns, output_queue=None):
+    """ Read the data for a set of channels
+    """
+
+    chnl_data_dct = {}
+    for rxn in rxns:
+        chnl_idx, (reacs, prods) = rxn
+
+        ioprinter.obj('vspace')
+        ioprinter.reading('PES electronic structure data')
+        ioprinter.channel(chnl_idx+1, reacs, prods)
+
+        # Get the names for all of the configurations of the TS
+        tsname_allconfigs = tsnames_in_dct(pes_idx, chnl_idx, spc_dct)
+
+        chnl_infs, chn_basis_ene_dct = get_channel_data(
+            reacs, prods, tsname_allconfigs,
+            spc_dct, tsk_key_dct,
+            model_basis_energy_dct,
+            thy_dct, pes_model_dct_i, spc_model_dct_i,
+            run_prefix, save_prefix,
+            spc_data_dct=spc_data_dct)
+        model_basis_energy_dct.update(chn_basis_ene_dct)
+        chnl_data_dct[chnl_idx] = (chnl_infs, chn_basis_ene_dct)
+
+    if output_queue is not None:
+        output_queue.put((chnl_data_dct,))
+
+    return chnl_data_dct
+
+
+def _read_reagents(spc_dct, tsk_key_dct, model_basis_energy_dct,
+                   thy_dct, pes_model_dct_i, spc_model_dct_i,
+                   run_prefix, save_prefix, spc_data_dct,
+                   rgt_lst, output_queue=None):
+    """ Read the data for a set of reactants and products, given as
+        (name, calc_ene_trans), into a dictionary of the species data
+        read here
+    """
+
+    read_spc_data_dct = dict(spc_data_dct)
+    for rgt, need_ene_trans in rgt_lst:
+        _, model_basis_energy_dct = _read_reagent_data(
+            rgt, need_ene_trans, spc_dct, tsk_key_dct,
+            model_basis_energy_dct, thy_dct, pes_model_dct_i,
+            spc_model_dct_i, run_prefix, save_prefix, read_spc_data_dct)
+
+    # Only send back the species read by this process
+    new_spc_data_dct = {key: val for key, val in read_spc_data_dct.items()
+                        if key not in spc_data_dct}
+    if output_queue is not None:
+        output_queue.put(((new_spc_data_dct, model_basis_energy_dct),))
+
+    return new_spc_data_dct, model_basis_energy_dct
+
+
 def _make_channel_mess_strs(tsname, reacs, prods, pesgrp_num,
                             spc_dct, label_dct, written_labels,
                             pes_param_dct, chnl_infs, chnl_enes,
@@ -755,11 +900,14 @@ def get_channel_data(reacs, prods, tsname_allconfigs,
                      spc_dct, tsk_key_dct,
                      model_basis_energy_dct,
                      thy_dct, pes_model_dct_i, spc_model_dct_i,
-                     run_prefix, save_prefix):
+                     run_prefix, save_prefix, spc_data_dct=None):
     """ For all species and transition state for the channel and
         read all required data from the save filesys, then process and
         format it to be able to write it into a MESS filesystem.
 
+        Reactant and product data is stored in spc_data_dct, if given, so
+        species appearing on several channels are only read once.
+
         :param tsname: mechanism name of the transition state
         :param reacs: mechanisms name for the reactants of the reaction channel
         :type reacs: tuple(str)
@@ -780,17 +928,10 @@ def get_channel_data(reacs, prods, tsname_allconfigs,
     for rgts, side in zip((reacs, prods), ('reacs', 'prods')):
         _need_ene_trans = bool(len(rgts) == 1)
         for rgt in rgts:
-            spc_locs_lst = filesys.models.get_spc_locs_lst(
-                spc_dct[rgt], spc_model_dct_i,
-                run_prefix, save_prefix, saddle=False,
-                cnf_range=cnf_range, sort_info_lst=sort_info_lst,
-                name=rgt)
-            chnl_infs_i, model_basis_energy_dct = build.read_spc_data(
-                spc_dct, rgt,
-                pes_model_dct_i, spc_model_dct_i,
-                run_prefix, save_prefix, model_basis_energy_dct,
-                calc_ene_trans=_need_ene_trans,
-                spc_locs=spc_locs_lst[0])
+            chnl_infs_i, model_basis_energy_dct = _read_reagent_data(
+                rgt, _need_ene_trans, spc_dct, tsk_key_dct,
+                model_basis_energy_dct, thy_dct, pes_model_dct_i,
+                spc_model_dct_i, run_prefix, save_prefix, spc_data_dct)
             chnl_infs[side].append(chnl_infs_i)
 
     # Get data for all configurations for a TS
@@ -819,3 +960,36 @@ def get_channel_data(reacs, prods, tsname_allconfigs,
         chnl_infs['fake_vdwp'] = copy.deepcopy(chnl_infs['prods'])
 
     return chnl_infs, model_basis_energy_dct
+
+
+def _read_reagent_data(rgt, need_ene_trans, spc_dct, tsk_key_dct,
+                       model_basis_energy_dct,
+                       thy_dct, pes_model_dct_i, spc_model_dct_i,
+                       run_prefix, save_prefix, spc_data_dct=None):
+    """ Read the data for a reactant or product of a channel, through
+        spc_data_dct if given
+    """
+
+    cnf_range = tsk_key_dct['cnf_range']
+    sort_info_lst = filesys.mincnf.sort_info_lst(tsk_key_dct['sort'], thy_dct)
+    spc_locs_lst = filesys.models.get_spc_locs_lst(
+        spc_dct[rgt], spc_model_dct_i,
+        run_prefix, save_prefix, saddle=False,
+        cnf_range=cnf_range, sort_info_lst=sort_info_lst,
+        name=rgt)
+    if spc_data_dct is not None:
+        inf_dct, model_basis_energy_dct = build.read_spc_data_cached(
+            spc_data_dct, spc_dct, rgt,
+            pes_model_dct_i, spc_model_dct_i,
+            run_prefix, save_prefix, model_basis_energy_dct,
+            calc_ene_trans=need_ene_trans,
+            spc_locs=spc_locs_lst[0])
+    else:
+        inf_dct, model_basis_energy_dct = build.read_spc_data(
+            spc_dct, rgt,
+            pes_model_dct_i, spc_model_dct_i,
+            run_prefix, save_prefix, model_basis_energy_dct,
+            calc_ene_trans=need_ene_trans,
+            spc_locs=spc_locs_lst[0])
+
+    return inf_dct, model_basis_energy_dct
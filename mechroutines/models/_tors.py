@@ -102,6 +102,7 @@ def _read_potentials(rotors, spc_dct_i, run_path, cnf_save_path,
                 constraint_dct,
                 read_energy_backstep=True,
                 remove_bad_points=True,
+                fill_interpolated=True,
                 read_geom=True)
 
             if pot:
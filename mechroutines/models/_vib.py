@@ -3,6 +3,7 @@
 """
 
 import os
+import copy
 import autorun
 import automol.pot
 import automol.geom
@@ -10,14 +11,26 @@ import autofile.fs
 from phydat import phycon
 from mechlib.amech_io import printer as ioprinter
 from mechlib.amech_io._path import job_path
+from mechlib.amech_io._cache import input_hash
+from mechlib.amech_io._cache import read_result
+from mechlib.amech_io._cache import write_result
 from mechroutines.models import typ
 from mechroutines.models import _tors as tors
 
 
+# ProjRot results already obtained by this process, keyed on a hash of
+# the inputs to the program
+_PROJROT_DCT = {}
+
+
 def full_vib_analysis(
         spc_dct_i, pf_filesystems, spc_mod_dct_i,
-        run_prefix, zrxn=None):
+        run_prefix, zrxn=None, rotors_info=None):
     """ process to get freq
+
+        The (rotors, mdhr_dct) already built by tors.build_rotors for the
+        species can be given as rotors_info, so the scan potentials are
+        not read again. The rotor potentials are scaled in place.
     """
     # Pack into big object to pass into functions and return
     tors_strs = ['', '', '', '', '']
@@ -28,8 +41,10 @@ def full_vib_analysis(
     tors_freqs = []
     harm_freqs = []
 
-    rotors, mdhr_dct = tors.build_rotors(
-        spc_dct_i, pf_filesystems, spc_mod_dct_i)
+    if rotors_info is None:
+        rotors_info = tors.build_rotors(
+            spc_dct_i, pf_filesystems, spc_mod_dct_i)
+    rotors, mdhr_dct = rotors_info
     # Squash the rotor potentials as necessary
     if rotors is not None:
         if typ.squash_tors_pot(spc_mod_dct_i):
@@ -153,12 +168,16 @@ def read_locs_harmonic_freqs(cnf_fs, cnf_locs, run_prefix, zrxn=None):
         ioprinter.info_message(
             'Calling ProjRot to diagonalize Hessian and get freqs...')
         script_str = autorun.SCRIPT_DCT['projrot']
-        freqs, _, imag_freqs, _ = autorun.projrot.frequencies(
-            script_str, vib_path, [geo], [[]], [hess])
+        freqs, _, imag_freqs, _ = projrot_call(
+            autorun.projrot.frequencies,
+            (script_str,), vib_path, [geo], [[]], [hess],
+            cache_prefix=run_prefix)
 
         # Obtain the displacements
-        norm_coord_str, _ = autorun.projrot.displacements(
-            script_str, vib_path, [geo], [[]], [hess])
+        norm_coord_str, _ = projrot_call(
+            autorun.projrot.displacements,
+            (script_str,), vib_path, [geo], [[]], [hess],
+            cache_prefix=run_prefix)
 
         # Calculate the zpve
         ioprinter.frequencies(freqs)
@@ -228,18 +247,22 @@ def tors_projected_freqs(pf_filesystems, mess_hr_str, projrot_hr_str,
     dist_cutoff_dct1 = {('H', 'O'): 2.26767, ('H', 'C'): 2.26767}
     dist_cutoff_dct2 = {('H', 'O'): 2.83459, ('H', 'C'): 2.83459,
                         ('C', 'O'): 3.7807}
-    proj_inf = autorun.projected_frequencies(
-        mess_script_str, projrot_script_str, vib_path,
+    proj_inf = projrot_call(
+        autorun.projected_frequencies,
+        (mess_script_str, projrot_script_str), vib_path,
         mess_hr_str, projrot_hr_str,
         tors_geo, harm_geo, hess,
         dist_cutoff_dct1=dist_cutoff_dct1,
         dist_cutoff_dct2=dist_cutoff_dct2,
-        saddle=(zrxn is not None))
+        saddle=(zrxn is not None),
+        cache_prefix=prefix)
 
     # Obtain the displacements
     disp_path = os.path.join(vib_path, 'DISP')
-    harm_disps = autorun.projrot.displacements(
-        projrot_script_str, disp_path, [harm_geo], [[]], [hess])
+    harm_disps = projrot_call(
+        autorun.projrot.displacements,
+        (projrot_script_str,), disp_path, [harm_geo], [[]], [hess],
+        cache_prefix=prefix)
 
     proj_freqs, proj_imag, _, harm_freqs, tors_freqs = proj_inf
 
@@ -262,6 +285,48 @@ def tors_projected_scaled_zpe(pf_filesystems, mess_hr_str, projrot_hr_str,
     return scaled_tors_zpe
 
 
+def projrot_call(fxn, scripts, run_path, *args, cache_prefix=None,
+                 **kwargs):
+    """ Call an autorun function that runs ProjRot (and MESS) in run_path,
+        returning a copy of the result of any prior call with the same
+        function and inputs, regardless of the path it was run in.
+
+        Results are kept for the process and, if a cache_prefix is given,
+        stored in the result cache of that run filesystem so later runs
+        of MechDriver also reuse them.
+
+        :param fxn: autorun function, called as fxn(*scripts, path, *args)
+        :type fxn: function
+        :param scripts: scripts for the programs the function runs
+        :type scripts: tuple(str)
+        :param run_path: directory to run the programs in
+        :type run_path: str
+        :param cache_prefix: run filesystem prefix holding the result cache
+        :type cache_prefix: str
+    """
+
+    prog = f'{fxn.__module__}.{fxn.__name__}'
+    key = input_hash(prog, scripts, args, sorted(kwargs.items()))
+    found, result = key in _PROJROT_DCT, _PROJROT_DCT.get(key)
+    if not found and cache_prefix is not None:
+        found, result = read_result(cache_prefix, 'PROJROT', key)
+
+    if found:
+        ioprinter.info_message(
+            f'Using {fxn.__name__} results already obtained '
+            'for the same input')
+    else:
+        result = fxn(*scripts, run_path, *args, **kwargs)
+        if result is not None and cache_prefix is not None:
+            write_result(cache_prefix, 'PROJROT', key, result)
+
+    # Failed runs are not kept so that they are attempted again
+    if result is not None:
+        _PROJROT_DCT[key] = result
+
+    return copy.deepcopy(result)
+
+
 def potential_scale_factor(harm_freqs, proj_freqs, tors_freqs):
     """ Get frequencies from one version of ProjRot
     """
@@ -2,9 +2,12 @@
     using data read from the SAVE filesystem.
 """
 
+import functools
 import automol.combine
 import mess_io
 from phydat import phycon
+from mechlib import filesys
+from mechlib.filesys import _tauarr as tauarr
 
 
 def barrier_dat_block(ts_inf_dct, reac_dcts, prod_dcts):
@@ -111,17 +114,25 @@ def tau_block(inf_dct):
     """ write  MESS string when using the Tau MonteCarlo
     """
 
-    # Write the data string and set its name
-    dat_str = mess_io.writer.monte_carlo_data(
-        geos=inf_dct['samp_geoms'],
-        enes=inf_dct['samp_enes'],
-        grads=inf_dct['samp_grads'],
-        hessians=inf_dct['samp_hessians']
-    )
+    # Set the writer of the data file, which streams the samples from the
+    # sample store into the file at the path it is given rather than
+    # building the data string in memory
+    samp_dct = inf_dct['samp_dct']
+    tau_save_fs, = filesys.build_fs(
+        None, samp_dct['save_prefix'], 'TAU',
+        spc_locs=samp_dct['spc_info'], thy_locs=samp_dct['thy_locs'])
+    dat_writer = functools.partial(
+        tauarr.write_data_file,
+        tau_save_fs=tau_save_fs,
+        locs_lst=samp_dct['locs'],
+        cols=samp_dct['cols'],
+        ref_ene=samp_dct['ref_ene'],
+        fmt_fxn=_monte_carlo_data_chunk,
+        db_style=samp_dct['db_style'])
 
     # Set the name of the tau dat file and add to dct
     tau_dat_file_name = 'tau.dat'
-    dat_dct = {tau_dat_file_name: dat_str}
+    dat_dct = {tau_dat_file_name: dat_writer}
 
     # Write additional reference configuration file if needed
     if inf_dct['ref_geom'] and inf_dct['ref_grad'] and inf_dct['ref_hessian']:
@@ -155,6 +166,35 @@ def tau_block(inf_dct):
     return spc_str, dat_dct
 
 
+def _monte_carlo_data_chunk(arr_dct, nprev):
+    """ Write the MESS data string for a chunk of the Monte Carlo samples,
+        numbering the samples after the nprev samples written before it
+    """
+
+    grads, hessians = [], []
+    if 'hess' in arr_dct:
+        grads = arr_dct['grad'].tolist()
+        hessians = arr_dct['hess'].tolist()
+    dat_str = mess_io.writer.monte_carlo_data(
+        geos=tauarr.geometries(arr_dct['symbs'], arr_dct['geo']),
+        enes=(arr_dct['ene'] * phycon.EH2KCAL).tolist(),
+        grads=grads,
+        hessians=hessians
+    )
+
+    # The writer labels each sample by its index, which should continue
+    # from the previous chunk; the label is the first line of the string
+    dat_lines = dat_str.splitlines()
+    if nprev and dat_lines and dat_lines[0].rstrip().endswith('1'):
+        label = dat_lines[0].rstrip()[:-1]
+        lbl_dct = {f'{label}{idx}': f'{label}{idx+nprev}'
+                   for idx in range(1, len(arr_dct['ene'])+1)}
+        dat_str = '\n'.join(lbl_dct.get(line.rstrip(), line)
+                            for line in dat_lines)
+
+    return dat_str
+
+
 # FAKE SPC and WELL BLOCKS
 def fake_species_block(inf_dct_i, inf_dct_j):
     """ Takes data for two species (atom/molecule) that are being combined
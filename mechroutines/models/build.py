@@ -7,6 +7,7 @@
 """
 
 import os
+import copy
 import automol
 import elstruct
 import autofile
@@ -17,6 +18,7 @@ from mechanalyzer.inf import thy as tinfo
 from mechlib import filesys
 from mechlib.amech_io import printer as ioprinter
 from mechlib.amech_io._path import job_path
+from mechlib.filesys import _tauarr as tauarr
 from mechroutines.models import ene
 from mechroutines.models import typ
 from mechroutines.models import etrans
@@ -97,6 +99,43 @@ def read_spc_data(spc_dct, spc_name,
     return inf_dct, chn_basis_ene_dct
 
 
+def read_spc_data_cached(spc_data_dct, spc_dct, spc_name,
+                         pes_mod_dct_i, spc_mod_dct_i,
+                         run_prefix, save_prefix, chn_basis_ene_dct,
+                         calc_chn_ene=True,
+                         calc_ene_trans=True,
+                         spc_locs=None):
+    """ Reads the data for a species with read_spc_data the first time it
+        is requested for a set of conformer locators and stores it in
+        spc_data_dct. Later requests return a copy of the stored data
+        rather than reading and processing the filesystem again.
+
+        The spc_data_dct should only be shared between calls that use the
+        same species model, as the model is not part of the key.
+
+        :param spc_data_dct: data already read for species of the model
+        :type spc_data_dct: dict[tuple: dict[]]
+        :rtype: (dict[], dict[])
+    """
+
+    key = (spc_name, tuple(spc_locs) if spc_locs is not None else None,
+           calc_chn_ene, calc_ene_trans)
+    if key not in spc_data_dct:
+        inf_dct, chn_basis_ene_dct = read_spc_data(
+            spc_dct, spc_name,
+            pes_mod_dct_i, spc_mod_dct_i,
+            run_prefix, save_prefix, chn_basis_ene_dct,
+            calc_chn_ene=calc_chn_ene,
+            calc_ene_trans=calc_ene_trans,
+            spc_locs=spc_locs)
+        spc_data_dct[key] = inf_dct
+    else:
+        ioprinter.info_message(
+            f'Using filesystem info already read for {spc_name}')
+
+    return copy.deepcopy(spc_data_dct[key]), chn_basis_ene_dct
+
+
 def read_ts_data(spc_dct, tsname, rcts, prds,
                  pes_mod_dct_i, spc_mod_dct_i,
                  run_prefix, save_prefix, chn_basis_ene_dct,
@@ -345,13 +384,14 @@ def mol_data(spc_name, spc_dct,
     ioprinter.info_message(
         'Preparing internal rotor info building partition functions...',
         newline=1)
-    rotors, _ = tors.build_rotors(
+    rotors, mdhr_dct = tors.build_rotors(
         spc_dct_i, pf_filesystems, spc_mod_dct_i)
     ioprinter.info_message(
         'Obtaining the vibrational frequencies and zpves...', newline=1)
     freqs, imag, zpe, _, tors_strs, _, _, _ = vib.full_vib_analysis(
         spc_dct_i, pf_filesystems, spc_mod_dct_i,
-        run_prefix, zrxn=zrxn)
+        run_prefix, zrxn=zrxn,
+        rotors_info=copy.deepcopy((rotors, mdhr_dct)))
 
     # Get the torsion strings
     allr_str = tors_strs[0]
@@ -863,76 +903,51 @@ def tau_data(spc_dct_i,
 
     db_style = 'jsondb'
     vib_model = spc_mod_dct_i['vib']['mod']
+    if db_style == 'directory':
+        all_locs = tau_save_fs[-1].existing()
+    elif db_style == 'jsondb':
+        all_locs = tau_save_fs[-1].json_existing()
     if vib_model == 'tau':
+        # Samples in the Hessian store need not be checked in the fs
+        hess_locs = tauarr.stored_locs(tau_save_fs, 'hess')
         if db_style == 'directory':
-            tau_locs = [locs for locs in tau_save_fs[-1].existing()
-                        if tau_save_fs[-1].file.hessian.exists(locs)]
+            hess_exists = tau_save_fs[-1].file.hessian.exists
         elif db_style == 'jsondb':
-            tau_locs = [locs for locs in tau_save_fs[-1].json_existing()
-                        if tau_save_fs[-1].json.hessian.exists(locs)]
+            hess_exists = tau_save_fs[-1].json.hessian.exists
+        tau_locs = [locs for locs in all_locs
+                    if tuple(locs) in hess_locs or hess_exists(locs)]
+        cols = ('geo', 'ene', 'grad', 'hess')
     else:
-        if db_style == 'directory':
-            tau_locs = tau_save_fs[-1].existing()
-        elif db_style == 'jsondb':
-            tau_locs = tau_save_fs[-1].json_existing()
-
-    ioprinter.info_message(
-        'Reading data for the Monte Carlo samples from db.json'
-        f'at path {tau_save_fs[0].path()}')
-    samp_geoms, samp_enes, samp_grads, samp_hessians = [], [], [], []
-    tot_locs = len(tau_locs)
-    for idx, locs in enumerate(tau_locs):
-
-        if db_style == 'directory':
-            geo = tau_save_fs[-1].file.geometry.read(locs)
-        elif db_style == 'jsondb':
-            geo = tau_save_fs[-1].json.geometry.read(locs)
-
-        # geo_str = autofile.data_types.swrite.geometry(geo)
-        samp_geoms.append(geo)
-
-        if db_style == 'directory':
-            tau_ene = tau_save_fs[-1].file.energy.read(locs)
-        elif db_style == 'jsondb':
-            tau_ene = tau_save_fs[-1].json.energy.read(locs)
-        rel_ene = (tau_ene - min_cnf_ene) * phycon.EH2KCAL
-        # ene_str = autofile.data_types.swrite.energy(rel_ene)
-        samp_enes.append(rel_ene)
-
-        if vib_model == 'tau':
-            if db_style == 'directory':
-                grad = tau_save_fs[-1].file.gradient.read(locs)
-            elif db_style == 'jsondb':
-                grad = tau_save_fs[-1].json.gradient.read(locs)
-            # grad_str = autofile.data_types.swrite.gradient(grad)
-            samp_grads.append(grad)
-
-            if db_style == 'directory':
-                hess = tau_save_fs[-1].file.hessian.read(locs)
-            elif db_style == 'jsondb':
-                hess = tau_save_fs[-1].json.hessian.read(locs)
-            # hess_str = autofile.data_types.swrite.hessian(hess)
-            samp_hessians.append(hess)
-
-        # Print progress message (every 150 geoms read)
-        if idx % 149 == 0:
-            print(f'Read {idx+1}/{tot_locs} samples...')
+        tau_locs = all_locs
+        cols = ('geo', 'ene')
+
+    # The samples are only read from the sample store as their data file
+    # for MESS is written, so just keep what is needed to read them
+    samp_dct = {
+        'save_prefix': save_prefix,
+        'spc_info': spc_info,
+        'thy_locs': mod_thy_info[1:],
+        'locs': tau_locs,
+        'cols': cols,
+        'ref_ene': min_cnf_ene,
+        'db_style': db_style
+    }
 
     # Determine the successful conformer ratio
     inf_obj = tau_save_fs[0].file.info.read()
-    excluded_volume_factor = len(samp_geoms) / inf_obj.nsamp
+    excluded_volume_factor = len(tau_locs) / inf_obj.nsamp
     print('excluded volume factor test:',
-          excluded_volume_factor, len(samp_geoms), inf_obj.nsamp)
+          excluded_volume_factor, len(tau_locs), inf_obj.nsamp)
 
     # Create info dictionary
     keys = ['geom', 'sym_factor', 'elec_levels',
             'freqs', 'flux_mode_str',
-            'samp_geoms', 'samp_enes', 'samp_grads', 'samp_hessians',
+            'samp_dct',
             'ref_geom', 'ref_grad', 'ref_hessian',
             'zpe_chnlvl', 'ref_ene', 'excluded_volume_factor']
     vals = [ref_geom[0], sym_factor, spc_dct_i['elec_levels'],
             freqs, tors_strs[2],
-            samp_geoms, samp_enes, samp_grads, samp_hessians,
+            samp_dct,
             ref_geom, ref_grad, ref_hessian,
             zpe_chnlvl, ref_ene, excluded_volume_factor]
     inf_dct = dict(zip(keys, vals))
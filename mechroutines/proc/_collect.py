@@ -2,6 +2,7 @@
 """
 
 import os
+import copy
 import tempfile
 
 import thermfit
@@ -15,6 +16,7 @@ from mechanalyzer.inf import thy as tinfo
 from mechlib import filesys
 import mechlib.amech_io.printer as ioprinter
 from mechlib.amech_io import reader
+from mechlib.amech_io import writer
 from mechroutines.models import _rot as rot
 from mechroutines.models import _vib as vib
 from mechroutines.models import _tors as tors
@@ -356,7 +358,7 @@ def partition_function(
     # file_path = (
     # '/home/elliott/projects/AutoMech/RO2QOOH/all_conformers/all/temp')
     with tempfile.TemporaryDirectory() as file_path:
-        autorun.write_input(
+        writer.mess.write_input(
             file_path,
             messpf_inp_str,
             aux_dct=dat_str_dct,
@@ -391,11 +393,12 @@ def messpf_input(
         run_prefix, save_prefix,
         name=spc_name, saddle=saddle, spc_locs=locs)
     geom = rot.read_geom(pf_filesystems)
-    rotors, _ = tors.build_rotors(
+    rotors, mdhr_dct = tors.build_rotors(
         spc_dct_i, pf_filesystems, spc_mod_dct_i)
     freqs, imag, zpe, _, tors_strs, _, _, _ = vib.full_vib_analysis(
         spc_dct_i, pf_filesystems, spc_mod_dct_i,
-        run_prefix, zrxn=zrxn)
+        run_prefix, zrxn=zrxn,
+        rotors_info=copy.deepcopy((rotors, mdhr_dct)))
     allr_str = tors_strs[0]
 
     zma = None
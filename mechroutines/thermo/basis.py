@@ -14,6 +14,11 @@ from mechroutines.models.ene import read_energy
 import thermfit
 
 
+# Energies of basis species read by this process, keyed on the inchi
+# of the basis species, the species model and the save filesystem
+_BASIS_ENE_DCT = {}
+
+
 # FUNCTIONS TO CALCULATE ENERGIES FOR THERMOCHEMICAL PARAMETERS #
 def basis_energy(spc_name, spc_basis, uni_refs_dct, spc_dct,
                  spc_model_dct_i, run_prefix, save_prefix,
@@ -125,21 +130,30 @@ def basis_energy(spc_name, spc_basis, uni_refs_dct, spc_dct,
     else:
         h_spc = None
 
-    # Get the energies of the bases
+    # Get the energies of the bases, only reading those not yet read
+    # by this process for the same model
     h_basis = []
     ichs = [*ich_name_dct.keys()]
-    args = (
-            ich_name_dct, spc_dct, uni_refs_dct, spc_model_dct_i,
-            run_prefix, save_prefix
-            )
-    h_basis_dct_lst = execute_function_in_parallel(
-        _read_basis_energy, ichs, args, nprocs=1)
-    print('hbasis list', h_basis_dct_lst)
-    for ich in ichs:
+    mod_key = _basis_model_key(spc_model_dct_i, save_prefix)
+    read_ichs = [ich for ich in ichs
+                 if (ich, mod_key) not in _BASIS_ENE_DCT]
+    if read_ichs:
+        args = (
+                ich_name_dct, spc_dct, uni_refs_dct, spc_model_dct_i,
+                run_prefix, save_prefix
+                )
+        h_basis_dct_lst = execute_function_in_parallel(
+            _read_basis_energy, read_ichs, args, nprocs=1)
+        print('hbasis list', h_basis_dct_lst)
         for h_basis_dct in h_basis_dct_lst:
-            if ich in h_basis_dct:
-                h_basis.append(h_basis_dct[ich])
-                break
+            for ich, h_basis_i in h_basis_dct.items():
+                if h_basis_i is not None:
+                    _BASIS_ENE_DCT[(ich, mod_key)] = h_basis_i
+    for ich in ichs:
+        if (ich, mod_key) in _BASIS_ENE_DCT:
+            h_basis.append(_BASIS_ENE_DCT[(ich, mod_key)])
+        else:
+            h_basis.append(None)
     print(h_basis)
     # Check if all the energies found
     no_ene_cnt = 0
@@ -262,6 +276,14 @@ def enthalpy_calculation(
 
 
 # Helpers
+def _basis_model_key(spc_model_dct_i, save_prefix):
+    """ Build the key for the energies of basis species read using
+        a species model from a save filesystem, covering all of the
+        levels of theory and options set in the model
+    """
+    return (repr(spc_model_dct_i), save_prefix)
+
+
 def _ich_key_name(ich):
     """ Build a useful dictionary key of a joined ich
     """
@@ -1,7 +1,11 @@
 """ Tasks for THERMODRIVER
 """
 
+import os
+import sys
+import subprocess
 import autorun
+from autorun import execute_function_in_parallel
 from automol.inchi import formula_string as fstring
 import thermfit
 from mechlib import filesys
@@ -10,72 +14,186 @@ from mechlib.amech_io import writer
 from mechlib.amech_io import parser
 from mechlib.amech_io import output_path
 from mechlib.amech_io import printer as ioprinter
+from mechlib.amech_io._cache import input_hash
+from mechlib.amech_io._cache import file_hash
+from mechlib.amech_io._cache import read_result
+from mechlib.amech_io._cache import write_result
 from mechroutines.models import ene
 from mechroutines.thermo import qt
 from mechroutines.thermo import nasapoly
 from mechroutines.thermo import basis as thmbasis
 
 
+# Log written by each MESSPF run in its run directory
+MESSPF_LOG = 'messpf.log'
+
+
 def write_messpf_task(
         write_messpf_tsk, spc_locs_dct, spc_dct,
         pes_mod_dct, spc_mod_dct,
         run_prefix, save_prefix, thm_paths_dct):
     """ Write messpf input file
+
+        The inputs for every species, conformer and model are built from
+        independent filesystem reads, so they are split over nprocs
+        processes, each writing the pf.inp and auxiliary files into the
+        directory set for the input in thm_paths_dct. If any input cannot
+        be built, its old pf.inp is removed and the task stops once all
+        other inputs are written, whether run in one process or several.
     """
     ioprinter.messpf('write_header')
 
     spc_mods, pes_mod = parser.models.extract_models(write_messpf_tsk)
+    nprocs = write_messpf_tsk[-1]['nprocs']
 
+    # Set all species, conformers and requested models to write inputs for
+    write_jobs = []
     for spc_name in spc_locs_dct:
         ioprinter.therm_paths_messpf_write_locations(
             spc_name, spc_locs_dct[spc_name], spc_mods, thm_paths_dct)
         for spc_locs in spc_locs_dct[spc_name]:
             for spc_mod in spc_mods:
-                messpf_inp_str, dat_dct = qt.make_messpf_str(
-                    pes_mod_dct[pes_mod]['therm_temps'],
-                    spc_dct, spc_name, spc_locs,
-                    pes_mod_dct[pes_mod], spc_mod_dct[spc_mod],
-                    run_prefix, save_prefix)
-                ioprinter.messpf('input_string')
-                ioprinter.info_message(messpf_inp_str)
-                autorun.write_input(
-                    thm_paths_dct[spc_name][tuple(spc_locs)][spc_mod][0],
-                    messpf_inp_str,
-                    aux_dct=dat_dct,
-                    input_name='pf.inp')
+                write_jobs.append((spc_name, spc_locs, spc_mod))
+
+    args = (spc_dct, pes_mod_dct[pes_mod], spc_mod_dct,
+            run_prefix, save_prefix, thm_paths_dct)
+    nprocs = max(min(nprocs, len(write_jobs)), 1)
+    if nprocs == 1:
+        fail_jobs = _try_write_messpf_inputs(*args, write_jobs)
+    else:
+        ioprinter.info_message(
+            f'Writing {len(write_jobs)} MESSPF inputs '
+            f'using {nprocs} processes...', newline=1)
+        fail_jobs_lst = execute_function_in_parallel(
+            _parallel_write_messpf, write_jobs, args, nprocs=nprocs)
+        fail_jobs = tuple(
+            job for _fail_jobs in fail_jobs_lst for job in _fail_jobs)
+    if fail_jobs:
+        ioprinter.warning_message(
+            f'Unable to write {len(fail_jobs)} of {len(write_jobs)} '
+            'MESSPF inputs:')
+        for spc_name, spc_locs, spc_mod in fail_jobs:
+            ioprinter.info_message(
+                f' - {spc_name} at {spc_locs} for model {spc_mod}')
+        raise RuntimeError(
+            f'Unable to write {len(fail_jobs)} MESSPF inputs')
 
     ioprinter.info_message('\n\n')
     ioprinter.obj('line_dash')
 
 
+def _write_messpf_inputs(spc_dct, pes_mod_dct_i, spc_mod_dct,
+                         run_prefix, save_prefix, thm_paths_dct,
+                         write_jobs):
+    """ Build and write the MESSPF input for each (species name, locs,
+        model) in a set of jobs
+    """
+
+    for spc_name, spc_locs, spc_mod in write_jobs:
+        messpf_inp_str, dat_dct = qt.make_messpf_str(
+            pes_mod_dct_i['therm_temps'],
+            spc_dct, spc_name, spc_locs,
+            pes_mod_dct_i, spc_mod_dct[spc_mod],
+            run_prefix, save_prefix)
+        ioprinter.messpf('input_string')
+        ioprinter.info_message(messpf_inp_str)
+        writer.mess.write_input(
+            thm_paths_dct[spc_name][tuple(spc_locs)][spc_mod][0],
+            messpf_inp_str,
+            aux_dct=dat_dct,
+            input_name='pf.inp')
+
+
+def _try_write_messpf_inputs(spc_dct, pes_mod_dct_i, spc_mod_dct,
+                             run_prefix, save_prefix, thm_paths_dct,
+                             write_jobs):
+    """ Write the MESSPF inputs for a set of jobs, returning the jobs that
+        could not be written. The pf.inp left in the directory of such a
+        job by an earlier write is removed so that it is never run.
+    """
+
+    fail_jobs = []
+    for job in write_jobs:
+        try:
+            _write_messpf_inputs(
+                spc_dct, pes_mod_dct_i, spc_mod_dct,
+                run_prefix, save_prefix, thm_paths_dct, (job,))
+        except Exception as err:  # pylint: disable=broad-except
+            ioprinter.warning_message(
+                f'Writing MESSPF input for {job[0]} failed: {err}')
+            spc_name, spc_locs, spc_mod = job
+            inp_path = os.path.join(
+                thm_paths_dct[spc_name][tuple(spc_locs)][spc_mod][0],
+                'pf.inp')
+            if os.path.exists(inp_path):
+                os.remove(inp_path)
+            fail_jobs.append(job)
+
+    return tuple(fail_jobs)
+
+
+def _parallel_write_messpf(spc_dct, pes_mod_dct_i, spc_mod_dct,
+                           run_prefix, save_prefix, thm_paths_dct,
+                           write_jobs, output_queue):
+    """ Write the MESSPF inputs for a set of jobs, sending the jobs that
+        could not be written back through the queue
+    """
+
+    fail_jobs = _try_write_messpf_inputs(
+        spc_dct, pes_mod_dct_i, spc_mod_dct,
+        run_prefix, save_prefix, thm_paths_dct, write_jobs)
+
+    output_queue.put((fail_jobs,))
+
+
 def run_messpf_task(
         run_messpf_tsk, spc_locs_dct, spc_dct,
-        thm_paths_dct):
+        thm_paths_dct, run_prefix=None):
     """ Run messpf input file
+
+        The MESSPF runs for every species, conformer and model are
+        independent, so all of them are run first, with up to njobs runs
+        at once, before the partition functions are read and combined.
+        As when the runs were made one at a time, the task stops if any
+        run fails, so no partition function left in a run directory from
+        an earlier run is read in its place. If a run_prefix is given, the
+        pf.dat of inputs identical to ones already run are restored from
+        its result cache instead.
     """
     ioprinter.messpf('run_header')
 
     spc_mods, _ = parser.models.extract_models(run_messpf_tsk)
+    njobs = run_messpf_tsk[-1]['njobs']
 
+    # Run MESSPF for all species, conformers and requested models
+    run_paths = []
     for spc_name in spc_locs_dct:
         ioprinter.therm_paths_messpf_run_locations(
             spc_name, spc_locs_dct[spc_name], spc_mods, thm_paths_dct)
-        # Run MESSPF for all requested models, combine the PFS at the end
-        ioprinter.message(f'Run MESSPF: {spc_name}', newline=1)
-        _locs_pfs = []
         for spc_locs in spc_locs_dct[spc_name]:
-            _mod_pfs = []
             for spc_mod in spc_mods:
-                autorun.run_script(
-                    autorun.SCRIPT_DCT['messpf'],
+                run_paths.append(
                     thm_paths_dct[spc_name][tuple(spc_locs)][spc_mod][0])
-                _mod_pfs.append(
-                    reader.mess.messpf(
-                        thm_paths_dct[spc_name][tuple(spc_locs)][spc_mod][0]))
-
-            # Unpack the the pf model combination information
-            spc_mod_info = parser.models.split_model(spc_mod)
-            _spc_mods, coeffs, operators = spc_mod_info
+    fail_paths = _run_messpf_jobs(
+        tuple(dict.fromkeys(run_paths)), njobs, run_prefix=run_prefix)
+    if fail_paths:
+        raise RuntimeError(
+            f'MESSPF failed for {len(fail_paths)} inputs, '
+            f'see {MESSPF_LOG} in: {", ".join(fail_paths)}')
+
+    # Unpack the the pf model combination information
+    spc_mod_info = parser.models.split_model(spc_mods[-1])
+    _spc_mods, coeffs, operators = spc_mod_info
+
+    # Combine the PFS of the models for each species and conformer
+    for spc_name in spc_locs_dct:
+        ioprinter.message(f'Run MESSPF: {spc_name}', newline=1)
+        _locs_pfs = []
+        for spc_locs in spc_locs_dct[spc_name]:
+            mod_paths = tuple(
+                thm_paths_dct[spc_name][tuple(spc_locs)][spc_mod][0]
+                for spc_mod in spc_mods)
+            _mod_pfs = [reader.mess.messpf(path) for path in mod_paths]
 
             final_pf = thermfit.pf.combine(_mod_pfs, coeffs, operators)
             writer.mess.output(
@@ -89,6 +207,122 @@ def run_messpf_task(
     ioprinter.obj('line_dash')
 
 
+def _run_messpf_jobs(run_paths, nprocs, run_prefix=None):
+    """ Run MESSPF in each of the run directories using up to nprocs
+        processes and collect the directories where the run failed
+
+        :param run_paths: directories with MESSPF input files
+        :type run_paths: tuple(str)
+        :param nprocs: number of processes to run MESSPF with
+        :type nprocs: int
+        :param run_prefix: run filesystem prefix holding the result cache
+        :type run_prefix: str
+        :rtype: tuple(str)
+    """
+
+    if not run_paths:
+        return ()
+
+    nprocs = max(min(nprocs, len(run_paths)), 1)
+    ioprinter.info_message(
+        f'Running MESSPF for {len(run_paths)} inputs '
+        f'using {nprocs} processes...', newline=1)
+    fail_paths_lst = execute_function_in_parallel(
+        _parallel_run_messpf, run_paths, (run_prefix,), nprocs=nprocs)
+    fail_paths = tuple(
+        path for _fail_paths in fail_paths_lst for path in _fail_paths)
+
+    if fail_paths:
+        ioprinter.warning_message(
+            f'MESSPF failed for {len(fail_paths)} of {len(run_paths)} '
+            f'inputs, see {MESSPF_LOG} in each directory:')
+        for path in fail_paths:
+            ioprinter.info_message(f' - {path}')
+
+    return fail_paths
+
+
+def _parallel_run_messpf(run_prefix, run_paths, output_queue):
+    """ Run MESSPF for a set of directories, sending the ones where the
+        run failed back through the queue
+    """
+
+    fail_paths = []
+    for run_path in run_paths:
+        if not _run_messpf(run_path, run_prefix=run_prefix):
+            fail_paths.append(run_path)
+
+    output_queue.put((tuple(fail_paths),))
+
+
+def _run_messpf(run_path, run_prefix=None):
+    """ Run MESSPF in a directory, with everything the run prints written
+        to a log file in the directory, and assess if it wrote the pf.dat
+        file. Any pf.dat left from a prior run is removed first so that
+        a failed run is never read back.
+
+        With a run_prefix, the pf.dat is stored in the result cache under
+        a hash of the script and the input files (pf.inp and auxiliary
+        .dat files) and restored from there for identical input.
+    """
+
+    pf_path = os.path.join(run_path, 'pf.dat')
+    if os.path.exists(pf_path):
+        os.remove(pf_path)
+
+    key = None
+    if run_prefix is not None:
+        key = input_hash(
+            autorun.SCRIPT_DCT['messpf'], _messpf_input_files(run_path))
+        found, pf_str = read_result(run_prefix, 'MESSPF', key)
+        if found:
+            with open(pf_path, mode='w', encoding='utf-8') as pf_file:
+                pf_file.write(pf_str)
+            with open(os.path.join(run_path, MESSPF_LOG), mode='w',
+                      encoding='utf-8') as log_file:
+                log_file.write('pf.dat restored from the MESSPF cache\n')
+            return True
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+    std_fds = (os.dup(1), os.dup(2))
+    with open(os.path.join(run_path, MESSPF_LOG), mode='w',
+              encoding='utf-8') as log_file:
+        os.dup2(log_file.fileno(), 1)
+        os.dup2(log_file.fileno(), 2)
+        try:
+            autorun.run_script(autorun.SCRIPT_DCT['messpf'], run_path)
+        except (subprocess.CalledProcessError, OSError) as err:
+            print(f'MESSPF run failed: {err}')
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os.dup2(std_fds[0], 1)
+            os.dup2(std_fds[1], 2)
+            os.close(std_fds[0])
+            os.close(std_fds[1])
+
+    if key is not None and os.path.exists(pf_path):
+        with open(pf_path, mode='r', encoding='utf-8') as pf_file:
+            write_result(run_prefix, 'MESSPF', key, pf_file.read())
+
+    return os.path.exists(pf_path)
+
+
+def _messpf_input_files(run_path):
+    """ Read the name and a hash of the contents of pf.inp and every
+        auxiliary .dat file in a MESSPF run directory
+    """
+
+    inp_files = []
+    for name in sorted(os.listdir(run_path)):
+        if name == 'pf.inp' or (name.endswith('.dat') and name != 'pf.dat'):
+            inp_files.append(
+                (name, file_hash(os.path.join(run_path, name))))
+
+    return tuple(inp_files)
+
+
 def produce_boltzmann_weighted_conformers_pf(
         run_messpf_tsk, spc_locs_dct, spc_dct,
         thm_paths_dct):
@@ -0,0 +1,71 @@
+""" Test the pruning of the saved conformers compared to a new conformer
+"""
+
+import numpy
+import automol
+from mechlib.filesys import _cnffp as cnffp
+
+
+# Propanol, with coordinates in angstrom
+SYMBS = ('C', 'C', 'C', 'O', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H')
+XYZS = (
+    (-1.8571, 0.1981, 0.0000), (-0.5012, -0.4857, 0.0000),
+    (0.6332, 0.5264, 0.0000), (1.8541, -0.1886, 0.0000),
+    (-2.6741, -0.5317, 0.0000), (-1.9815, 0.8386, 0.8785),
+    (-1.9815, 0.8386, -0.8785), (-0.4132, -1.1382, 0.8778),
+    (-0.4132, -1.1382, -0.8778), (0.5536, 1.1716, 0.8826),
+    (0.5536, 1.1716, -0.8826), (2.5663, 0.4528, 0.0000))
+GEO = automol.geom.from_data(SYMBS, XYZS, angstrom=True)
+# Threshold used by the conformer uniqueness checks
+DIST_THRESH = 0.3
+
+
+def _stretch_oh(delta):
+    """ Stretch the O-H bond of the geometry, which changes no distance
+        of the geometry by more than delta
+    """
+    xyzs = numpy.array(automol.geom.coordinates(GEO))
+    bond = xyzs[11] - xyzs[3]
+    xyzs[11] += delta * bond / numpy.linalg.norm(bond)
+    return automol.geom.from_data(SYMBS, xyzs)
+
+
+def test__distance_candidates_threshold():
+    """ test cnffp.distance_candidates for near-duplicates at the threshold
+    """
+
+    for frac in (0.5, 0.999, 1.001, 2.0):
+        geo = _stretch_oh(frac * DIST_THRESH)
+        cand_idxs = cnffp.distance_candidates(geo, (GEO,), DIST_THRESH)
+
+        # Every geometry automol finds similar must be kept as a candidate
+        unique, _ = automol.geom.is_unique(
+            geo, (GEO,), check_dct={'dist': DIST_THRESH})
+        if not unique:
+            assert cand_idxs == (0,)
+
+        # So must any within the threshold for every distance
+        if frac < 1.0:
+            assert cand_idxs == (0,)
+
+
+def test__distance_candidates_pruned():
+    """ test cnffp.distance_candidates for geometries that are pruned
+    """
+
+    # Stretching every distance by half is beyond the bound
+    xyzs = 1.5 * numpy.array(automol.geom.coordinates(GEO))
+    geo = automol.geom.from_data(SYMBS, xyzs)
+    assert cnffp.distance_candidates(geo, (GEO,), DIST_THRESH) == ()
+    unique, _ = automol.geom.is_unique(
+        geo, (GEO,), check_dct={'dist': DIST_THRESH})
+    assert unique
+
+    # Geometries with other numbers of atoms are never candidates
+    geo = automol.geom.from_data(SYMBS[:-1], XYZS[:-1], angstrom=True)
+    assert cnffp.distance_candidates(geo, (GEO,), DIST_THRESH) == ()
+
+
+if __name__ == '__main__':
+    test__distance_candidates_threshold()
+    test__distance_candidates_pruned()
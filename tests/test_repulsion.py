@@ -0,0 +1,52 @@
+""" Test the vectorized repulsion screening of conformer samples
+"""
+
+import numpy
+import automol
+from mechroutines.es._routines import _util as util
+
+
+# Propanol, with coordinates in angstrom
+SYMBS = ('C', 'C', 'C', 'O', 'H', 'H', 'H', 'H', 'H', 'H', 'H', 'H')
+XYZS = (
+    (-1.8571, 0.1981, 0.0000), (-0.5012, -0.4857, 0.0000),
+    (0.6332, 0.5264, 0.0000), (1.8541, -0.1886, 0.0000),
+    (-2.6741, -0.5317, 0.0000), (-1.9815, 0.8386, 0.8785),
+    (-1.9815, 0.8386, -0.8785), (-0.4132, -1.1382, 0.8778),
+    (-0.4132, -1.1382, -0.8778), (0.5536, 1.1716, 0.8826),
+    (0.5536, 1.1716, -0.8826), (2.5663, 0.4528, 0.0000))
+REF_GEO = automol.geom.from_data(SYMBS, XYZS, angstrom=True)
+
+
+def test__repulsion_differences():
+    """ test util.repulsion_differences on displaced samples
+    """
+
+    rng = numpy.random.default_rng(seed=7)
+    ref_xyzs = numpy.array(automol.geom.coordinates(REF_GEO))
+    samp_geos = tuple(
+        automol.geom.from_data(
+            SYMBS, ref_xyzs + rng.normal(scale=0.3, size=ref_xyzs.shape))
+        for _ in range(5))
+
+    diffs = util.repulsion_differences(REF_GEO, samp_geos)
+    assert diffs is not None and len(diffs) == len(samp_geos)
+
+    ref_pot = automol.pot.intramol_interaction_potential_sum(REF_GEO)
+    for geo, diff in zip(samp_geos, diffs):
+        pot = automol.pot.intramol_interaction_potential_sum(geo)
+        assert numpy.isclose(diff, pot - ref_pot, rtol=1.0e-3, atol=0.5)
+
+
+def test__repulsion_differences_ref():
+    """ test util.repulsion_differences for the reference itself
+    """
+
+    diffs = util.repulsion_differences(REF_GEO, (REF_GEO,))
+    assert numpy.allclose(diffs, 0.0)
+    assert len(util.repulsion_differences(REF_GEO, ())) == 0
+
+
+if __name__ == '__main__':
+    test__repulsion_differences()
+    test__repulsion_differences_ref()
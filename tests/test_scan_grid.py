@@ -0,0 +1,100 @@
+""" Test the spline and grid helpers of the adaptive scans
+"""
+
+import numpy
+import pytest
+from mechlib.filesys import read
+from mechroutines.es.runner import scan
+
+
+# One-fold rotor with twelve points and a three-fold rotor with four
+ANGLES = numpy.arange(12) * numpy.pi / 6.0
+METHYL_ANGLES = numpy.arange(4) * numpy.pi / 6.0
+
+
+def _pot(angles):
+    """ Smooth one-fold potential (kcal/mol) with a minimum at zero
+    """
+    return 1.5 * (1.0 - numpy.cos(angles))
+
+
+def test__grid_period():
+    """ test read.grid_period
+    """
+
+    assert numpy.isclose(read.grid_period(ANGLES), 2.0*numpy.pi)
+    assert numpy.isclose(read.grid_period(METHYL_ANGLES), 2.0*numpy.pi/3.0)
+    assert numpy.isclose(
+        read.grid_period(ANGLES + 4.0*numpy.pi), 2.0*numpy.pi)
+
+    # A grid that repeats its start does not span one period
+    with pytest.raises(AssertionError, match='period'):
+        read.grid_period(numpy.arange(13) * numpy.pi / 6.0)
+
+
+def test__periodic_splines():
+    """ test read.periodic_splines
+    """
+
+    period = read.grid_period(ANGLES)
+    enes = _pot(ANGLES)
+
+    # Both splines go through the points and are periodic
+    cub_enes, akima_enes = read.periodic_splines(
+        ANGLES, enes, period, ANGLES + period)
+    assert numpy.allclose(cub_enes, enes)
+    assert numpy.allclose(akima_enes, enes)
+
+    # Both are close to the potential in between, and the points can be
+    # given in any order
+    mid_angles = ANGLES + numpy.pi / 12.0
+    order = numpy.roll(numpy.arange(len(ANGLES)), 5)
+    cub_enes, akima_enes = read.periodic_splines(
+        ANGLES[order], enes[order], period, mid_angles)
+    assert numpy.allclose(cub_enes, _pot(mid_angles), atol=0.01)
+    assert numpy.allclose(akima_enes, _pot(mid_angles), atol=0.1)
+
+
+def test__adaptive_refine_points():
+    """ test scan._adaptive_refine_points
+    """
+
+    grid_vals = tuple((angle,) for angle in ANGLES)
+    cand_idxs = tuple(range(1, len(ANGLES), 2))
+    coarse_enes = numpy.full(len(ANGLES), numpy.nan)
+    coarse_enes[::2] = _pot(ANGLES[::2])
+
+    def _refine(enes):
+        return scan._adaptive_refine_points(
+            grid_vals, enes, cand_idxs,
+            scan.ADAPT_FIT_THRESH, scan.ADAPT_CURV_THRESH)
+
+    # A smooth potential is interpolated everywhere
+    assert _refine(coarse_enes) == ()
+
+    # Points next to a failed coarse point are run
+    enes = coarse_enes.copy()
+    enes[4] = numpy.nan
+    assert _refine(enes) == (3, 5)
+
+    # Points around a sharp feature are run
+    enes = coarse_enes.copy()
+    enes[6] += 3.0
+    assert set(_refine(enes)) >= {5, 7}
+
+    # Points already run are never returned
+    enes = coarse_enes.copy()
+    enes[6] += 3.0
+    enes[5] = _pot(ANGLES[5])
+    assert 5 not in _refine(enes)
+
+    # Too few coarse points to fit: every candidate is run
+    enes = numpy.full(len(ANGLES), numpy.nan)
+    enes[[0, 4, 8]] = _pot(ANGLES[[0, 4, 8]])
+    assert _refine(enes) == cand_idxs
+
+
+if __name__ == '__main__':
+    test__grid_period()
+    test__periodic_splines()
+    test__adaptive_refine_points()
@@ -0,0 +1,30 @@
+""" Test the stopping criterion of the streaming scans
+"""
+
+import numpy
+from mechroutines.es.runner import scan
+
+
+def test__passed_maximum():
+    """ test scan._passed_maximum
+    """
+
+    margin = scan.STREAM_STOP_MARGIN
+    enes = numpy.array([0.0, 2.0, 5.0, 4.0, 2.5])
+    assert scan._passed_maximum(enes, margin)
+    assert not scan._passed_maximum(enes[:4], margin)
+
+    # Failed points are skipped
+    assert scan._passed_maximum(
+        numpy.array([0.0, 5.0, numpy.nan, 2.5]), margin)
+    assert not scan._passed_maximum(
+        numpy.array([0.0, 5.0, 2.5, numpy.nan]), 3.0)
+
+    # The maximum must lie inside the scan
+    assert not scan._passed_maximum(numpy.array([6.0, 2.0, 0.0]), margin)
+    assert not scan._passed_maximum(numpy.array([0.0, 2.0, 6.0]), margin)
+    assert not scan._passed_maximum(numpy.array([5.0, 0.0]), margin)
+
+
+if __name__ == '__main__':
+    test__passed_maximum()